@@ -1,6 +1,14 @@
 # API ve bağlantı ayarlarının yapıldığı app.py dosyası
 from flask import Flask, request, jsonify, send_from_directory, render_template
-from model import GameRecommender
+from model import GameRecommender, configure_thread_budget
+from degraded import DegradedRecommender
+from manager import ModelManager
+from concurrency import SingleFlightTimeout, AdmissionQueue, QueueFull
+from dbpool import ConnectionPool
+from comments import CommentStore, parse_appid
+from responses import parse_fields, select_fields, cache_headers, etag_matches, compress, NO_STORE
+from warmup import QueryLog, CacheWarmer
+from functools import wraps
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -10,7 +18,8 @@ import os
 import threading
 import time
 import sys
-import sqlite3
+import hmac
+import atexit
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,54 +36,145 @@ class Config:
     MODEL_PATH = "models"
     CACHE_TIMEOUT = 3600
     RATE_LIMIT = "300 per hour"
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', '1') != '0'
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+    MODEL_WATCH_INTERVAL = int(os.getenv('MODEL_WATCH_INTERVAL', 30))
+    API_THREADS = int(os.getenv('API_THREADS', 8))
+    SEARCH_DEADLINE_MS = int(os.getenv('SEARCH_DEADLINE_MS', 3000))
+    MAX_SEARCH_DEADLINE_MS = int(os.getenv('MAX_SEARCH_DEADLINE_MS', 10000))
+    ADMISSION_MAX_ACTIVE = int(os.getenv('ADMISSION_MAX_ACTIVE', 4))
+    ADMISSION_MAX_QUEUE = int(os.getenv('ADMISSION_MAX_QUEUE', 16))
+    RETRY_AFTER_SECONDS = int(os.getenv('RETRY_AFTER_SECONDS', 2))
+    SHARD_ADDRESSES = os.getenv('SHARD_ADDRESSES', '')
 
-recommender = None
-init_done = False
-init_error = None
-init_lock = threading.Lock()
+fallback = DegradedRecommender(Config.DB_PATH)
+query_log = QueryLog()
+warmer = CacheWarmer(query_log)
+atexit.register(query_log.flush)
 
-def get_db_connection():
-    conn = sqlite3.connect(Config.DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+def on_model_swap(rec):
+    # Yeni model boş önbellekle başlar; sık sorgular günlükten arka planda yeniden hesaplanır
+    cache.clear()
+    warmer.start(rec)
+
+def recommender_factory():
+    if not Config.SHARD_ADDRESSES:
+        return GameRecommender
+    # Parçalı mod: katalog parça süreçlerinde (shards.py serve), bu süreç yalnızca koordinatör
+    from shards import ShardCoordinator
+    return ShardCoordinator
+
+manager = ModelManager(recommender_factory(), db_path=Config.DB_PATH, model_path=Config.MODEL_PATH,
+                       on_swap=on_model_swap)
+
+admission = AdmissionQueue(Config.ADMISSION_MAX_ACTIVE, Config.ADMISSION_MAX_QUEUE)
+
+comments_db = ConnectionPool(Config.DB_PATH)
+comment_store = CommentStore(comments_db)
+# Kuyrukta bekleyen yorumlar süreç kapanırken yazılır
+atexit.register(comment_store.close)
 
 def initialize_backend():
-    global recommender, init_done, init_error
+    try:
+        # Ayar doğrulama/loglama içe aktarmada değil sunucu başlarken bir kez yapılır
+        import config
+        config.Config.initialize()
+    except ImportError:
+        pass
+    print("\n" + "="*50)
+    print(">>> [SİSTEM] MODEL EĞİTİMİ/YÜKLEMESİ BAŞLATILIYOR...")
+    print(">>> [SİSTEM] Bu işlem veritabanı boyutuna göre 1-2 dakika sürebilir.")
+    print("="*50 + "\n")
     
-    with init_lock:
-        if init_done:
-            return
-
+    if manager.reload():
+        # İlk kurulum tüm çekirdekleri kullanır; servis başladıktan sonra istek başına bütçe uygulanır
+        threads = configure_thread_budget(Config.API_THREADS)
+        logger.info(f"İstek başına FAISS/PyTorch iş parçacığı: {threads} (API_THREADS={Config.API_THREADS})")
         print("\n" + "="*50)
-        print(">>> [SİSTEM] MODEL EĞİTİMİ/YÜKLEMESİ BAŞLATILIYOR...")
-        print(">>> [SİSTEM] Bu işlem veritabanı boyutuna göre 1-2 dakika sürebilir.")
+        print(">>> [SİSTEM] MODEL HAZIR! API İSTEKLERİNE AÇIK.")
         print("="*50 + "\n")
-        
-        try:
-            recommender = GameRecommender()
-            success = recommender.initialize()
-            
-            if success:
-                init_done = True
-                print("\n" + "="*50)
-                print(">>> [SİSTEM] MODEL HAZIR! API İSTEKLERİNE AÇIK.")
-                print("="*50 + "\n")
-            else:
-                init_error = "Model initialization returned False"
-                logger.error("Model başlatılamadı (Return False)")
-                
-        except Exception as e:
-            init_error = str(e)
-            logger.error(f"Model başlatma hatası: {e}", exc_info=True)
+        manager.start_watching(Config.MODEL_WATCH_INTERVAL)
+    else:
+        logger.error(f"Model başlatılamadı: {manager.error}")
 
 limiter = Limiter(
     app=app,
     key_func=get_remote_address,
     default_limits=[Config.RATE_LIMIT],
-    storage_uri="memory://" 
+    storage_uri="memory://",
+    enabled=Config.RATE_LIMIT_ENABLED
 )
 cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
 
+def request_deadline():
+    """?deadline_ms= parametresinden (yoksa SEARCH_DEADLINE_MS) mutlak bitiş zamanını hesapla"""
+    try:
+        budget = int(request.args.get('deadline_ms', Config.SEARCH_DEADLINE_MS))
+    except ValueError:
+        budget = Config.SEARCH_DEADLINE_MS
+    budget = min(max(budget, 50), Config.MAX_SEARCH_DEADLINE_MS)
+    return time.monotonic() + budget / 1000
+
+def parse_filters():
+    return {
+        "genres": request.args.get('genres', '').split(',') if request.args.get('genres') else None,
+        "exclude": request.args.get('exclude', '').split(',') if request.args.get('exclude') else None,
+        "year_min": request.args.get('year_min'),
+        "year_max": request.args.get('year_max'),
+        "playtime_min": request.args.get('playtime_min'),
+        "playtime_max": request.args.get('playtime_max')
+    }
+
+def include_breakdown(fields=None):
+    return 'breakdown' in request.args.get('include', '').split(',') or (fields is not None and 'breakdown' in fields)
+
+def result_cache_headers(engine, kind, seeds, filters, fields, breakdown):
+    """Model sürümü + kanonik sorgudan ETag/Cache-Control (yedek katman yanıtları önbelleğe alınmaz)"""
+    version = manager.version if engine is manager.recommender else None
+    canonical = GameRecommender.request_key(kind, seeds, 15, filters)
+    return cache_headers(version, f"{canonical}|{int(breakdown)}|{','.join(fields or ())}")
+
+def record_query(engine, kind, args, n=None, filters=None):
+    """
+    Tam modele gelen sorgular önbellek ısıtma günlüğüne sayılır. Önbellek/304 kısa devrelerinden
+    önce çağrılır; aksi halde en sık sorgular en az sayılırdı.
+    """
+    if engine is manager.recommender:
+        query_log.record(kind, args, n, GameRecommender.canonical_filters(filters or {}))
+
+def records_autocomplete(view):
+    # cache.cached'in dışında çalışır; önbellekten dönen önekler de sayılır
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        q = request.args.get('q', '')
+        if len(q) >= 2:
+            record_query(active_recommender(), "ac", [q.lower()])
+        return view(*args, **kwargs)
+    return wrapper
+
+def shaped_response(payload, headers):
+    response = jsonify(payload)
+    response.headers.update(headers)
+    return response
+
+def busy_response():
+    response = jsonify({"error": "Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin", "status": "busy"})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(Config.RETRY_AFTER_SECONDS)
+    return response
+
+def admission_controlled(f):
+    """CPU ağırlıklı endpointler: kuyruk doluysa hesaplamaya girmeden hızlıca 503 döner"""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        deadline = request_deadline()
+        try:
+            with admission.admit(deadline):
+                return f(*args, deadline=deadline, **kwargs)
+        except QueueFull:
+            return busy_response()
+    return wrapper
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -83,65 +183,208 @@ def index():
 def serve_static(path):
     return send_from_directory('static', path)
 
+@app.after_request
+def compress_response(response):
+    """JSON yanıtları COMPRESS_MIN_BYTES üzerindeyse istemcinin kabul ettiği kodlamayla (br/gzip) sıkıştırılır"""
+    if response.mimetype != 'application/json' or response.direct_passthrough or response.status_code != 200 \
+            or 'Content-Encoding' in response.headers:
+        return response
+    body, encoding = compress(response.get_data(), request.headers.get('Accept-Encoding'))
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+@app.after_request
+def service_worker_scope(response):
+    # Servis çalışanı /static/ altında olsa da /api/ isteklerini de görebilmesi için
+    if request.path == '/static/service-worker.js':
+        response.headers['Service-Worker-Allowed'] = '/'
+    return response
+
+def active_recommender():
+    """Model hazırsa tam modeli, değilse SQLite üzerinden çalışan yedek katmanı döndürür"""
+    engine = manager.recommender
+    if engine is not None:
+        return engine
+    if fallback.available():
+        return fallback
+    return None
+
 @app.route('/api/health')
 def health():
+    comments_db.health_check()
+    progress = manager.progress()
+    active = active_recommender()
+    ready = manager.ready
     return jsonify({
-        "status": "ready" if init_done else "initializing",
-        "error": init_error,
-        "message": "Sistem yükleniyor..." if not init_done else "Sistem aktif"
+        "status": "ready" if ready else "initializing",
+        "mode": getattr(active, "mode", "unavailable"),
+        "error": manager.error,
+        "message": "Sistem yükleniyor..." if not ready else "Sistem aktif",
+        "progress": 100 if ready and not manager.busy else progress["progress"],
+        "eta_seconds": 0 if ready and not manager.busy else progress["eta_seconds"],
+        "stages": progress["stages"],
+        "model_version": manager.version,
+        "rebuilding": ready and manager.busy,
+        "queue": {"pending": admission.pending, "capacity": admission.capacity, "rejected": admission.rejected},
+        "db": {**comments_db.metrics(), "comment_queue": comment_store.metrics()},
+        "warmup": warmer.snapshot()
     })
 
+@app.route('/api/admin/reload', methods=['POST'])
+@limiter.limit("10 per hour")
+def admin_reload():
+    token = request.headers.get('X-Admin-Token', '')
+    if not Config.ADMIN_TOKEN or not hmac.compare_digest(token, Config.ADMIN_TOKEN):
+        return jsonify({"error": "Yetkisiz"}), 403
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        started = manager.reload_async(rebuild=bool(data.get('rebuild')), version=data.get('version'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not started:
+        return jsonify({"error": "Zaten bir model kurulumu sürüyor"}), 409
+    return jsonify({"status": "started", "model_version": manager.version}), 202
+
 @app.route('/api/search')
 @limiter.limit("60 per minute")
-def search():
-    if not init_done: 
+@admission_controlled
+def search(deadline=None):
+    engine = active_recommender()
+    if engine is None: 
+        progress = manager.progress()
         return jsonify({
             "error": "Sistem hazırlanıyor, lütfen bekleyiniz...", 
             "status": "initializing",
-            "progress": 50
+            "progress": progress["progress"],
+            "eta_seconds": progress["eta_seconds"]
         }), 503
     
     try:
         query = request.args.get('q', '').strip()
         if not query: return jsonify({"error": "Lütfen bir oyun adı girin"}), 400
-        
-        filters = {
-            "genres": request.args.get('genres', '').split(',') if request.args.get('genres') else None,
-            "exclude": request.args.get('exclude', '').split(',') if request.args.get('exclude') else None,
-            "year_min": request.args.get('year_min'),
-            "year_max": request.args.get('year_max'),
-            "playtime_min": request.args.get('playtime_min'),
-            "playtime_max": request.args.get('playtime_max')
-        }
-        
-        results = recommender.recommend_games(query, n=15, filters=filters)
-        return jsonify({
-            "results": results, 
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        filters = parse_filters()
+        breakdown = include_breakdown(fields)
+        seeds = [g.lower().strip() for g in GameRecommender.split_query(query)]
+        headers = result_cache_headers(engine, "rec", seeds, filters, fields, breakdown)
+        record_query(engine, "rec", seeds, 15, filters)
+        if etag_matches(request.headers.get('If-None-Match'), headers.get('ETag')):
+            return '', 304, headers
+
+        results = engine.recommend_games(query, n=15, filters=filters, deadline=deadline,
+                                         include_breakdown=breakdown)
+        partial = getattr(results, "partial", False)
+        return shaped_response({
+            "results": select_fields(results, fields), 
             "count": len(results),
-            "query": query
-        })
+            "query": query,
+            "mode": getattr(engine, "mode", "full"),
+            "partial": partial
+        }, NO_STORE if partial else headers)
+    except SingleFlightTimeout:
+        return jsonify({"error": "Arama zaman aşımına uğradı, lütfen tekrar deneyin"}), 504
     except Exception as e:
         logger.error(f"Arama hatası: {e}")
         return jsonify({"error": "Arama sırasında hata oluştu"}), 500
 
+@app.route('/api/similar/<int:appid>')
+@app.route('/api/similar')
+@limiter.limit("60 per minute")
+@admission_controlled
+def similar(appid=None, deadline=None):
+    engine = active_recommender()
+    if engine is None: return jsonify({"error": "Sistem hazırlanıyor"}), 503
+    
+    if appid is not None:
+        app_ids = [appid]
+    else:
+        raw = [a.strip() for a in request.args.get('appids', '').split(',') if a.strip()]
+        if not raw or not all(a.isdigit() for a in raw):
+            return jsonify({"error": "Geçerli AppID listesi gerekli (appids=1,2,3)"}), 400
+        app_ids = [int(a) for a in raw[:10]]
+    
+    try:
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    try:
+        filters = parse_filters()
+        breakdown = include_breakdown(fields)
+        headers = result_cache_headers(engine, "sim", app_ids, filters, fields, breakdown)
+        record_query(engine, "sim", app_ids, 15, filters)
+        if etag_matches(request.headers.get('If-None-Match'), headers.get('ETag')):
+            return '', 304, headers
+
+        results = engine.recommend_similar(app_ids, n=15, filters=filters, deadline=deadline,
+                                           include_breakdown=breakdown)
+        partial = getattr(results, "partial", False)
+        return shaped_response({
+            "results": select_fields(results, fields),
+            "count": len(results),
+            "appids": app_ids,
+            "mode": getattr(engine, "mode", "full"),
+            "partial": partial
+        }, NO_STORE if partial else headers)
+    except SingleFlightTimeout:
+        return jsonify({"error": "Arama zaman aşımına uğradı, lütfen tekrar deneyin"}), 504
+    except Exception as e:
+        logger.error(f"Benzer oyun hatası: {e}")
+        return jsonify({"error": "Arama sırasında hata oluştu"}), 500
+
+@app.route('/api/explain')
+@limiter.limit("120 per minute")
+def explain():
+    engine = active_recommender()
+    if engine is None: return jsonify({"error": "Sistem hazırlanıyor"}), 503
+    
+    appid = request.args.get('appid', '').strip()
+    seed = request.args.get('seed', '').strip()
+    if not appid.isdigit() or not seed:
+        return jsonify({"error": "appid ve seed gerekli"}), 400
+    
+    result = engine.explain(int(appid), seed)
+    if result is None:
+        return jsonify({"error": "Oyun bulunamadı"}), 404
+    result["mode"] = getattr(engine, "mode", "full")
+    return jsonify(result)
+
 @app.route('/api/autocomplete')
-@cache.cached(timeout=300, query_string=True)
+@records_autocomplete
+@cache.cached(timeout=300, query_string=True, unless=lambda: not manager.ready)
 def autocomplete():
-    if not init_done: return jsonify([])
+    engine = active_recommender()
+    if engine is None: return jsonify([])
     q = request.args.get('q', '')
     if len(q) < 2: return jsonify([])
-    return jsonify(recommender.autocomplete(q))
+    try:
+        response = jsonify(engine.autocomplete(q))
+    except SingleFlightTimeout:
+        return jsonify([])
+    response.headers['X-Serving-Mode'] = getattr(engine, "mode", "full")
+    return response
 
 @app.route('/api/surprise')
-def surprise():
-    if not init_done: return jsonify({"error": "Sistem hazırlanıyor"}), 503
+@admission_controlled
+def surprise(deadline=None):
+    engine = active_recommender()
+    if engine is None: return jsonify({"error": "Sistem hazırlanıyor"}), 503
     
-    source_game = recommender.get_random_high_rated_game()
+    source_game, results = engine.surprise(n=15, deadline=deadline, include_breakdown=include_breakdown())
     if source_game:
-        results = recommender.recommend_games(source_game['Name'], n=15)
         return jsonify({
             "source": source_game,
-            "results": results
+            "results": results,
+            "mode": getattr(engine, "mode", "full"),
+            "partial": getattr(results, "partial", False)
         })
     return jsonify({"error": "Sürpriz oyun bulunamadı"}), 404
 
@@ -152,16 +395,22 @@ def get_comments():
         return jsonify({"error": "AppID required"}), 400
     
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT content, created_at FROM comments WHERE appid = ? ORDER BY created_at DESC", (appid,))
-        comments = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return jsonify(comments)
+        page = comment_store.get_page(appid, request.args.get('cursor'),
+                                      comment_store.page_size(request.args.get('limit')),
+                                      request.headers.get('If-None-Match'), request.headers.get('If-Modified-Since'),
+                                      client=get_remote_address())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error fetching comments: {e}")
         return jsonify({"error": "Failed to fetch comments"}), 500
 
+    if page.not_modified:
+        return '', 304, page.headers
+    response = jsonify(page.comments)
+    response.headers.update(page.headers)
+    return response
+
 @app.route('/api/comments', methods=['POST'])
 @limiter.limit("5 per minute")
 def post_comment():
@@ -174,14 +423,16 @@ def post_comment():
     
     if len(content) > 500:
         return jsonify({"error": "Comment too long (max 500 chars)"}), 400
+
+    appid = parse_appid(appid)
+    if appid is None:
+        return jsonify({"error": "AppID must be a positive integer"}), 400
         
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO comments (appid, content) VALUES (?, ?)", (appid, content))
-        conn.commit()
-        conn.close()
+        comment_store.add(appid, content, client=get_remote_address())
         return jsonify({"success": True})
+    except QueueFull:
+        return busy_response()
     except Exception as e:
         logger.error(f"Error saving comment: {e}")
         return jsonify({"error": "Failed to save comment"}), 500
@@ -0,0 +1,515 @@
+# Flask sunucusuyla aynı rotaları ve JSON sözleşmelerini sunan, CPU ağırlıklı işleri sınırlı iş parçacığı havuzlarına devreden ASGI giriş noktasının bulunduğu asgi.py dosyası.
+# Çalıştırma: uvicorn asgi:app --host 0.0.0.0 --port 8000
+import os
+import re
+import json
+import time
+import hmac
+import asyncio
+import logging
+import mimetypes
+import threading
+from pathlib import Path
+from functools import partial
+from urllib.parse import parse_qs
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app import (Config, manager, fallback, admission, active_recommender, initialize_backend,
+                 comments_db, comment_store, result_cache_headers, query_log, warmer, record_query)
+from model import GameRecommender
+from comments import parse_appid
+from responses import parse_fields, select_fields, etag_matches, compress, NO_STORE
+from concurrency import SingleFlightTimeout, QueueFull
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+STATIC_DIR = BASE_DIR / 'static'
+INDEX_PATH = BASE_DIR / 'templates' / 'index.html'
+
+IO_THREADS = int(os.getenv('ASGI_IO_THREADS', 8))
+LOOKUP_THREADS = int(os.getenv('ASGI_LOOKUP_THREADS', 2))
+AUTOCOMPLETE_CACHE_SIZE = int(os.getenv('ASGI_AUTOCOMPLETE_CACHE_SIZE', 4096))
+
+
+class Request:
+    __slots__ = ('method', 'path', 'args', 'headers', 'body', 'client')
+
+    def __init__(self, scope: dict, body: bytes):
+        self.method = scope['method']
+        self.path = scope['path']
+        query = parse_qs(scope.get('query_string', b'').decode('utf-8', 'replace'), keep_blank_values=True)
+        self.args = {k: v[0] for k, v in query.items()}
+        self.headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope.get('headers', [])}
+        self.body = body
+        self.client = (scope.get('client') or ('-', 0))[0]
+
+    def json(self) -> Optional[Any]:
+        try:
+            return json.loads(self.body or b'null')
+        except ValueError:
+            return None
+
+
+class Response:
+    __slots__ = ('body', 'status', 'headers')
+
+    def __init__(self, body: bytes, status: int = 200, headers: Dict[str, str] = None,
+                 content_type: str = 'application/json'):
+        self.body = body
+        self.status = status
+        self.headers = {'content-type': content_type, **(headers or {})}
+
+
+def jsonify(data: Any, status: int = 200, headers: Dict[str, str] = None) -> Response:
+    # Flask'ın varsayılan JSON sağlayıcısıyla aynı biçim (sıralı anahtarlar, ASCII, sonda satır sonu)
+    body = json.dumps(data, ensure_ascii=True, sort_keys=True, separators=(',', ':')) + "\n"
+    return Response(body.encode('utf-8'), status, headers)
+
+
+class RateLimiter:
+    """IP ve rota başına sabit pencereli basit sınırlayıcı (Flask tarafındaki flask-limiter limitleriyle aynı)"""
+
+    def __init__(self):
+        self._windows: Dict[Tuple[str, str], Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: Tuple[str, str], limit: int, period: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            start, count = self._windows.get(key, (now, 0))
+            if now - start >= period:
+                start, count = now, 0
+            if count >= limit:
+                return False
+            self._windows[key] = (start, count + 1)
+            if len(self._windows) > 100000:
+                self._windows = {k: v for k, v in self._windows.items() if now - v[0] < 3600}
+            return True
+
+
+def lower_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    # ASGI başlık adlarını küçük harfle bekler
+    return {k.lower(): v for k, v in headers.items()}
+
+
+def parse_limit(text: str) -> Tuple[int, int]:
+    count, _, unit = text.split(' ', 2)
+    return int(count), {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}[unit.strip()]
+
+
+def request_deadline(req: Request) -> float:
+    """?deadline_ms= parametresinden (yoksa SEARCH_DEADLINE_MS) mutlak bitiş zamanını hesapla"""
+    try:
+        budget = int(req.args.get('deadline_ms', Config.SEARCH_DEADLINE_MS))
+    except ValueError:
+        budget = Config.SEARCH_DEADLINE_MS
+    budget = min(max(budget, 50), Config.MAX_SEARCH_DEADLINE_MS)
+    return time.monotonic() + budget / 1000
+
+
+def parse_filters(req: Request) -> dict:
+    return {
+        "genres": req.args.get('genres', '').split(',') if req.args.get('genres') else None,
+        "exclude": req.args.get('exclude', '').split(',') if req.args.get('exclude') else None,
+        "year_min": req.args.get('year_min'),
+        "year_max": req.args.get('year_max'),
+        "playtime_min": req.args.get('playtime_min'),
+        "playtime_max": req.args.get('playtime_max')
+    }
+
+
+def include_breakdown(req: Request, fields=None) -> bool:
+    return 'breakdown' in req.args.get('include', '').split(',') or (fields is not None and 'breakdown' in fields)
+
+
+def busy_response() -> Response:
+    return jsonify({"error": "Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin", "status": "busy"}, 503,
+                   {'retry-after': str(Config.RETRY_AFTER_SECONDS)})
+
+
+class AsgiApp:
+    """
+    Olay döngüsü yalnızca istekleri okuyup yanıtları yazar. Öneri motoru çağrıları kabul
+    kuyruğu kapasitesi kadar iş parçacığı olan bir havuzda, SQLite ve dosya okumaları ayrı
+    küçük bir havuzda çalışır; kapasite doluysa istek hiç kuyruğa girmeden 503 döner.
+    Otomatik tamamlama kendi küçük havuzunu kullanır; havuz doluysa boş liste döner.
+    """
+
+    def __init__(self):
+        self.cpu_pool = ThreadPoolExecutor(max_workers=admission.capacity, thread_name_prefix='asgi-cpu')
+        self.io_pool = ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix='asgi-io')
+        self.lookup_pool = ThreadPoolExecutor(max_workers=LOOKUP_THREADS, thread_name_prefix='asgi-lookup')
+        self.limiter = RateLimiter()
+        self.default_limit = parse_limit(Config.RATE_LIMIT)
+        self.autocomplete_cache: OrderedDict = OrderedDict()
+        self._cpu_inflight = 0
+        self._lookup_inflight = 0
+        self.routes: List[Tuple[str, re.Pattern, Callable, Optional[str]]] = []
+
+        # Flask sürümündeki on_swap (önbellek temizliği) korunur, ASGI önbelleği de temizlenir
+        flask_on_swap = manager.on_swap
+
+        def on_swap(rec):
+            if flask_on_swap: flask_on_swap(rec)
+            self.autocomplete_cache.clear()
+        manager.on_swap = on_swap
+
+        self.route('GET', r'/', self.index)
+        self.route('GET', r'/static/(?P<path>.+)', self.serve_static)
+        self.route('GET', r'/api/health', self.health)
+        self.route('POST', r'/api/admin/reload', self.admin_reload, "10 per hour")
+        self.route('GET', r'/api/search', self.search, "60 per minute")
+        self.route('GET', r'/api/similar/(?P<appid>\d+)', self.similar, "60 per minute")
+        self.route('GET', r'/api/similar', self.similar, "60 per minute")
+        self.route('GET', r'/api/explain', self.explain, "120 per minute")
+        self.route('GET', r'/api/autocomplete', self.autocomplete)
+        self.route('GET', r'/api/surprise', self.surprise)
+        self.route('GET', r'/api/comments', self.get_comments)
+        self.route('POST', r'/api/comments', self.post_comment, "5 per minute")
+
+    def route(self, method: str, pattern: str, handler: Callable, limit: str = None):
+        self.routes.append((method, re.compile(pattern + r'\Z'), handler, limit))
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            return
+
+        body = b''
+        more = True
+        while more:
+            message = await receive()
+            body += message.get('body', b'')
+            more = message.get('more_body', False)
+
+        req = Request(scope, body)
+        try:
+            response = await self.dispatch(req)
+        except Exception as e:
+            logger.error(f"İstek hatası ({req.path}): {e}", exc_info=True)
+            response = jsonify({"error": "Sunucu hatası"}, 500)
+
+        if response.status == 200 and response.headers['content-type'] == 'application/json' \
+                and 'content-encoding' not in response.headers:
+            response.body, encoding = compress(response.body, req.headers.get('accept-encoding'))
+            response.headers['vary'] = 'Accept-Encoding'
+            if encoding:
+                response.headers['content-encoding'] = encoding
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status,
+            'headers': [(k.encode('latin-1'), v.encode('latin-1')) for k, v in response.headers.items()]
+                       + [(b'content-length', str(len(response.body)).encode()),
+                          (b'access-control-allow-origin', b'*')],
+        })
+        await send({'type': 'http.response.body', 'body': response.body})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                threading.Thread(target=initialize_backend, daemon=True).start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                manager.stop_watching()
+                warmer.stop()
+                query_log.flush()
+                comment_store.close()
+                comments_db.close()
+                self.cpu_pool.shutdown(wait=False)
+                self.io_pool.shutdown(wait=False)
+                self.lookup_pool.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def dispatch(self, req: Request) -> Response:
+        allowed = False
+        for method, pattern, handler, limit in self.routes:
+            match = pattern.match(req.path)
+            if not match:
+                continue
+            if method != req.method:
+                allowed = True
+                continue
+            count, period = parse_limit(limit) if limit else self.default_limit
+            if Config.RATE_LIMIT_ENABLED and not self.limiter.hit((req.client, handler.__name__), count, period):
+                return jsonify({"error": f"Too Many Requests: {limit or Config.RATE_LIMIT}"}, 429)
+            return await handler(req, **match.groupdict())
+        if allowed:
+            return jsonify({"error": "Method Not Allowed"}, 405)
+        return jsonify({"error": "Not Found"}, 404)
+
+    async def run_io(self, fn: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.io_pool, partial(fn, *args))
+
+    async def run_admitted(self, req: Request, fn: Callable[..., Response], *args) -> Response:
+        """CPU ağırlıklı işi kabul kuyruğundan geçirerek havuza verir; kapasite doluysa hemen 503"""
+        if self._cpu_inflight >= admission.capacity:
+            admission.reject()
+            return busy_response()
+        deadline = request_deadline(req)
+
+        def admitted():
+            try:
+                with admission.admit(deadline):
+                    return fn(*args, deadline=deadline)
+            except QueueFull:
+                return busy_response()
+
+        self._cpu_inflight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.cpu_pool, admitted)
+        finally:
+            self._cpu_inflight -= 1
+
+    async def index(self, req: Request) -> Response:
+        return Response(await self.run_io(INDEX_PATH.read_bytes), content_type='text/html; charset=utf-8')
+
+    async def serve_static(self, req: Request, path: str) -> Response:
+        target = (STATIC_DIR / path).resolve()
+        if STATIC_DIR not in target.parents or not target.is_file():
+            return jsonify({"error": "Not Found"}, 404)
+        content_type = mimetypes.guess_type(str(target))[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+        headers = {'cache-control': 'no-cache'}
+        if path == 'service-worker.js':
+            headers['service-worker-allowed'] = '/'
+        return Response(await self.run_io(target.read_bytes), content_type=content_type, headers=headers)
+
+    async def health(self, req: Request) -> Response:
+        await self.run_io(comments_db.health_check)
+        progress = manager.progress()
+        active = active_recommender()
+        ready = manager.ready
+        return jsonify({
+            "status": "ready" if ready else "initializing",
+            "mode": getattr(active, "mode", "unavailable"),
+            "error": manager.error,
+            "message": "Sistem yükleniyor..." if not ready else "Sistem aktif",
+            "progress": 100 if ready and not manager.busy else progress["progress"],
+            "eta_seconds": 0 if ready and not manager.busy else progress["eta_seconds"],
+            "stages": progress["stages"],
+            "model_version": manager.version,
+            "rebuilding": ready and manager.busy,
+            "queue": {"pending": admission.pending, "capacity": admission.capacity, "rejected": admission.rejected},
+            "db": {**comments_db.metrics(), "comment_queue": comment_store.metrics()},
+            "warmup": warmer.snapshot()
+        })
+
+    async def admin_reload(self, req: Request) -> Response:
+        token = req.headers.get('x-admin-token', '')
+        if not Config.ADMIN_TOKEN or not hmac.compare_digest(token, Config.ADMIN_TOKEN):
+            return jsonify({"error": "Yetkisiz"}, 403)
+
+        data = req.json() or {}
+        try:
+            started = manager.reload_async(rebuild=bool(data.get('rebuild')), version=data.get('version'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}, 400)
+        if not started:
+            return jsonify({"error": "Zaten bir model kurulumu sürüyor"}, 409)
+        return jsonify({"status": "started", "model_version": manager.version}, 202)
+
+    async def search(self, req: Request) -> Response:
+        engine = active_recommender()
+        if engine is None:
+            progress = manager.progress()
+            return jsonify({
+                "error": "Sistem hazırlanıyor, lütfen bekleyiniz...",
+                "status": "initializing",
+                "progress": progress["progress"],
+                "eta_seconds": progress["eta_seconds"]
+            }, 503)
+        query = req.args.get('q', '').strip()
+        if not query: return jsonify({"error": "Lütfen bir oyun adı girin"}, 400)
+        try:
+            fields = parse_fields(req.args.get('fields'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}, 400)
+
+        filters = parse_filters(req)
+        breakdown = include_breakdown(req, fields)
+        seeds = [g.lower().strip() for g in GameRecommender.split_query(query)]
+        headers = result_cache_headers(engine, "rec", seeds, filters, fields, breakdown)
+        record_query(engine, "rec", seeds, 15, filters)
+        if etag_matches(req.headers.get('if-none-match'), headers.get('ETag')):
+            return Response(b'', 304, lower_headers(headers))
+
+        def compute(deadline=None):
+            try:
+                results = engine.recommend_games(query, n=15, filters=filters, deadline=deadline,
+                                                 include_breakdown=breakdown)
+                partial = getattr(results, "partial", False)
+                return jsonify({
+                    "results": select_fields(results, fields),
+                    "count": len(results),
+                    "query": query,
+                    "mode": getattr(engine, "mode", "full"),
+                    "partial": partial
+                }, headers=lower_headers(NO_STORE if partial else headers))
+            except SingleFlightTimeout:
+                return jsonify({"error": "Arama zaman aşımına uğradı, lütfen tekrar deneyin"}, 504)
+            except Exception as e:
+                logger.error(f"Arama hatası: {e}")
+                return jsonify({"error": "Arama sırasında hata oluştu"}, 500)
+        return await self.run_admitted(req, compute)
+
+    async def similar(self, req: Request, appid: str = None) -> Response:
+        engine = active_recommender()
+        if engine is None: return jsonify({"error": "Sistem hazırlanıyor"}, 503)
+
+        if appid is not None:
+            app_ids = [int(appid)]
+        else:
+            raw = [a.strip() for a in req.args.get('appids', '').split(',') if a.strip()]
+            if not raw or not all(a.isdigit() for a in raw):
+                return jsonify({"error": "Geçerli AppID listesi gerekli (appids=1,2,3)"}, 400)
+            app_ids = [int(a) for a in raw[:10]]
+        try:
+            fields = parse_fields(req.args.get('fields'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}, 400)
+
+        filters = parse_filters(req)
+        breakdown = include_breakdown(req, fields)
+        headers = result_cache_headers(engine, "sim", app_ids, filters, fields, breakdown)
+        record_query(engine, "sim", app_ids, 15, filters)
+        if etag_matches(req.headers.get('if-none-match'), headers.get('ETag')):
+            return Response(b'', 304, lower_headers(headers))
+
+        def compute(deadline=None):
+            try:
+                results = engine.recommend_similar(app_ids, n=15, filters=filters, deadline=deadline,
+                                                   include_breakdown=breakdown)
+                partial = getattr(results, "partial", False)
+                return jsonify({
+                    "results": select_fields(results, fields),
+                    "count": len(results),
+                    "appids": app_ids,
+                    "mode": getattr(engine, "mode", "full"),
+                    "partial": partial
+                }, headers=lower_headers(NO_STORE if partial else headers))
+            except SingleFlightTimeout:
+                return jsonify({"error": "Arama zaman aşımına uğradı, lütfen tekrar deneyin"}, 504)
+            except Exception as e:
+                logger.error(f"Benzer oyun hatası: {e}")
+                return jsonify({"error": "Arama sırasında hata oluştu"}, 500)
+        return await self.run_admitted(req, compute)
+
+    async def explain(self, req: Request) -> Response:
+        engine = active_recommender()
+        if engine is None: return jsonify({"error": "Sistem hazırlanıyor"}, 503)
+
+        appid = req.args.get('appid', '').strip()
+        seed = req.args.get('seed', '').strip()
+        if not appid.isdigit() or not seed:
+            return jsonify({"error": "appid ve seed gerekli"}, 400)
+
+        def compute(deadline=None):
+            result = engine.explain(int(appid), seed)
+            if result is None:
+                return jsonify({"error": "Oyun bulunamadı"}, 404)
+            result["mode"] = getattr(engine, "mode", "full")
+            return jsonify(result)
+        return await self.run_admitted(req, compute)
+
+    async def autocomplete(self, req: Request) -> Response:
+        q = req.args.get('q', '')
+        engine = active_recommender()
+        # Önbellekten dönen önekler de ısıtma günlüğüne sayılır
+        if len(q) >= 2:
+            record_query(engine, "ac", [q.lower()])
+        key = tuple(sorted(req.args.items()))
+        cached = self.autocomplete_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return Response(*cached[1:])
+
+        if engine is None: return jsonify([])
+        if len(q) < 2: return jsonify([])
+        # Her tuş vuruşunda gelir; dolu havuzda beklemek yerine boş liste (önbelleğe yazılmaz)
+        if self._lookup_inflight >= LOOKUP_THREADS:
+            return jsonify([])
+        self._lookup_inflight += 1
+        try:
+            response = jsonify(await asyncio.get_running_loop().run_in_executor(self.lookup_pool, engine.autocomplete, q))
+        except SingleFlightTimeout:
+            return jsonify([])
+        finally:
+            self._lookup_inflight -= 1
+        response.headers['x-serving-mode'] = getattr(engine, "mode", "full")
+
+        if manager.ready:
+            self.autocomplete_cache[key] = (time.monotonic() + 300, response.body, response.status, response.headers)
+            while len(self.autocomplete_cache) > AUTOCOMPLETE_CACHE_SIZE:
+                self.autocomplete_cache.popitem(last=False)
+        return response
+
+    async def surprise(self, req: Request) -> Response:
+        engine = active_recommender()
+        if engine is None: return jsonify({"error": "Sistem hazırlanıyor"}, 503)
+
+        def compute(deadline=None):
+            source_game, results = engine.surprise(n=15, deadline=deadline, include_breakdown=include_breakdown(req))
+            if source_game:
+                return jsonify({
+                    "source": source_game,
+                    "results": results,
+                    "mode": getattr(engine, "mode", "full"),
+                    "partial": getattr(results, "partial", False)
+                })
+            return jsonify({"error": "Sürpriz oyun bulunamadı"}, 404)
+        return await self.run_admitted(req, compute)
+
+    async def get_comments(self, req: Request) -> Response:
+        appid = req.args.get('appid')
+        if not appid:
+            return jsonify({"error": "AppID required"}, 400)
+
+        try:
+            page = await self.run_io(comment_store.get_page, appid, req.args.get('cursor'),
+                                     comment_store.page_size(req.args.get('limit')),
+                                     req.headers.get('if-none-match'), req.headers.get('if-modified-since'),
+                                     req.client)
+        except ValueError as e:
+            return jsonify({"error": str(e)}, 400)
+        except Exception as e:
+            logger.error(f"Error fetching comments: {e}")
+            return jsonify({"error": "Failed to fetch comments"}, 500)
+
+        headers = lower_headers(page.headers)
+        if page.not_modified:
+            return Response(b'', 304, headers)
+        return jsonify(page.comments, headers=headers)
+
+    async def post_comment(self, req: Request) -> Response:
+        data = req.json() or {}
+        appid = data.get('appid')
+        content = data.get('content', '').strip()
+
+        if not appid or not content:
+            return jsonify({"error": "AppID and content required"}, 400)
+
+        if len(content) > 500:
+            return jsonify({"error": "Comment too long (max 500 chars)"}, 400)
+
+        appid = parse_appid(appid)
+        if appid is None:
+            return jsonify({"error": "AppID must be a positive integer"}, 400)
+
+        try:
+            await self.run_io(comment_store.add, appid, content, req.client)
+            return jsonify({"success": True})
+        except QueueFull:
+            return busy_response()
+        except Exception as e:
+            logger.error(f"Error saving comment: {e}")
+            return jsonify({"error": "Failed to save comment"}, 500)
+
+
+app = AsgiApp()
@@ -0,0 +1,264 @@
+# Öneri motorunun performans ölçümlerinin (eşzamanlı istek ölçeklenmesi, HTTP sunucu karşılaştırması, içe aktarma süresi vb.) yapıldığı benchmark.py dosyası.
+import sys
+import time
+import random
+import subprocess
+import asyncio
+import sqlite3
+import argparse
+import threading
+import numpy as np
+from collections import Counter
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+
+from model import GameRecommender, configure_thread_budget
+from manager import ModelManager
+from indexes import INDEX_TYPES, RerankedIndex, index_bytes, new_content_index, new_name_index
+
+try:
+    from config import Config
+except ImportError:
+    class Config:
+        DB_PATH = "games.db"
+        MODEL_PATH = "models"
+        API_THREADS = 8
+        INDEX_RERANK_FACTOR = 3
+        MIN_POPULARITY = 10
+
+# Sunum süreçlerinin içe aktarmaması gereken eğitim/ETL kütüphaneleri (yalnızca yeniden kurulumda yüklenir)
+TRAINING_MODULES = ('pandas', 'sklearn', 'scipy', 'torch', 'sentence_transformers', 'transformers', 'tqdm', 'pyarrow')
+
+
+def load_recommender(args):
+    manager = ModelManager(GameRecommender, db_path=args.db, model_path=args.models)
+    if not manager.reload():
+        sys.exit(f"Model yüklenemedi: {manager.error}")
+    return manager.recommender
+
+
+def sample_queries(recommender, count: int, seed: int = 42):
+    names = recommender.store.column('Name').tolist()
+    random.Random(seed).shuffle(names)
+    return [names[i % len(names)] for i in range(count)]
+
+
+def run_level(recommender, queries, threads: int):
+    """Sorguları verilen iş parçacığı sayısıyla çalıştır; saniyedeki istek ve gecikme yüzdeliklerini döndür"""
+    recommender.clear_cache()
+    latencies = []
+    lock = threading.Lock()
+
+    def one(query):
+        t0 = time.perf_counter()
+        recommender.recommend_games(query)
+        elapsed = time.perf_counter() - t0
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, queries))
+    total = time.perf_counter() - start
+    ms = np.array(latencies) * 1000
+    return len(queries) / total, np.percentile(ms, 50), np.percentile(ms, 95)
+
+
+def scaling(args):
+    recommender = load_recommender(args)
+    levels = [int(t) for t in args.threads.split(',')]
+    queries = sample_queries(recommender, args.requests)
+    run_level(recommender, queries[:20], 1)  # ısınma
+
+    print(f"{'threads':>8} {'omp':>4} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for threads in levels:
+        omp = configure_thread_budget(threads) if not args.no_budget else 0
+        rps, p50, p95 = run_level(recommender, queries, threads)
+        print(f"{threads:>8} {omp or '-':>4} {rps:>9.1f} {p50:>9.1f} {p95:>9.1f}")
+
+
+def recall_at(index: RerankedIndex, exact: np.ndarray, queries: np.ndarray, k: int, params=None) -> float:
+    _, found = index.search(queries, k, params=params)
+    return float(np.mean([len(set(f) & set(e)) / k for f, e in zip(found, exact)]))
+
+
+def memory(args):
+    """İndeks tiplerinin oyun başına bellek maliyetini ve yeniden sıralamalı recall@k değerini raporla"""
+    recommender = load_recommender(args)
+    n = len(recommender.store)
+    rows = np.arange(n)
+    content = recommender.content_index.vectors_for(rows)
+    names = recommender.name_index.vectors_for(rows)
+    sample = np.random.default_rng(42).choice(n, size=min(args.queries, n), replace=False)
+    k = args.k
+
+    # Kesin komşular: LSA için L2, isimler için iç çarpım
+    content_exact = np.argsort(((content[sample, None, :] - content[None, :, :]) ** 2).sum(-1), axis=1, kind='stable')[:, :k]
+    names_exact = np.argsort(-(names[sample] @ names.T), axis=1, kind='stable')[:, :k]
+
+    def build(factory, vectors):
+        index = factory()
+        index.train(vectors)
+        index.add(vectors)
+        return index
+
+    flat_content = index_bytes(build(lambda: new_content_index('flat', content.shape[1], 200), content))
+    flat_names = index_bytes(build(lambda: new_name_index('flat', names.shape[1]), names))
+    before = flat_content + content.nbytes + flat_names
+    print(f"{n} oyun, LSA d={content.shape[1]}, isim d={names.shape[1]}")
+    print(f"önce (IVFFlat + ayrı LSA kopyası + IndexFlatIP): {before / n:,.0f} B/oyun\n")
+
+    print(f"{'tip':>6} {'içerik B':>9} {'isim B':>8} {'toplam B':>9} {'disk B':>8} {'içerik r@' + str(k):>12} {'isim r@' + str(k):>10}")
+    for kind in INDEX_TYPES:
+        quantized = kind != 'flat'
+        c_raw = build(lambda: new_content_index(kind, content.shape[1], 200), content)
+        n_raw = build(lambda: new_name_index(kind, names.shape[1]), names)
+        c_index = RerankedIndex(c_raw, content if quantized else None, args.rerank_factor)
+        n_index = RerankedIndex(n_raw, names if quantized else None, args.rerank_factor)
+        # IVF doğrudan eşlemesi (satır -> liste konumu) oyun başına 8 bayt ekler
+        c_bytes = index_bytes(c_raw) + 8 * n
+        n_bytes = index_bytes(n_raw)
+        disk = (content.nbytes + names.nbytes) if quantized else 0
+        c_recall = recall_at(c_index, content_exact, content[sample], k, recommender.search_params)
+        n_recall = recall_at(n_index, names_exact, names[sample], k)
+        print(f"{kind:>6} {c_bytes / n:>9,.0f} {n_bytes / n:>8,.0f} {(c_bytes + n_bytes) / n:>9,.0f} "
+              f"{disk / n:>8,.0f} {c_recall:>12.3f} {n_recall:>10.3f}")
+    print("\n'disk': yeniden sıralama için bellek eşlemeli okunan tam hassasiyetli vektörler (yerleşik bellek değil)")
+
+
+def http_workload(db_path: str, count: int, seed: int = 42):
+    """Arama, benzer oyun ve otomatik tamamlama isteklerinden oluşan sabit (tohumlu) istek listesi"""
+    from store import CATALOG_QUERY
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = [(row[0], row[1]) for row in conn.execute(CATALOG_QUERY, (Config.MIN_POPULARITY,))]
+    finally:
+        conn.close()
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(count):
+        app_id, name = rng.choice(rows)
+        roll = rng.random()
+        if roll < 0.5:
+            paths.append('/api/search?' + urlencode({'q': name}))
+        elif roll < 0.7:
+            paths.append(f'/api/similar/{app_id}')
+        else:
+            paths.append('/api/autocomplete?' + urlencode({'q': name[:rng.randint(2, 6)]}))
+    return paths
+
+
+async def run_http(base_url: str, paths, concurrency: int):
+    import httpx
+
+    latencies = []
+    statuses = Counter()
+    queue = iter(paths)
+
+    async def worker(client):
+        for path in queue:
+            t0 = time.perf_counter()
+            try:
+                response = await client.get(path)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError:
+                statuses['hata'] += 1
+            latencies.append(time.perf_counter() - t0)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        total = time.perf_counter() - start
+    ms = np.array(latencies) * 1000
+    return len(paths) / total, np.percentile(ms, 50), np.percentile(ms, 95), statuses
+
+
+def http(args):
+    """Aynı istek listesini her sunucuya aynı eşzamanlılıkla gönderip verim ve gecikmeyi karşılaştır"""
+    targets = [t.split('=', 1) for t in args.target]
+    paths = http_workload(args.db, args.requests)
+    levels = [int(c) for c in args.concurrency.split(',')]
+
+    print(f"{'sunucu':>8} {'eşzam.':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}  durum kodları")
+    for name, url in targets:
+        asyncio.run(run_http(url, paths[:50], 4))  # ısınma
+        for concurrency in levels:
+            rps, p50, p95, statuses = asyncio.run(run_http(url, paths, concurrency))
+            codes = ' '.join(f"{code}:{n}" for code, n in sorted(statuses.items(), key=str))
+            print(f"{name:>8} {concurrency:>7} {rps:>9.1f} {p50:>9.1f} {p95:>9.1f}  {codes}")
+    print("\nNot: sunucuları RATE_LIMIT_ENABLED=0 ile başlatın, aksi halde hız sınırı 429 döndürür.")
+
+
+def import_profile(module: str):
+    """Yeni bir yorumlayıcıda -X importtime ile modülü içe aktarır; (toplam µs, {modül: kümülatif µs}) döndürür"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(f"{module} içe aktarılamadı:\n{result.stderr[-2000:]}")
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cum, name = line[len('import time:'):].split('|')
+        cumulative[name.strip()] = int(cum)
+    return cumulative.get(module, 0), cumulative
+
+
+def imports(args):
+    """Sunum modüllerinin içe aktarma süresini bütçeyle karşılaştırır; eğitim kütüphanesi yüklenirse başarısız olur"""
+    failed = False
+    for module in args.modules.split(','):
+        import_profile(module)  # .pyc derlemesi ölçüme girmesin
+        runs = [import_profile(module) for _ in range(args.runs)]
+        total, cumulative = min(runs, key=lambda r: r[0])
+        loaded = sorted({name.split('.')[0] for name in cumulative} & set(TRAINING_MODULES))
+        over = total / 1000 > args.budget_ms
+        failed |= over or bool(loaded)
+        print(f">>> [IMPORT] {module}: {total / 1000:.0f} ms (bütçe {args.budget_ms} ms) {'AŞILDI' if over else 'OK'}")
+        if loaded:
+            print(f">>> [IMPORT] {module}: yüklenmemesi gereken kütüphaneler: {', '.join(loaded)}")
+        top = sorted(((us, name) for name, us in cumulative.items() if '.' not in name and name != module), reverse=True)
+        for us, name in top[:args.top]:
+            print(f"{us / 1000:>10.1f} ms  {name}")
+    sys.exit(1 if failed else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GameHorizon performans ölçümleri")
+    parser.add_argument('--db', default=Config.DB_PATH)
+    parser.add_argument('--models', default=Config.MODEL_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('scaling', help="recommend_games verimini 1..N istek iş parçacığıyla ölç")
+    p.add_argument('--threads', default=f"1,2,4,{Config.API_THREADS}")
+    p.add_argument('--requests', type=int, default=200)
+    p.add_argument('--no-budget', action='store_true', help="FAISS/PyTorch iş parçacığı bütçesini uygulama")
+    p.set_defaults(func=scaling)
+
+    p = sub.add_parser('memory', help="indeks tiplerinin oyun başına bellek maliyeti ve recall@k")
+    p.add_argument('--queries', type=int, default=200)
+    p.add_argument('-k', type=int, default=10)
+    p.add_argument('--rerank-factor', type=int, default=Config.INDEX_RERANK_FACTOR)
+    p.set_defaults(func=memory)
+
+    p = sub.add_parser('http', help="Flask ve ASGI sunucularını aynı yük altında karşılaştır")
+    p.add_argument('--target', action='append', required=True, metavar='AD=URL',
+                   help="ör. --target flask=http://127.0.0.1:5000 --target asgi=http://127.0.0.1:8000")
+    p.add_argument('--concurrency', default="1,8,32")
+    p.add_argument('--requests', type=int, default=500)
+    p.set_defaults(func=http)
+
+    p = sub.add_parser('imports', help="sunum modüllerinin içe aktarma süresi bütçesi (-X importtime)")
+    p.add_argument('--modules', default="app,asgi")
+    p.add_argument('--budget-ms', type=int, default=500)
+    p.add_argument('--runs', type=int, default=3)
+    p.add_argument('--top', type=int, default=8)
+    p.set_defaults(func=imports)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+# Yorumların imleç (keyset) tabanlı sayfalanması, oyun başına sürüm sayacından koşullu GET (ETag/Last-Modified) başlıkları ve toplu yazan (write-behind) yorum kuyruğunun bulunduğu comments.py dosyası.
+import time
+import queue
+import base64
+import hashlib
+import logging
+import sqlite3
+import itertools
+import threading
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from dbpool import ConnectionPool
+from concurrency import QueueFull
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config import Config
+except ImportError:
+    class Config:
+        COMMENTS_PAGE_SIZE = 50
+        COMMENTS_MAX_PAGE_SIZE = 100
+        COMMENT_QUEUE_SIZE = 1000
+        COMMENT_BATCH_SIZE = 200
+        COMMENT_FLUSH_MS = 50
+
+# Oyun başına sürüm sayacı: her ekleme/silmede tetikleyicilerle artar, ETag bundan türetilir
+SCHEMA = [
+    "CREATE INDEX IF NOT EXISTS idx_comments_appid_created ON comments(appid, created_at, id)",
+    """
+    CREATE TABLE IF NOT EXISTS comment_counters (
+        appid INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    # Sayaç anahtarı INTEGER PRIMARY KEY: tamsayı olmayan (eski/elle yazılmış) appid'ler sayaç
+    # tutmaz, yorumun yazılmasını da engellemez. Eski sürümdeki koşulsuz tetikleyici değiştirilir.
+    "DROP TRIGGER IF EXISTS trg_comments_insert",
+    """
+    CREATE TRIGGER trg_comments_insert AFTER INSERT ON comments WHEN typeof(NEW.appid) = 'integer' BEGIN
+        INSERT INTO comment_counters (appid, version, updated_at) VALUES (NEW.appid, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT(appid) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+    END""",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_comments_delete AFTER DELETE ON comments BEGIN
+        UPDATE comment_counters SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE appid = OLD.appid;
+    END""",
+]
+
+# Sayaç tablosu ilk kez oluşturulduğunda mevcut yorumlardan doldurulur
+BACKFILL = """
+    INSERT OR IGNORE INTO comment_counters (appid, version, updated_at)
+    SELECT appid, COUNT(*), MAX(created_at) FROM comments WHERE typeof(appid) = 'integer' GROUP BY appid
+"""
+
+FIRST_PAGE = """
+    SELECT id, content, created_at FROM comments WHERE appid = ?
+    ORDER BY created_at DESC, id DESC LIMIT ?
+"""
+NEXT_PAGE = """
+    SELECT id, content, created_at FROM comments WHERE appid = ? AND (created_at, id) < (?, ?)
+    ORDER BY created_at DESC, id DESC LIMIT ?
+"""
+COUNTER = "SELECT version, updated_at FROM comment_counters WHERE appid = ?"
+# created_at kuyruğa alınma anında atanır; böylece yazarın gördüğü sıra kayıttan sonra da aynı kalır
+INSERT = "INSERT INTO comments (appid, content, created_at) VALUES (?, ?, ?)"
+
+
+def ensure_schema(conn: sqlite3.Connection):
+    created = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'comment_counters'").fetchone() is None
+    for statement in SCHEMA:
+        conn.execute(statement)
+    if created:
+        conn.execute(BACKFILL)
+
+
+def parse_appid(value) -> Optional[int]:
+    """İstekten gelen appid'yi pozitif tamsayıya çevirir; geçersizse None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value.isdigit():
+            return None
+    elif not isinstance(value, int):
+        return None
+    value = int(value)
+    return value if value > 0 else None
+
+
+def encode_cursor(created_at: str, comment_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at}|{comment_id}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Geçersiz imleçte ValueError atar"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, comment_id = raw.rsplit('|', 1)
+        return created_at, int(comment_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Geçersiz imleç: {cursor}") from e
+
+
+def http_date(timestamp: Optional[str]) -> Optional[str]:
+    # SQLite CURRENT_TIMESTAMP UTC'dir ("YYYY-MM-DD HH:MM:SS")
+    if not timestamp:
+        return None
+    moment = datetime.strptime(timestamp[:19], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+    return formatdate(moment.timestamp(), usegmt=True)
+
+
+def utc_timestamp() -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+
+@dataclass
+class PendingComment:
+    seq: int
+    appid: str
+    content: str
+    created_at: str
+    client: Optional[str] = None
+
+
+class CommentWriter:
+    """
+    database.DatabaseWriter ile aynı düzen: ayrı bir iş parçacığı kuyruktan yorumları alır,
+    COMMENT_FLUSH_MS boyunca (en fazla COMMENT_BATCH_SIZE) biriktirir ve tek işlemde yazar.
+    stop_event kurulduktan sonra kuyruk boşalana kadar yazmaya devam eder.
+    """
+
+    def __init__(self, pool: ConnectionPool, batch_queue: queue.Queue, stop_event: threading.Event,
+                 on_commit=None, batch_size: int = None, flush_ms: int = None):
+        self.pool = pool
+        self.batch_queue = batch_queue
+        self.stop_event = stop_event
+        self.on_commit = on_commit
+        self.batch_size = batch_size or Config.COMMENT_BATCH_SIZE
+        self.linger = (flush_ms if flush_ms is not None else Config.COMMENT_FLUSH_MS) / 1000
+        self.stats = {"committed": 0, "batches": 0, "failed": 0}
+
+    def run(self):
+        while not self.stop_event.is_set() or not self.batch_queue.empty():
+            try:
+                batch = [self.batch_queue.get(timeout=1)]
+            except queue.Empty:
+                continue
+            flush_at = time.monotonic() + self.linger
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.batch_queue.get(timeout=max(0.0, flush_at - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:
+                # Beklenmeyen bir hata yazıcı iş parçacığını durdurmaz; grup başarısız sayılır
+                self.stats["failed"] += len(batch)
+                logger.error(f"Yorum grubu yazılamadı ({len(batch)} yorum): {e}", exc_info=True)
+            finally:
+                if self.on_commit:
+                    self.on_commit(batch)
+                for _ in batch:
+                    self.batch_queue.task_done()
+
+    def _write(self, batch: List[PendingComment]):
+        rows = [(c.appid, c.content, c.created_at) for c in batch]
+        try:
+            with self.pool.writer() as conn:
+                conn.executemany(INSERT, rows)
+            self.stats["committed"] += len(rows)
+            self.stats["batches"] += 1
+            return
+        except Exception as e:
+            logger.error(f"Yorum grubu yazılamadı ({len(rows)} yorum), tek tek deneniyor: {e}")
+        # Hatalı kayıt tüm grubu düşürmesin
+        for row in rows:
+            try:
+                with self.pool.writer() as conn:
+                    conn.execute(INSERT, row)
+                self.stats["committed"] += 1
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Yorum yazılamadı (appid={row[0]}): {e}")
+
+
+@dataclass
+class CommentPage:
+    comments: List[Dict] = field(default_factory=list)
+    headers: Dict[str, str] = field(default_factory=dict)
+    not_modified: bool = False
+
+
+class CommentStore:
+    """
+    Yorum okuma/yazma. Sayfalar (appid, created_at, id) bileşik indeksinden en yeniden eskiye
+    okunur; sonraki sayfa son yorumun (created_at, id) çiftini taşıyan imleçle istenir.
+    """
+
+    def __init__(self, pool: ConnectionPool, queue_size: int = None):
+        self.pool = pool
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+        # Henüz yazılmamış yorumlar: gönderen istemci bir sonraki okumada kendi yorumunu görür
+        self._pending: Dict[str, List[PendingComment]] = {}
+        self._pending_lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self.rejected = 0
+        self._queue = queue.Queue(maxsize=queue_size or Config.COMMENT_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self.writer = CommentWriter(pool, self._queue, self._stop, on_commit=self._committed)
+        self._thread = threading.Thread(target=self.writer.run, name="comment-writer", daemon=True)
+        self._thread.start()
+
+    def _ensure_schema(self):
+        # Eski veritabanlarında indeks/sayaç tablosu yoksa ilk istekte oluşturulur
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if not self._schema_ready:
+                with self.pool.writer() as conn:
+                    ensure_schema(conn)
+                self._schema_ready = True
+
+    def page_size(self, limit: Optional[str]) -> int:
+        try:
+            size = int(limit) if limit else Config.COMMENTS_PAGE_SIZE
+        except ValueError:
+            size = Config.COMMENTS_PAGE_SIZE
+        return min(max(size, 1), Config.COMMENTS_MAX_PAGE_SIZE)
+
+    def get_page(self, appid: str, cursor: str = None, limit: int = None,
+                 if_none_match: str = None, if_modified_since: str = None, client: str = None) -> CommentPage:
+        self._ensure_schema()
+        limit = limit or Config.COMMENTS_PAGE_SIZE
+        position = decode_cursor(cursor) if cursor else None
+        key = str(appid).strip()
+        # Bekleyen yorumlar en yenidir, yalnızca gönderene ve ilk sayfada gösterilir
+        with self._pending_lock:
+            pending = [c for c in self._pending.get(key, ()) if c.client == client] if position is None else []
+
+        counter = self.pool.query(COUNTER, (appid,))
+        version, updated_at = (counter[0]['version'], counter[0]['updated_at']) if counter else (0, None)
+        own = ','.join(str(c.seq) for c in pending)
+        tag = hashlib.sha1(f"{appid}|{version}|{cursor or ''}|{limit}|{own}".encode()).hexdigest()[:20]
+        headers = {'ETag': f'W/"{tag}"', 'Cache-Control': 'no-cache'}
+        # Saniye çözünürlüğü: aynı saniyedeki sonraki bir yazma Last-Modified'ı değiştirmez. Bu yüzden
+        # başlık yalnızca o saniye geçtikten sonra verilir; istemcideki her tarih kesinleşmiş olur.
+        last_modified = http_date(updated_at) if updated_at and updated_at[:19] < utc_timestamp() else None
+        if last_modified:
+            headers['Last-Modified'] = last_modified
+
+        if if_none_match is not None:
+            # If-None-Match varsa If-Modified-Since yok sayılır (RFC 9110)
+            # Zayıf karşılaştırma: W/ öneki yok sayılır
+            candidates = {t.strip().removeprefix('W/') for t in if_none_match.split(',')}
+            if f'"{tag}"' in candidates or '*' in candidates:
+                return CommentPage(headers=headers, not_modified=True)
+        elif if_modified_since and last_modified and not pending:
+            try:
+                if parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since):
+                    return CommentPage(headers=headers, not_modified=True)
+            except (TypeError, ValueError):
+                pass
+
+        if position is None:
+            rows = self.pool.query(FIRST_PAGE, (appid, limit + 1))
+        else:
+            rows = self.pool.query(NEXT_PAGE, (appid, position[0], position[1], limit + 1))
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            headers['X-Next-Cursor'] = encode_cursor(last['created_at'], last['id'])
+        comments = [{'content': r['content'], 'created_at': r['created_at']} for r in rows]
+
+        # Okuma sırasında yazılmış olan bekleyen yorumlar iki kez gösterilmez
+        written = {(c['created_at'], c['content']) for c in comments}
+        own_comments = [{'content': c.content, 'created_at': c.created_at} for c in reversed(pending)
+                        if (c.created_at, c.content) not in written]
+        return CommentPage(own_comments + comments, headers)
+
+    def add(self, appid, content: str, client: str = None) -> PendingComment:
+        """Yorumu yazma kuyruğuna alır; kuyruk doluysa QueueFull atar"""
+        self._ensure_schema()
+        if self._stop.is_set():
+            raise QueueFull("Yorum kuyruğu kapatıldı")
+        comment = PendingComment(next(self._seq), str(appid).strip(), content, utc_timestamp(), client)
+        with self._pending_lock:
+            try:
+                self._queue.put_nowait(comment)
+            except queue.Full:
+                self.rejected += 1
+                raise QueueFull("Yorum kuyruğu dolu")
+            self._pending.setdefault(comment.appid, []).append(comment)
+        return comment
+
+    def _committed(self, batch: List[PendingComment]):
+        with self._pending_lock:
+            for comment in batch:
+                waiting = self._pending.get(comment.appid)
+                if waiting:
+                    waiting[:] = [c for c in waiting if c.seq != comment.seq]
+                    if not waiting:
+                        del self._pending[comment.appid]
+
+    def flush(self):
+        """Kuyruktaki tüm yorumlar yazılana kadar bekler"""
+        self._queue.join()
+
+    def close(self):
+        # Kapanışta kuyrukta kalan yorumlar yazılır
+        self._stop.set()
+        self._thread.join()
+
+    def metrics(self) -> Dict[str, int]:
+        with self._pending_lock:
+            pending = sum(len(v) for v in self._pending.values())
+        return {**self.writer.stats, "queued": self._queue.qsize(), "pending": pending,
+                "capacity": self._queue.maxsize, "rejected": self.rejected}
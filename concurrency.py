@@ -0,0 +1,121 @@
+# Eşzamanlı istekler arasında hesaplama paylaşımı (single-flight), kabul kuyruğu ve istek süre bütçesi yardımcılarının bulunduğu concurrency.py dosyası.
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SingleFlightTimeout(TimeoutError):
+    pass
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Aynı anahtarla eşzamanlı gelen çağrıları tek bir hesaplamada birleştirir. İlk çağıran
+    hesaplar, diğerleri sonucu (veya hatayı) bekleyip paylaşır.
+    """
+
+    def __init__(self, timeout: float = None):
+        self.timeout = timeout
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: float = None) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+        elif not call.done.wait(self.timeout if timeout is None else timeout):
+            raise SingleFlightTimeout(f"Eşzamanlı hesaplama zaman aşımına uğradı: {key!r}")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class QueueFull(Exception):
+    pass
+
+
+class AdmissionQueue:
+    """
+    CPU ağırlıklı istekler için sınırlı kabul kuyruğu: en fazla max_active istek çalışır,
+    max_queue istek bekler; kuyruk doluysa veya süre bütçesi beklerken biterse QueueFull atılır.
+    """
+
+    def __init__(self, max_active: int, max_queue: int):
+        self.capacity = max_active + max_queue
+        self.rejected = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_active)
+
+    def reject(self):
+        """Kuyruğa hiç girmeden geri çevrilen istekleri (ör. ASGI havuzu doluyken) sayar"""
+        with self._lock:
+            self.rejected += 1
+
+    @contextmanager
+    def admit(self, deadline: float = None):
+        with self._lock:
+            if self._pending >= self.capacity:
+                self.rejected += 1
+                raise QueueFull("Kabul kuyruğu dolu")
+            self._pending += 1
+        try:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self._slots.acquire(timeout=timeout):
+                self.reject()
+                raise QueueFull("Süre bütçesi kuyrukta beklerken doldu")
+            try:
+                yield
+            finally:
+                self._slots.release()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+
+class Recommendations(list):
+    """Öneri listesi; süre bütçesi dolduğu için erken kesildiyse partial=True taşır"""
+
+    def __init__(self, items=(), partial: bool = False):
+        super().__init__(items)
+        self.partial = partial
+
+
+def expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
@@ -15,8 +15,11 @@ class Config:
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     DB_PATH = os.path.join(BASE_DIR, os.getenv('DB_PATH', 'games.db'))
     MODEL_PATH = os.path.join(BASE_DIR, os.getenv('MODEL_PATH', 'models'))
+    CATALOG_SNAPSHOT_PATH = os.path.join(BASE_DIR, os.getenv('CATALOG_SNAPSHOT_PATH', 'games.arrow'))
+    EMBEDDING_CACHE_PATH = os.path.join(BASE_DIR, os.getenv('EMBEDDING_CACHE_PATH', 'embedding_cache'))
     CACHE_DIR = os.path.join(BASE_DIR, os.getenv('CACHE_DIR', 'image_cache'))
     LOG_DIR = os.path.join(BASE_DIR, os.getenv('LOG_DIR', 'logs'))
+    WARMUP_LOG_PATH = os.path.join(BASE_DIR, os.getenv('WARMUP_LOG_PATH', 'query_log.json'))
     
     
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
@@ -29,6 +32,11 @@ class Config:
     SVD_COMPONENTS = int(os.getenv('SVD_COMPONENTS', 120))
     BATCH_SIZE = int(os.getenv('BATCH_SIZE', 5000))
     MAX_RECOMMENDATIONS = int(os.getenv('MAX_RECOMMENDATIONS', 250))
+    STREAM_BUILD = os.getenv('STREAM_BUILD', 'False').lower() == 'true'
+    STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', 20000))
+    STREAM_SAMPLE_SIZE = int(os.getenv('STREAM_SAMPLE_SIZE', 100000))
+    INGEST_CHUNK_MB = int(os.getenv('INGEST_CHUNK_MB', 8))
+    INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', max(1, (os.cpu_count() or 2) - 1)))
     
     
     GENRE_WEIGHT = float(os.getenv('GENRE_WEIGHT', 0.20))
@@ -61,6 +69,17 @@ class Config:
     API_HOST = os.getenv('API_HOST', '0.0.0.0')
     API_PORT = int(os.getenv('API_PORT', 5000))
     API_THREADS = int(os.getenv('API_THREADS', 8))
+    SEARCH_NPROBE = int(os.getenv('SEARCH_NPROBE', 40))
+    RECOMMENDATION_CACHE_SIZE = int(os.getenv('RECOMMENDATION_CACHE_SIZE', 2048))
+    SINGLE_FLIGHT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_TIMEOUT', 10))
+    SURPRISE_POOL_SIZE = int(os.getenv('SURPRISE_POOL_SIZE', 8))
+    ENCODER_MODEL = os.getenv('ENCODER_MODEL', 'all-MiniLM-L6-v2')
+    CONTENT_INDEX_TYPE = os.getenv('CONTENT_INDEX_TYPE', 'flat')
+    NAME_INDEX_TYPE = os.getenv('NAME_INDEX_TYPE', 'flat')
+    INDEX_RERANK_FACTOR = int(os.getenv('INDEX_RERANK_FACTOR', 3))
+    SHARD_ADDRESSES = os.getenv('SHARD_ADDRESSES', '')
+    SHARD_AUTHKEY = os.getenv('SHARD_AUTHKEY', '')
+    SHARD_TIMEOUT = float(os.getenv('SHARD_TIMEOUT', 10))
     RATE_LIMIT_PER_HOUR = int(os.getenv('RATE_LIMIT_PER_HOUR', 300))
     
     
@@ -68,6 +87,23 @@ class Config:
     DB_JOURNAL_MODE = os.getenv('DB_JOURNAL_MODE', 'WAL')
     DB_SYNCHRONOUS = os.getenv('DB_SYNCHRONOUS', 'NORMAL')
     DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', 268435456))
+    DB_POOL_MAX_READERS = int(os.getenv('DB_POOL_MAX_READERS', 16))
+    DB_STATEMENT_CACHE = int(os.getenv('DB_STATEMENT_CACHE', 64))
+    COMMENTS_PAGE_SIZE = int(os.getenv('COMMENTS_PAGE_SIZE', 50))
+    COMMENTS_MAX_PAGE_SIZE = int(os.getenv('COMMENTS_MAX_PAGE_SIZE', 100))
+    COMMENT_QUEUE_SIZE = int(os.getenv('COMMENT_QUEUE_SIZE', 1000))
+    COMMENT_BATCH_SIZE = int(os.getenv('COMMENT_BATCH_SIZE', 200))
+    COMMENT_FLUSH_MS = int(os.getenv('COMMENT_FLUSH_MS', 50))
+    COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 5))
+    SEARCH_CACHE_MAX_AGE = int(os.getenv('SEARCH_CACHE_MAX_AGE', 300))
+    WARMUP_LOG_SIZE = int(os.getenv('WARMUP_LOG_SIZE', 1000))
+    WARMUP_HALF_LIFE_HOURS = float(os.getenv('WARMUP_HALF_LIFE_HOURS', 24))
+    WARMUP_FLUSH_SECONDS = int(os.getenv('WARMUP_FLUSH_SECONDS', 60))
+    WARMUP_TOP_K = int(os.getenv('WARMUP_TOP_K', 200))
+    WARMUP_CPU_FRACTION = float(os.getenv('WARMUP_CPU_FRACTION', 0.5))
+    WARMUP_MAX_SECONDS = int(os.getenv('WARMUP_MAX_SECONDS', 120))
     CLEAN_CACHE_ON_START = os.getenv('CLEAN_CACHE_ON_START', 'False').lower() == 'true'
     
     
@@ -78,11 +114,7 @@ class Config:
     BAYESIAN_PRIOR_WEIGHT = int(os.getenv('BAYESIAN_PRIOR_WEIGHT', 15))
     BAYESIAN_PRIOR_MEAN = float(os.getenv('BAYESIAN_PRIOR_MEAN', 0.6))
 
-<<<<<<< HEAD
 
-=======
-    
->>>>>>> cdbd22f7fbdc20f081bee3139c5a9d5fa1f59fee
     FAISS_NLIST = int(os.getenv('FAISS_NLIST', 100))
     FAISS_NPROBE = int(os.getenv('FAISS_NPROBE', 10))
     MIN_FAISS_SAMPLES = int(os.getenv('MIN_FAISS_SAMPLES', 1000))
@@ -99,27 +131,18 @@ class Config:
         "quick money", "reskin", "poor quality", "bad reviews"
     ]
     
-<<<<<<< HEAD
 
     MODEL_INIT_TIMEOUT = int(os.getenv('MODEL_INIT_TIMEOUT', 300))
     MODEL_RETRY_ATTEMPTS = int(os.getenv('MODEL_RETRY_ATTEMPTS', 3))
+    INIT_WORKERS = int(os.getenv('INIT_WORKERS', 3))
+    MODEL_WATCH_INTERVAL = int(os.getenv('MODEL_WATCH_INTERVAL', 30))
+    MODEL_KEEP_VERSIONS = int(os.getenv('MODEL_KEEP_VERSIONS', 2))
     
     
     PRICE_QUOTA = {'low': 5, 'mid': 4, 'high': 3}
     PRICE_BRACKETS = {'low': (0, 9.99), 'mid': (10, 29.99), 'high': (30, float('inf'))}
     
     
-=======
-    
-    MODEL_INIT_TIMEOUT = int(os.getenv('MODEL_INIT_TIMEOUT', 300))
-    MODEL_RETRY_ATTEMPTS = int(os.getenv('MODEL_RETRY_ATTEMPTS', 3))
-    
-
-    PRICE_QUOTA = {'low': 5, 'mid': 4, 'high': 3}
-    PRICE_BRACKETS = {'low': (0, 9.99), 'mid': (10, 29.99), 'high': (30, float('inf'))}
-    
- 
->>>>>>> cdbd22f7fbdc20f081bee3139c5a9d5fa1f59fee
     MAX_DEVELOPER_RECOMMENDATIONS = 3
     
 
@@ -144,6 +167,8 @@ class Config:
         "Retro", "Memes" , "Rich Story" , "Funny", "Important Choices"
     ]
 
+    _initialized = False
+
     @classmethod
     def validate(cls) -> bool:
         """Config değerlerini doğrula"""
@@ -168,11 +193,11 @@ class Config:
         if cls.LOG_LEVEL not in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']:
             errors.append(f"Geçersiz LOG_LEVEL: {cls.LOG_LEVEL}")
 
+        for name in ('CONTENT_INDEX_TYPE', 'NAME_INDEX_TYPE'):
+            if getattr(cls, name) not in ['flat', 'fp16', 'sq8', 'pq']:
+                errors.append(f"Geçersiz {name}: {getattr(cls, name)}")
         
-<<<<<<< HEAD
         
-=======
->>>>>>> cdbd22f7fbdc20f081bee3139c5a9d5fa1f59fee
         weights = [
             cls.GENRE_WEIGHT, cls.GAMEPLAY_WEIGHT, cls.THEME_WEIGHT,
             cls.PRICE_WEIGHT, cls.VISUAL_WEIGHT, cls.DESCRIPTION_WEIGHT,
@@ -205,9 +230,18 @@ class Config:
         for key, value in config_dict.items():
             if 'PASSWORD' not in key and 'SECRET' not in key and 'KEY' not in key:
                 logging.info(f"  {key}: {value}")
-
-
-if not Config.validate():
-    logging.warning("Config doğrulama hatası - bazı ayarlar default değerlerle çalışacak")
-
-Config.log_config()
+    
+    @classmethod
+    def initialize(cls) -> bool:
+        """
+        Dizinleri oluşturur, ayarları doğrular ve loglar. İçe aktarmada değil giriş noktalarında
+        (ETL, model kurulumu, sunucu başlangıcı) bir kez çağrılır.
+        """
+        if cls._initialized:
+            return True
+        cls._initialized = True
+        valid = cls.validate()
+        if not valid:
+            logging.warning("Config doğrulama hatası - bazı ayarlar default değerlerle çalışacak")
+        cls.log_config()
+        return valid
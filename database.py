@@ -5,14 +5,18 @@ import re
 import logging
 import math
 import os
+import mmap
 import time
 import sys
 import psutil
-from typing import Dict, Any, Iterator, Tuple, Optional
+import multiprocessing
+from typing import Dict, Any, Iterator, List, Tuple, Optional
 from pathlib import Path
 import threading
 import queue
 import gc
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -23,16 +27,12 @@ try:
 except ImportError:
     sys.exit(1)
 
+from store import write_catalog_snapshot
+from dbpool import DB_PRAGMAS
+from comments import ensure_schema as ensure_comment_schema
+from ingest import InputReader, Throughput
+
 BATCH_SIZE = min(Config.BATCH_SIZE, 5000)
-DB_PRAGMAS = {
-    "journal_mode": Config.DB_JOURNAL_MODE,
-    "synchronous": "OFF",
-    "cache_size": f"-{Config.DB_CACHE_SIZE}",
-    "temp_store": "MEMORY",
-    "busy_timeout": 60000,
-    "mmap_size": Config.DB_MMAP_SIZE,
-    "auto_vacuum": "NONE"
-}
 
 processed_count = 0
 total_records = 0
@@ -49,6 +49,7 @@ class ProcessingStats:
 stats = ProcessingStats()
 
 def setup_directories():
+    Config.initialize()
     Path(Config.LOG_DIR).mkdir(parents=True, exist_ok=True)
 
 def clean_text_cached(text: str, max_length: int = 5000) -> str:
@@ -142,11 +143,11 @@ def create_database(db_path: str = Config.DB_PATH) -> None:
                 ("idx_price", "games(price)"),
                 ("idx_developer", "games(developer)"),
                 ("idx_playtime", "games(average_playtime_forever)"),
-                ("idx_combined_search", "games(popularity_score, price, genres)"),
-                ("idx_comments_appid", "comments(appid)")
+                ("idx_combined_search", "games(popularity_score, price, genres)")
             ]
             for idx_name, idx_def in indexes:
                 cursor.execute(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {idx_def}")
+            ensure_comment_schema(conn)
             conn.commit()
     except Exception as e:
         logger.error(f"DB Error: {e}")
@@ -213,25 +214,74 @@ def process_game_record_optimized(game_data: Dict[str, Any], app_id: int) -> Opt
         stats.failed_records += 1
         return None
 
-def stream_json_records_optimized(file_path: Path) -> Iterator[Tuple[int, Dict[str, Any]]]:
-    try:
-        with file_path.open('r', encoding='utf-8', buffering=1024*1024) as f:
-            for line in f:
-                try:
-                    data = json.loads(line)
-                    for app_id, game_data in data.items():
-                        yield int(app_id), game_data
-                except:
-                    continue
-    except Exception as e:
-        logger.error(f"File Read Error: {e}")
-        raise
+def parse_lines(buffer, start: int, end: int) -> List[Tuple]:
+    """buffer[start:end] aralığındaki JSON satırlarını kayıtlara dönüştürür (mmap veya bytes)"""
+    records = []
+    pos = start
+    while pos < end:
+        newline = buffer.find(b'\n', pos, end)
+        stop = end if newline == -1 else newline
+        line = buffer[pos:stop]
+        pos = stop + 1
+        try:
+            for app_id, game_data in json.loads(line).items():
+                record = process_game_record_optimized(game_data, int(app_id))
+                if record:
+                    records.append(record)
+        except (ValueError, AttributeError):
+            continue
+    return records
+
+def _parse_counted(buffer, start: int, end: int) -> Tuple[List[Tuple], int, int]:
+    # İşçi süreçteki sayaçlar ana sürece (başarılı, hatalı) farkı olarak döner
+    ok, failed = stats.successful_records, stats.failed_records
+    records = parse_lines(buffer, start, end)
+    return records, stats.successful_records - ok, stats.failed_records - failed
+
+def _parse_range(path: str, start: int, end: int) -> Tuple[List[Tuple], int, int]:
+    # Süreçler arasında yalnızca ofsetler taşınır; işçi dosyayı kendisi bellek eşler
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _parse_counted(mm, start, end)
+
+def _parse_block(block: bytes) -> Tuple[List[Tuple], int, int]:
+    return _parse_counted(block, 0, len(block))
+
+def iter_record_batches(reader: InputReader, workers: int) -> Iterator[List[Tuple]]:
+    """Parçaları girdi sırasıyla ayrıştırır; workers > 1 ise ayrıştırma süreç havuzunda yapılır"""
+    if reader.mapped:
+        jobs = ((_parse_range, reader.path, start, end) for start, end in reader.ranges())
+    else:
+        jobs = ((_parse_block, block) for block in reader.blocks())
+
+    if workers <= 1:
+        for fn, *args in jobs:
+            yield fn(*args)[0]
+        return
+
+    def collect(future):
+        records, ok, failed = future.result()
+        stats.successful_records += ok
+        stats.failed_records += failed
+        return records
+
+    # Yazıcı iş parçacığı çalışırken fork güvenli değil; işçiler temiz süreçte başlar
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        pending = deque()
+        for fn, *args in jobs:
+            pending.append(pool.submit(fn, *args))
+            # Okuyucu ayrıştırmanın çok önüne geçip belleği doldurmasın
+            if len(pending) >= workers * 2:
+                yield collect(pending.popleft())
+        while pending:
+            yield collect(pending.popleft())
 
 class DatabaseWriter:
-    def __init__(self, db_path: str, batch_queue: queue.Queue, stop_event: threading.Event):
+    def __init__(self, db_path: str, batch_queue: queue.Queue, stop_event: threading.Event,
+                 throughput: Optional[Throughput] = None):
         self.db_path = db_path
         self.batch_queue = batch_queue
         self.stop_event = stop_event
+        self.throughput = throughput or Throughput()
         self.conn = None
 
     def run(self):
@@ -266,9 +316,10 @@ class DatabaseWriter:
                     self.conn.executemany(insert_query, current_batch)
                     self.conn.commit()
                     processed_count += len(current_batch)
+                    self.throughput.add_records(len(current_batch))
                     current_batch = []
                     seen_names.clear()
-                    logger.info(f"Processed: {processed_count}")
+                    logger.info(self.throughput.summary())
                 self.batch_queue.task_done()
             except queue.Empty:
                 continue
@@ -279,6 +330,7 @@ class DatabaseWriter:
             self.conn.executemany(insert_query, current_batch)
             self.conn.commit()
             processed_count += len(current_batch)
+            self.throughput.add_records(len(current_batch))
         
         self.conn.close()
 
@@ -288,14 +340,19 @@ def load_data_optimized(json_file: Path, db_path: str = Config.DB_PATH) -> None:
     batch_queue = queue.Queue(maxsize=50)
     stop_event = threading.Event()
     
-    writer = DatabaseWriter(db_path, batch_queue, stop_event)
+    reader = InputReader(json_file, Config.INGEST_CHUNK_MB * 1024 * 1024)
+    throughput = Throughput(reader.size)
+    logger.info(f"Girdi: {json_file} ({reader.size / 1e6:.1f} MB, "
+                f"{reader.compression or 'sıkıştırılmamış, bellek eşlemeli'}), {Config.INGEST_WORKERS} ayrıştırma işçisi")
+    
+    writer = DatabaseWriter(db_path, batch_queue, stop_event, throughput)
     writer_thread = threading.Thread(target=writer.run, daemon=True)
     writer_thread.start()
     
     batch = []
-    for app_id, game_data in stream_json_records_optimized(json_file):
-        record = process_game_record_optimized(game_data, app_id)
-        if record:
+    for records in iter_record_batches(reader, Config.INGEST_WORKERS):
+        throughput.set_position(reader.position)
+        for record in records:
             batch.append(record)
             if len(batch) >= 1000:
                 batch_queue.put(batch)
@@ -306,7 +363,9 @@ def load_data_optimized(json_file: Path, db_path: str = Config.DB_PATH) -> None:
     
     stop_event.set()
     writer_thread.join()
+    logger.info(throughput.summary())
     populate_fts_table(db_path)
+    write_catalog_snapshot(db_path, Config.CATALOG_SNAPSHOT_PATH, Config.MIN_POPULARITY)
 
 def populate_fts_table(db_path: str):
     with sqlite3.connect(db_path) as conn:
@@ -314,13 +373,16 @@ def populate_fts_table(db_path: str):
         conn.execute("INSERT INTO games_fts (AppID, Name, CleanName, genres, developer, tags, detailed_description) SELECT AppID, Name, CleanName, genres, developer, tags, detailed_description FROM games")
         conn.execute("INSERT INTO games_fts(games_fts) VALUES('optimize')")
         conn.commit()
+        # Sunucudaki ModelManager ana dosyayı izler; yeni katalog WAL'da beklemesin
+        conn.execute("PRAGMA wal_checkpoint(FULL)")
 
 def main():
     setup_directories()
     create_database()
-    json_stream_file = Path("games.json.stream")
+    # gzip/zstd/xz sıkıştırılmış dökümler de verilebilir: python database.py games.json.stream.zst
+    json_stream_file = Path(sys.argv[1] if len(sys.argv) > 1 else "games.json.stream")
     if not json_stream_file.exists():
-        logger.error("games.json.stream bulunamadi.")
+        logger.error(f"{json_stream_file} bulunamadi.")
         sys.exit(1)
     load_data_optimized(json_stream_file)
 
@@ -0,0 +1,225 @@
+# SQLite bağlantı havuzunun (iş parçacığı başına yeniden kullanılan salt okunur bağlantılar + tek yazıcı bağlantı) bulunduğu dbpool.py dosyası.
+import time
+import sqlite3
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config import Config
+except ImportError:
+    class Config:
+        DB_CACHE_SIZE = 2000000
+        DB_JOURNAL_MODE = "WAL"
+        DB_SYNCHRONOUS = "NORMAL"
+        DB_MMAP_SIZE = 268435456
+        DB_POOL_MAX_READERS = 16
+        DB_STATEMENT_CACHE = 64
+
+DB_PRAGMAS = {
+    "journal_mode": Config.DB_JOURNAL_MODE,
+    "synchronous": "OFF",
+    "cache_size": f"-{Config.DB_CACHE_SIZE}",
+    "temp_store": "MEMORY",
+    "busy_timeout": 60000,
+    "mmap_size": Config.DB_MMAP_SIZE,
+    "auto_vacuum": "NONE"
+}
+
+# Salt okunur bağlantıda yalnızca bağlantıya özel ayarlar uygulanabilir (günlük kipi vb. dosyaya yazılır)
+READ_PRAGMAS = ("cache_size", "temp_store", "busy_timeout", "mmap_size")
+
+# Bağlantının kendisinin kullanılamaz olduğunu gösteren birincil SQLite hata kodları
+# (SQLITE_IOERR, SQLITE_CORRUPT, SQLITE_CANTOPEN, SQLITE_NOTADB); kilit/meşgul ve SQL hataları değil
+BROKEN_ERROR_CODES = (10, 11, 14, 26)
+
+
+class ConnectionPool:
+    """
+    Okumalar için iş parçacığı başına bir salt okunur bağlantı tutar; bağlantı ve derlenmiş
+    ifade önbelleği (cached_statements) aynı iş parçacığındaki sonraki isteklerde yeniden
+    kullanılır. İş parçacığı sonlandığında bağlantısı boştaki listeye döner ve yeni bir iş
+    parçacığına verilir. Tüm yazmalar kilitle korunan tek bir bağlantıdan geçer.
+    """
+
+    def __init__(self, db_path: str, max_readers: int = None, statement_cache: int = None):
+        self.db_path = db_path
+        self.max_readers = max_readers or Config.DB_POOL_MAX_READERS
+        self.statement_cache = statement_cache or Config.DB_STATEMENT_CACHE
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._idle: List[sqlite3.Connection] = []
+        self._readers = 0
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        self._stats = {"reads": 0, "writes": 0, "opened": 0, "reused": 0, "overflow": 0, "errors": 0,
+                       "write_wait_ms": 0.0}
+        self._last_health: Dict[str, Any] = {}
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        if read_only:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False,
+                                   cached_statements=self.statement_cache)
+            pragmas = {k: DB_PRAGMAS[k] for k in READ_PRAGMAS}
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=self.statement_cache)
+            # Toplu ETL'deki synchronous=OFF kullanıcı verisi için uygun değil
+            pragmas = {**DB_PRAGMAS, "synchronous": Config.DB_SYNCHRONOUS}
+        for pragma, value in pragmas.items():
+            conn.execute(f"PRAGMA {pragma}={value}")
+        conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._stats["opened"] += 1
+        return conn
+
+    def _release(self, conn: sqlite3.Connection):
+        # İş parçacığı sonlandığında çağrılır
+        with self._lock:
+            self._idle.append(conn)
+
+    @staticmethod
+    def _is_broken(conn: sqlite3.Connection, error: sqlite3.Error) -> bool:
+        code = getattr(error, "sqlite_errorcode", None)
+        if code is not None and code & 0xff in BROKEN_ERROR_CODES:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            return True
+        return False
+
+    def _discard(self, conn: sqlite3.Connection):
+        self._local.finalizer.detach()
+        self._local.conn = None
+        with self._lock:
+            self._readers -= 1
+            self._stats["errors"] += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            with self._lock:
+                self._stats["reused"] += 1
+        else:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+                overflow = conn is None and self._readers >= self.max_readers
+                if conn is None and not overflow:
+                    self._readers += 1
+                if overflow:
+                    self._stats["overflow"] += 1
+                elif conn is not None:
+                    self._stats["reused"] += 1
+            if overflow:
+                # Havuz dolu: tek kullanımlık bağlantı
+                temp = self._connect(read_only=True)
+                try:
+                    yield temp
+                finally:
+                    temp.close()
+                return
+            if conn is None:
+                try:
+                    conn = self._connect(read_only=True)
+                except sqlite3.Error:
+                    with self._lock:
+                        self._readers -= 1
+                        self._stats["errors"] += 1
+                    raise
+            self._local.conn = conn
+            self._local.finalizer = weakref.finalize(threading.current_thread(), self._release, conn)
+
+        try:
+            yield conn
+        except sqlite3.Error as e:
+            # Geçici kilit/meşgul ve çağıranın SQL hataları sağlam bağlantıyı kapatmaz
+            if self._is_broken(conn, e):
+                self._discard(conn)
+            raise
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        t0 = time.perf_counter()
+        with self._write_lock:
+            with self._lock:
+                self._stats["write_wait_ms"] += (time.perf_counter() - t0) * 1000
+            if self._writer is None:
+                self._writer = self._connect(read_only=False)
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    def query(self, sql: str, params: Sequence = ()) -> List[sqlite3.Row]:
+        with self.reader() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        with self._lock:
+            self._stats["reads"] += 1
+        return rows
+
+    def execute(self, sql: str, params: Sequence = ()) -> int:
+        with self.writer() as conn:
+            cursor = conn.execute(sql, params)
+        with self._lock:
+            self._stats["writes"] += 1
+        return cursor.lastrowid
+
+    def health_check(self) -> Dict[str, Any]:
+        """Bir okuyucu ve yazıcı bağlantıyla basit sorgu çalıştırır; bozuk yazıcı bağlantısını yeniler"""
+        result = {"ok": True, "checked_at": time.time()}
+        t0 = time.perf_counter()
+        try:
+            with self.reader() as conn:
+                conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone()
+            result["read_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        except sqlite3.Error as e:
+            result.update(ok=False, error=f"okuma: {e}")
+        if self._writer is not None:
+            try:
+                with self._write_lock:
+                    self._writer.execute("SELECT 1").fetchone()
+            except sqlite3.Error as e:
+                result.update(ok=False, error=f"yazma: {e}")
+                with self._write_lock:
+                    broken, self._writer = self._writer, None
+                if broken is not None:
+                    try:
+                        broken.close()
+                    except sqlite3.Error:
+                        pass
+        self._last_health = result
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "write_wait_ms": round(self._stats["write_wait_ms"], 2),
+                "readers": self._readers,
+                "idle": len(self._idle),
+                "max_readers": self.max_readers,
+                "writer_open": self._writer is not None,
+                "health": self._last_health,
+            }
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._readers -= len(idle)
+        for conn in idle:
+            conn.close()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
@@ -0,0 +1,299 @@
+# Model hazırlanırken doğrudan SQLite (indeksler + FTS5) üzerinden hizmet veren yedek (degraded) öneri katmanının bulunduğu degraded.py dosyası.
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Union
+
+from concurrency import Recommendations, expired
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config import Config
+except ImportError:
+    class Config:
+        DB_PATH = "games.db"
+        MIN_POPULARITY = 10
+        RECOMMENDATION_COUNT = 15
+        MIN_EXCLUSION_MATCH = 0.20
+        MAX_DEVELOPER_RECOMMENDATIONS = 2
+
+GAME_COLUMNS = """AppID, Name, CleanName, genres, developer, price, header_image, SteamURL,
+                  popularity_score, tags, release_date, average_playtime_forever"""
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _split_genres(genres: Optional[str]) -> List[str]:
+    return [g.strip() for g in str(genres or '').split(',') if g.strip()]
+
+
+def _parse_tags(tags: Optional[str]) -> Dict[str, float]:
+    try:
+        parsed = json.loads(tags or '{}')
+    except (TypeError, ValueError):
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+class DegradedRecommender:
+    """
+    Tam model kurulurken SQLite'tan sade isim araması, otomatik tamamlama ve tür/etiket
+    örtüşmesine dayalı öneriler sunar. Tüm sorgular mevcut indeksleri ve FTS5 tablosunu kullanır.
+    """
+    mode = "degraded"
+
+    def __init__(self, db_path: str = None, config=None):
+        self.config = config or Config
+        self.db_path = db_path or self.config.DB_PATH
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def available(self) -> bool:
+        try:
+            self._conn().execute("SELECT 1 FROM games LIMIT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def find_game(self, name: str) -> Optional[sqlite3.Row]:
+        name = name.strip()
+        if not name: return None
+        conn = self._conn()
+        min_pop = self.config.MIN_POPULARITY
+
+        row = conn.execute(
+            f"SELECT {GAME_COLUMNS} FROM games WHERE Name = ? AND popularity_score > ? ORDER BY popularity_score DESC LIMIT 1",
+            (name, min_pop)).fetchone()
+        if row: return row
+
+        clean = re.sub(r'[^\w\s]', '', name.lower()).strip()
+        row = conn.execute(
+            f"SELECT {GAME_COLUMNS} FROM games WHERE CleanName = ? AND popularity_score > ? ORDER BY popularity_score DESC LIMIT 1",
+            (clean, min_pop)).fetchone()
+        if row: return row
+
+        prefix = name.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        return conn.execute(
+            f"SELECT {GAME_COLUMNS} FROM games WHERE Name LIKE ? ESCAPE '\\' AND popularity_score > ? ORDER BY popularity_score DESC LIMIT 1",
+            (prefix, min_pop)).fetchone()
+
+    def autocomplete(self, query: str, limit: int = 5) -> List[str]:
+        query = query.strip()
+        if not query: return []
+        conn = self._conn()
+        min_pop = self.config.MIN_POPULARITY
+        prefix = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+        rows = conn.execute(
+            "SELECT Name, CleanName FROM games WHERE Name LIKE ? ESCAPE '\\' AND popularity_score > ? ORDER BY popularity_score DESC LIMIT ?",
+            (prefix, min_pop, limit * 3)).fetchall()
+        if len(rows) < limit:
+            words = [w for w in re.findall(r'\w+', query.lower()) if w]
+            if words:
+                match = "Name : (" + " ".join(_fts_phrase(w) + "*" for w in words) + ")"
+                try:
+                    rows += conn.execute(
+                        """SELECT g.Name, g.CleanName FROM games_fts f JOIN games g ON g.AppID = f.AppID
+                           WHERE games_fts MATCH ? AND g.popularity_score > ? ORDER BY f.rank LIMIT ?""",
+                        (match, min_pop, limit * 3)).fetchall()
+                except sqlite3.Error as e:
+                    logger.debug(f"FTS otomatik tamamlama hatası: {e}")
+
+        names, seen = [], set()
+        for row in rows:
+            if row['CleanName'] in seen: continue
+            seen.add(row['CleanName'])
+            names.append(row['Name'])
+        return names[:limit]
+
+    def get_random_high_rated_game(self) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT Name, AppID FROM games WHERE popularity_score > 75 AND price > 0 ORDER BY random() LIMIT 1").fetchone()
+        return {"Name": row['Name'], "AppID": int(row['AppID'])} if row else None
+
+    def surprise(self, n: int = None, deadline: float = None, include_breakdown: bool = False):
+        source = self.get_random_high_rated_game()
+        if source is None: return None, []
+        return source, self.recommend_similar(source['AppID'], n=n, deadline=deadline, include_breakdown=include_breakdown)
+
+    def recommend_games(self, game_names: Union[str, List[str]], n: int = None, filters: dict = None,
+                        deadline: float = None, include_breakdown: bool = False) -> List[Dict[str, Any]]:
+        if n is None: n = self.config.RECOMMENDATION_COUNT
+        filters = filters or {}
+        if isinstance(game_names, str):
+            game_names = [g.strip() for g in game_names.split('+') if g.strip()]
+
+        seeds = [row for row in (self.find_game(name) for name in game_names) if row is not None]
+        return self._recommend_rows(seeds, n, filters, deadline, include_breakdown)
+
+    def recommend_similar(self, app_ids: Union[int, List[int]], n: int = None, filters: dict = None,
+                          deadline: float = None, include_breakdown: bool = False) -> List[Dict[str, Any]]:
+        if n is None: n = self.config.RECOMMENDATION_COUNT
+        if isinstance(app_ids, int):
+            app_ids = [app_ids]
+        seeds = [row for row in (self._find_app_id(a) for a in app_ids) if row is not None]
+        return self._recommend_rows(seeds, n, filters or {}, deadline, include_breakdown)
+
+    def _recommend_rows(self, seeds: List[sqlite3.Row], n: int, filters: dict, deadline: float,
+                        include_breakdown: bool) -> List[Dict[str, Any]]:
+        if not seeds: return []
+
+        seed_genres, seed_tags = self._seed_profile(seeds)
+        top_tags = sorted(seed_tags, key=seed_tags.get, reverse=True)[:10]
+
+        clauses = []
+        if seed_genres:
+            clauses.append("(genres : (" + " OR ".join(_fts_phrase(g) for g in seed_genres) + "))")
+        if top_tags:
+            clauses.append("(tags : (" + " OR ".join(_fts_phrase(t) for t in top_tags) + "))")
+        if not clauses: return []
+
+        try:
+            rows = self._conn().execute(
+                f"""SELECT {', '.join('g.' + c.strip() for c in GAME_COLUMNS.split(','))}
+                    FROM games_fts f JOIN games g ON g.AppID = f.AppID
+                    WHERE games_fts MATCH ? AND g.popularity_score > ?
+                    ORDER BY f.rank LIMIT ?""",
+                (" OR ".join(clauses), self.config.MIN_POPULARITY, max(400, n * 20))).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Degraded öneri sorgu hatası: {e}")
+            return []
+
+        seen_ids = {int(s['AppID']) for s in seeds}
+        seen_names = {s['CleanName'] for s in seeds}
+        scored = []
+        partial = False
+        for row in rows:
+            if expired(deadline):
+                partial = True
+                break
+            if int(row['AppID']) in seen_ids or row['CleanName'] in seen_names: continue
+            if not self._passes_filters(row, filters): continue
+            seen_ids.add(int(row['AppID']))
+            seen_names.add(row['CleanName'])
+            scored.append((*self._score(seed_genres, seed_tags, row), row))
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        developer_counts = defaultdict(int)
+        results = Recommendations(partial=partial)
+        for score, genre_sim, tag_sim, row in scored:
+            dev = str(row['developer'] or '').lower()
+            if dev and developer_counts[dev] >= self.config.MAX_DEVELOPER_RECOMMENDATIONS: continue
+            developer_counts[dev] += 1
+            results.append(self._format_result(row, score, genre_sim, tag_sim, include_breakdown))
+            if len(results) >= n: break
+        return results
+
+    def explain(self, app_id: int, seed: str) -> Optional[Dict[str, Any]]:
+        seeds = []
+        for name in (s.strip() for s in str(seed).split('+') if s.strip()):
+            row = self._find_app_id(int(name)) if name.isdigit() else self.find_game(name)
+            if row is not None: seeds.append(row)
+        candidate = self._find_app_id(app_id)
+        if candidate is None or not seeds: return None
+
+        score, genre_sim, tag_sim = self._score(*self._seed_profile(seeds), candidate)
+        result = self._format_result(candidate, score, genre_sim, tag_sim, True)
+        result["seed"] = [s['Name'] for s in seeds]
+        return result
+
+    def _find_app_id(self, app_id: int) -> Optional[sqlite3.Row]:
+        return self._conn().execute(f"SELECT {GAME_COLUMNS} FROM games WHERE AppID = ?", (int(app_id),)).fetchone()
+
+    @staticmethod
+    def _seed_profile(seeds: List[sqlite3.Row]):
+        seed_genres = set()
+        seed_tags: Dict[str, float] = defaultdict(float)
+        for seed in seeds:
+            seed_genres.update(_split_genres(seed['genres']))
+            for tag, votes in _parse_tags(seed['tags']).items():
+                seed_tags[tag] += float(votes)
+        return seed_genres, seed_tags
+
+    @staticmethod
+    def _score(seed_genres: set, seed_tags: Dict[str, float], row: sqlite3.Row):
+        genres = set(_split_genres(row['genres']))
+        union = seed_genres | genres
+        genre_sim = len(seed_genres & genres) / len(union) if union else 0.0
+        cand_tags = _parse_tags(row['tags'])
+        seed_tag_total = sum(seed_tags.values())
+        tag_sim = 0.0
+        if seed_tag_total and cand_tags:
+            common = set(seed_tags) & set(cand_tags)
+            tag_sim = sum(min(seed_tags[t], float(cand_tags[t])) for t in common) / seed_tag_total
+        popularity = float(row['popularity_score'] or 0)
+        return 0.5 * genre_sim + 0.35 * tag_sim + 0.15 * popularity / 100, genre_sim, tag_sim
+
+    def _passes_filters(self, row: sqlite3.Row, filters: dict) -> bool:
+        genres = [g.lower() for g in _split_genres(row['genres'])]
+        genre_filter = filters.get('genres')
+        if genre_filter:
+            terms = [t.lower().strip() for t in genre_filter if t and t.strip()]
+            if terms and not any(re.search(r'\b' + re.escape(t) + r'\b', g) for t in terms for g in genres):
+                return False
+
+        exclude = {e.lower().strip() for e in (filters.get('exclude') or []) if e and e.strip()}
+        if exclude and len(exclude & set(genres)) / len(exclude) >= self.config.MIN_EXCLUSION_MATCH:
+            return False
+
+        try:
+            year = str(row['release_date'] or '')[:4]
+            if year.isdigit():
+                if filters.get('year_min') and int(year) < int(filters['year_min']): return False
+                if filters.get('year_max') and int(year) > int(filters['year_max']): return False
+            hours = int(row['average_playtime_forever'] or 0) / 60
+            if filters.get('playtime_min') and hours < int(filters['playtime_min']): return False
+            if filters.get('playtime_max') and hours > int(filters['playtime_max']): return False
+        except (TypeError, ValueError):
+            pass
+        return True
+
+    def _format_result(self, row: sqlite3.Row, score: float, genre_sim: float, tag_sim: float,
+                       include_breakdown: bool = False) -> Dict[str, Any]:
+        app_id = int(row['AppID'])
+        image = row['header_image'] or ''
+        if not image.startswith('http'):
+            image = f"https://cdn.cloudflare.steamstatic.com/steam/apps/{app_id}/header.jpg"
+        reasons = [(1, "Benzer tür")] if genre_sim > 0.3 else []
+        if tag_sim > 0.2: reasons.append((8, "Benzer etiket"))
+        if not reasons: reasons.append((7, "Popüler oyun"))
+        price = float(row['price'] or 0)
+        result = {
+            "AppID": app_id,
+            "Name": row['Name'],
+            "ImageURL": image,
+            "genres": _split_genres(row['genres']),
+            "price": price,
+            "SteamURL": row['SteamURL'] or f"https://store.steampowered.com/app/{app_id}",
+            "similarity": round(score, 4),
+            "match_reasons": [{"code": code, "description": desc} for code, desc in reasons],
+            "primary_match": reasons[0][0],
+            "explanation": "Genre/Tag Match",
+            "year": str(row['release_date'] or '')[:4],
+            "playtime": int(row['average_playtime_forever'] or 0),
+            "popularity_score": float(row['popularity_score'] or 0)
+        }
+        if include_breakdown:
+            result["breakdown"] = {
+                "genre": int(genre_sim * 100),
+                "gameplay": 0,
+                "theme": 0,
+                "tag": int(tag_sim * 100),
+                "price": 0,
+                "visual": 0,
+                "popularity": int(row['popularity_score'] or 0)
+            }
+        return result
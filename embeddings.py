@@ -0,0 +1,176 @@
+# Metin gömmelerinin (embedding) diskte, içerik adresli ve bellek eşlemeli olarak saklandığı embeddings.py dosyası.
+import os
+import sys
+import json
+import hashlib
+import logging
+import sqlite3
+import threading
+import numpy as np
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config import Config
+except ImportError:
+    class Config:
+        DB_PATH = "games.db"
+        MIN_POPULARITY = 10
+        ENCODER_MODEL = "all-MiniLM-L6-v2"
+        EMBEDDING_CACHE_PATH = "embedding_cache"
+
+KEY_BYTES = 16
+
+
+class EmbeddingCache:
+    """
+    (model adı + metin) özetiyle adreslenen kalıcı gömme önbelleği. Vektörler float16 olarak
+    yalnızca sona eklenen bir dosyada tutulur ve bellek eşlemeli okunur; keys.u8 aynı şekilde sona
+    eklenen satırlarla anahtarları (ofset dizini), meta.json boyut ve geçerli satır sayısını saklar.
+    """
+
+    def __init__(self, directory: str, model_name: str):
+        self.directory = directory
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._vectors_path = os.path.join(directory, "vectors.f16")
+        self._keys_path = os.path.join(directory, "keys.u8")
+        self._legacy_keys_path = os.path.join(directory, "keys.npy")
+        self._meta_path = os.path.join(directory, "meta.json")
+
+        self.dim: Optional[int] = None
+        self._count = 0
+        self._offsets: Dict[bytes, int] = {}
+        self._matrix: Optional[np.memmap] = None
+        self._load()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def key(self, text: str) -> bytes:
+        return hashlib.sha1(f"{self.model_name}\0{text}".encode("utf-8")).digest()[:KEY_BYTES]
+
+    def _load(self):
+        try:
+            with open(self._meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        if meta.get("model") != self.model_name:
+            logger.info(f"Gömme önbelleği farklı bir model için ({meta.get('model')}), yok sayılıyor.")
+            return
+        keys = self._read_keys(int(meta["count"]))
+        if keys is None:
+            return
+        self.dim = int(meta["dim"])
+        self._count = len(keys)
+        self._offsets = {k.tobytes(): i for i, k in enumerate(keys)}
+        self._map()
+
+    def _read_keys(self, count: int) -> Optional[np.ndarray]:
+        """Meta'daki satır sayısına kadar anahtarlar; yarıda kalmış son ekleme yok sayılır"""
+        if not os.path.exists(self._keys_path):
+            # Eski biçim (her eklemede baştan yazılan keys.npy) bir kez sona eklenen dosyaya taşınır
+            try:
+                legacy = np.load(self._legacy_keys_path)[:count]
+            except (OSError, ValueError):
+                return None
+            np.ascontiguousarray(legacy, dtype=np.uint8).tofile(self._keys_path)
+            os.remove(self._legacy_keys_path)
+        raw = np.fromfile(self._keys_path, dtype=np.uint8, count=count * KEY_BYTES)
+        return raw[:len(raw) // KEY_BYTES * KEY_BYTES].reshape(-1, KEY_BYTES)
+
+    def _map(self):
+        self._matrix = None
+        if self._count:
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float16, mode="r", shape=(self._count, self.dim))
+
+    def lookup(self, texts: Sequence[str]) -> List[Optional[int]]:
+        return [self._offsets.get(self.key(t)) for t in texts]
+
+    def get_or_encode(self, texts: Sequence[str], encode: Callable[[List[str]], np.ndarray],
+                      batch_size: int = 512, progress: Callable[[float], None] = None) -> np.ndarray:
+        """Önbellekte olmayan metinleri kodlayıp ekler; tüm metinlerin vektörlerini float32 döndürür"""
+        keys = [self.key(t) for t in texts]
+        missing: Dict[bytes, str] = {}
+        for k, t in zip(keys, texts):
+            if k not in self._offsets:
+                missing.setdefault(k, t)
+
+        if missing:
+            logger.info(f"Gömme önbelleği: {len(texts) - len(missing)} isabet, {len(missing)} yeni metin kodlanacak.")
+            pending = list(missing.items())
+            for i in range(0, len(pending), batch_size):
+                batch = pending[i:i + batch_size]
+                vectors = np.asarray(encode([t for _, t in batch]), dtype=np.float32)
+                self._append([k for k, _ in batch], vectors)
+                if progress:
+                    progress(min(1.0, (i + batch_size) / len(pending)))
+        elif progress:
+            progress(1.0)
+
+        rows = np.fromiter((self._offsets[k] for k in keys), dtype=np.int64, count=len(keys))
+        if not len(rows):
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return np.asarray(self._matrix[rows], dtype=np.float32)
+
+    def _append(self, keys: List[bytes], vectors: np.ndarray):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            row_bytes = self.dim * np.dtype(np.float16).itemsize
+
+            # Önce vektörler ve anahtarlar sona eklenir, sonra meta (atomik rename) yazılır; yarıda
+            # kalan bir ekleme meta'daki satır sayısının ötesinde kalır ve bir sonraki eklemede kesilir.
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(self._count * row_bytes)
+                f.write(np.ascontiguousarray(vectors, dtype=np.float16).tobytes())
+            with open(self._keys_path, "ab") as f:
+                f.truncate(self._count * KEY_BYTES)
+                f.write(b"".join(keys))
+
+            count = self._count + len(keys)
+            tmp_meta = self._meta_path + ".tmp"
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump({"model": self.model_name, "dim": self.dim, "count": count}, f)
+            os.replace(tmp_meta, self._meta_path)
+
+            # Okuyucular bir ofseti ancak eşlenmiş matris o satırı kapsadıktan sonra görür
+            start, self._count = self._count, count
+            self._map()
+            self._offsets.update((k, start + i) for i, k in enumerate(keys))
+
+
+def backfill(db_path: str = None, cache_dir: str = None, model_name: str = None) -> int:
+    """Mevcut katalogdaki tüm oyun isimlerini önbelleğe kodlar (tek seferlik doldurma)"""
+    from sentence_transformers import SentenceTransformer
+    from store import CATALOG_QUERY
+
+    db_path = db_path or Config.DB_PATH
+    model_name = model_name or Config.ENCODER_MODEL
+    cache = EmbeddingCache(cache_dir or Config.EMBEDDING_CACHE_PATH, model_name)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        names = [row[1] for row in conn.execute(CATALOG_QUERY, (Config.MIN_POPULARITY,))]
+    finally:
+        conn.close()
+
+    before = len(cache)
+    encoder = SentenceTransformer(model_name, device='cpu')
+    cache.get_or_encode(
+        names,
+        lambda batch: encoder.encode(batch, show_progress_bar=False, device='cpu'),
+        progress=lambda p: print(f"\r>>> [EMBED] %{p * 100:.0f}", end="", flush=True),
+    )
+    print(f"\n>>> [EMBED] {len(cache) - before} yeni isim eklendi, önbellekte toplam {len(cache)} vektör var.")
+    return len(cache) - before
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    if '--backfill' not in sys.argv:
+        sys.exit("Kullanım: python embeddings.py --backfill")
+    backfill()
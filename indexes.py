@@ -0,0 +1,98 @@
+# FAISS indekslerinin sıkıştırılmış (fp16/SQ8/PQ) varyantlarının ve tam hassasiyetli yeniden sıralamanın bulunduğu indexes.py dosyası.
+import faiss
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+INDEX_TYPES = ('flat', 'fp16', 'sq8', 'pq')
+
+_SCALAR_TYPES = {
+    'fp16': faiss.ScalarQuantizer.QT_fp16,
+    'sq8': faiss.ScalarQuantizer.QT_8bit,
+}
+
+
+def check_index_type(kind: str) -> str:
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Geçersiz indeks tipi: {kind} (seçenekler: {', '.join(INDEX_TYPES)})")
+    return kind
+
+
+def pq_subquantizers(d: int) -> int:
+    """Alt vektör başına en az 4 boyut kalacak şekilde d'yi bölen en büyük alt nicemleyici sayısı"""
+    return next(m for m in range(max(1, d // 4), 0, -1) if d % m == 0)
+
+
+def new_content_index(kind: str, d: int, nlist: int) -> faiss.Index:
+    quantizer = faiss.IndexFlatL2(d)
+    if check_index_type(kind) == 'flat':
+        return faiss.IndexIVFFlat(quantizer, d, nlist)
+    if kind == 'pq':
+        return faiss.IndexIVFPQ(quantizer, d, nlist, pq_subquantizers(d), 8)
+    return faiss.IndexIVFScalarQuantizer(quantizer, d, nlist, _SCALAR_TYPES[kind], faiss.METRIC_L2)
+
+
+def new_name_index(kind: str, d: int) -> faiss.Index:
+    if check_index_type(kind) == 'flat':
+        return faiss.IndexFlatIP(d)
+    if kind == 'pq':
+        return faiss.IndexPQ(d, pq_subquantizers(d), 8, faiss.METRIC_INNER_PRODUCT)
+    return faiss.IndexScalarQuantizer(d, _SCALAR_TYPES[kind], faiss.METRIC_INNER_PRODUCT)
+
+
+def index_bytes(index: faiss.Index) -> int:
+    return int(faiss.serialize_index(index).nbytes)
+
+
+class RerankedIndex:
+    """
+    FAISS indeksini sarar. Sıkıştırılmış indekste kısa liste rerank_factor kat geniş alınır ve
+    tam hassasiyetli vektörlerle (genellikle diskten bellek eşlemeli) yeniden sıralanır. Tam
+    hassasiyetli vektör verilmezse vektörler indeksin kendi deposundan geri oluşturulur.
+    """
+
+    def __init__(self, index: faiss.Index, vectors: Optional[np.ndarray] = None, rerank_factor: int = 3):
+        self.index = index
+        self.vectors = vectors
+        self.rerank_factor = max(1, rerank_factor)
+        self.inner_product = index.metric_type == faiss.METRIC_INNER_PRODUCT
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            # Satır numarasıyla geri oluşturma için (oyun başına 8 bayt)
+            ivf.make_direct_map()
+
+    @property
+    def ntotal(self) -> int:
+        return self.index.ntotal
+
+    @property
+    def reranks(self) -> bool:
+        return self.vectors is not None and self.rerank_factor > 1
+
+    def vectors_for(self, rows: Sequence[int]) -> np.ndarray:
+        rows = np.asarray(rows, dtype=np.int64)
+        if self.vectors is not None:
+            return np.asarray(self.vectors[rows], dtype=np.float32)
+        return self.index.reconstruct_batch(rows)
+
+    def search(self, queries: np.ndarray, k: int, params=None) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.reranks:
+            return self.index.search(queries, k, params=params)
+
+        k_wide = min(self.ntotal, k * self.rerank_factor)
+        _, wide = self.index.search(queries, k_wide, params=params)
+        distances = np.full((len(queries), k), -np.inf if self.inner_product else np.inf, dtype=np.float32)
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        for q, (query, row) in enumerate(zip(queries, wide)):
+            row = row[row >= 0]
+            if not len(row):
+                continue
+            exact = self.vectors_for(row)
+            if self.inner_product:
+                scores = exact @ query
+                order = np.argsort(-scores, kind='stable')[:k]
+            else:
+                scores = ((exact - query) ** 2).sum(axis=1)
+                order = np.argsort(scores, kind='stable')[:k]
+            distances[q, :len(order)] = scores[order]
+            indices[q, :len(order)] = row[order]
+        return distances, indices
@@ -0,0 +1,131 @@
+# ETL girdisinin (gzip/zstd/xz sıkıştırılmış veya bellek eşlemeli ham JSON satır akışı) parça parça okunduğu ingest.py dosyası.
+import os
+import gzip
+import lzma
+import mmap
+import time
+import threading
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Dosya başındaki sihirli baytlar; uzantıya güvenilmez (ör. .stream adıyla sıkıştırılmış dökümler)
+MAGIC = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'(\xb5/\xfd', 'zstd'),
+)
+
+
+def detect_compression(path: str) -> Optional[str]:
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    for magic, kind in MAGIC:
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def open_decompressed(raw: BinaryIO, kind: str) -> BinaryIO:
+    """Ham dosyayı akış halinde açan okuyucu; tüm döküm belleğe veya diske açılmaz"""
+    if kind == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='rb')
+    if kind == 'xz':
+        return lzma.LZMAFile(raw, mode='rb')
+    if zstandard is None:
+        raise RuntimeError("zstd sıkıştırılmış girdi için 'zstandard' paketi kurulmalı")
+    # zstd -T / pzstd çıktıları birden fazla çerçeve içerir
+    return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+
+
+class InputReader:
+    """
+    Girdiyi satır sonlarına hizalı parçalar halinde verir. Sıkıştırılmamış dosya bellek eşlenir
+    ve yalnızca (başlangıç, bitiş) ofsetleri üretilir; ayrıştırıcılar aynı dosyayı kendileri
+    eşleyip sayfa önbelleğinden kopyasız okur. Sıkıştırılmış dosyalar akış halinde açılır,
+    parça son tam satırda kesilir ve kalan kısım bir sonraki parçaya taşınır.
+    """
+
+    def __init__(self, path: str, chunk_bytes: int):
+        self.path = str(path)
+        self.chunk_bytes = chunk_bytes
+        self.compression = detect_compression(self.path)
+        self.size = os.path.getsize(self.path)
+        # Diskte okunan bayt (sıkıştırılmış dosyada sıkıştırılmış konum); ilerleme için
+        self.position = 0
+
+    @property
+    def mapped(self) -> bool:
+        return self.compression is None
+
+    def ranges(self) -> Iterator[Tuple[int, int]]:
+        if self.size == 0:
+            return
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            start = 0
+            while start < self.size:
+                end = min(start + self.chunk_bytes, self.size)
+                if end < self.size:
+                    newline = mm.find(b'\n', end - 1)
+                    end = self.size if newline == -1 else newline + 1
+                self.position = end
+                yield start, end
+                start = end
+
+    def blocks(self) -> Iterator[bytes]:
+        with open(self.path, 'rb') as raw, open_decompressed(raw, self.compression) as stream:
+            tail = b''
+            while True:
+                data = stream.read(self.chunk_bytes)
+                if not data:
+                    break
+                cut = data.rfind(b'\n') + 1
+                if not cut:
+                    tail += data
+                    continue
+                view = memoryview(data)
+                block = tail + view[:cut] if tail else (data if cut == len(data) else bytes(view[:cut]))
+                tail = bytes(view[cut:])
+                self.position = raw.tell()
+                yield block
+            self.position = self.size
+            if tail:
+                yield tail
+
+
+class Throughput:
+    """Okunan bayt ve yazılan kayıt sayaçları; son aralık ve ortalama için MB/s ve kayıt/s"""
+
+    def __init__(self, total_bytes: Optional[int] = None):
+        self.total_bytes = total_bytes
+        self.started = time.monotonic()
+        self.bytes = 0
+        self.records = 0
+        self._last = (self.started, 0, 0)
+        self._lock = threading.Lock()
+
+    def set_position(self, position: int):
+        with self._lock:
+            self.bytes = position
+
+    def add_records(self, count: int):
+        with self._lock:
+            self.records += count
+
+    def summary(self) -> str:
+        now = time.monotonic()
+        with self._lock:
+            last_time, last_bytes, last_records = self._last
+            self._last = (now, self.bytes, self.records)
+            read, written = self.bytes, self.records
+        interval = max(now - last_time, 1e-9)
+        elapsed = max(now - self.started, 1e-9)
+        percent = f" (%{100 * read / self.total_bytes:.1f})" if self.total_bytes else ""
+        return (f"İşlenen: {written} kayıt, {read / 1e6:.1f} MB{percent} | "
+                f"{(read - last_bytes) / 1e6 / interval:.1f} MB/s, {(written - last_records) / interval:.0f} kayıt/s "
+                f"(ortalama {read / 1e6 / elapsed:.1f} MB/s, {written / elapsed:.0f} kayıt/s)")
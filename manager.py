@@ -0,0 +1,258 @@
+# Aktif öneri modelinin yaşam döngüsünü (yükleme, arka planda yeniden kurma, sıcak değişim) yöneten manager.py dosyası.
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import secrets
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from store import catalog_fingerprint
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config import Config
+except ImportError:
+    class Config:
+        DB_PATH = "games.db"
+        MODEL_PATH = "models"
+        MIN_POPULARITY = 10
+        SVD_COMPONENTS = 200
+        MODEL_WATCH_INTERVAL = 30
+        MODEL_KEEP_VERSIONS = 2
+        CONTENT_INDEX_TYPE = "flat"
+        NAME_INDEX_TYPE = "flat"
+
+VERSION_PATTERN = re.compile(r'^[\w.-]+$')
+
+
+class ModelManager:
+    """
+    Aktif öneri modelini tek bir referansta tutar. Yeni model arka planda kurulur veya
+    hazır bir sürümden yüklenir, ısıtılır ve referans atomik olarak değiştirilir; süren
+    istekler ellerindeki eski modelle tamamlanır.
+    """
+
+    def __init__(self, factory: Callable[..., Any], db_path: str = None, model_path: str = None,
+                 on_swap: Optional[Callable[[Any], None]] = None, config=None):
+        self.config = config or Config
+        self.factory = factory
+        self.db_path = db_path or self.config.DB_PATH
+        self.model_path = Path(model_path or self.config.MODEL_PATH)
+        self.on_swap = on_swap
+        # Parçalı modda (ShardCoordinator) model sürümü parça süreçlerinden gelir; yerelde kurulmaz/yayınlanmaz
+        self.local_artifacts = getattr(factory, 'LOCAL_ARTIFACTS', True)
+
+        self.recommender = None
+        self.pending = None
+        self.error: Optional[str] = None
+        self._build_lock = threading.Lock()
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
+        self._failed_version: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.recommender is not None
+
+    @property
+    def version(self) -> Optional[str]:
+        rec = self.recommender
+        return rec.version if rec is not None else None
+
+    @property
+    def busy(self) -> bool:
+        return self._build_lock.locked()
+
+    def progress(self) -> Dict[str, Any]:
+        rec = self.pending or self.recommender
+        if rec is None:
+            return {"progress": 0, "eta_seconds": None, "stages": []}
+        return rec.build_progress.snapshot()
+
+    def reload(self, rebuild: bool = False, version: str = None) -> bool:
+        """
+        Yeni bir model hazırlayıp aktif modelle değiştirir. rebuild=False ise güncel (veya
+        istenen) sürüm dizininden yüklemeyi dener, olmazsa veritabanından yeniden kurar.
+        """
+        if not self._build_lock.acquire(blocking=False):
+            logger.warning("Model kurulumu zaten sürüyor, istek yok sayıldı.")
+            return False
+        try:
+            candidate = self.factory(db_path=self.db_path, model_path=str(self.model_path))
+            self.pending = candidate
+
+            loaded = False
+            if not self.local_artifacts:
+                if not candidate.initialize():
+                    self.error = "Parçalara bağlanılamadı"
+                    return False
+                if version and candidate.version != version:
+                    self.error = f"Parçalar istenen sürümde değil: {candidate.version}"
+                    return False
+                loaded = True
+            elif not rebuild:
+                directory = self._version_dir(version or self._read_current())
+                if directory and (version or self._artifacts_current(directory)):
+                    loaded = candidate.initialize_from_artifacts(directory)
+                if version and not loaded:
+                    self.error = f"Model sürümü yüklenemedi: {version}"
+                    return False
+
+            if not loaded:
+                if not candidate.initialize():
+                    self.error = "Model initialization returned False"
+                    return False
+                self._publish(candidate)
+
+            self._warm(candidate)
+            self.recommender = candidate
+            self.error = None
+            logger.info(f"Aktif model değiştirildi: {candidate.version}")
+            if self.on_swap:
+                self.on_swap(candidate)
+            return True
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Model yeniden yükleme hatası: {e}", exc_info=True)
+            return False
+        finally:
+            self.pending = None
+            self._build_lock.release()
+
+    def reload_async(self, rebuild: bool = False, version: str = None) -> bool:
+        if self.busy:
+            return False
+        if version is not None and not VERSION_PATTERN.match(version):
+            raise ValueError(f"Geçersiz model sürümü: {version}")
+        threading.Thread(target=self.reload, kwargs={"rebuild": rebuild, "version": version},
+                         name="model-reload", daemon=True).start()
+        return True
+
+    def start_watching(self, interval: int = None):
+        """
+        games.db ve MODEL_PATH/CURRENT dosyalarını (parçalı modda parçaların ortak sürümünü) izleyip
+        değişiklikte arka planda yeniden yükler
+        """
+        interval = self.config.MODEL_WATCH_INTERVAL if interval is None else interval
+        if interval <= 0 or self._watch_thread is not None:
+            return
+        self._watch_thread = threading.Thread(target=self._watch, args=(interval,), name="model-watch", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        self._watch_stop.set()
+
+    def _watch(self, interval: int):
+        last_db_mtime = self._db_mtime()
+        while not self._watch_stop.wait(interval):
+            if not self.ready or self.busy:
+                continue
+            try:
+                current = self._read_current() if self.local_artifacts else self.recommender.current_version()
+                if current and current != self.version and current != self._failed_version:
+                    logger.info(f"Yeni model sürümü algılandı: {current}")
+                    if not self.reload(version=current):
+                        self._failed_version = current
+                    continue
+                if not self.local_artifacts:
+                    continue
+
+                db_mtime = self._db_mtime()
+                if db_mtime != last_db_mtime:
+                    last_db_mtime = db_mtime
+                    if self._fingerprint() != self.recommender.catalog_fingerprint:
+                        logger.info("Katalog değişti, model arka planda yeniden kuruluyor...")
+                        self.reload(rebuild=True)
+            except Exception as e:
+                logger.error(f"Model izleme hatası: {e}")
+
+    def _publish(self, candidate):
+        # Aynı saniyede iki yayın (CLI + izleyici) birbirinin dizinini ezmesin
+        version = f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+        candidate.version = version
+        directory = self.model_path / version
+        candidate.save_artifacts(directory)
+
+        tmp = self.model_path / 'CURRENT.tmp'
+        tmp.write_text(version)
+        os.replace(tmp, self.model_path / 'CURRENT')
+        self._prune(keep={version})
+
+    def _prune(self, keep: set):
+        versions = sorted(p for p in self.model_path.iterdir() if (p / 'manifest.json').exists())
+        keep = keep | {p.name for p in versions[-self.config.MODEL_KEEP_VERSIONS:]} | {self.version}
+        for path in versions:
+            if path.name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _warm(self, candidate):
+        # İlk gerçek isteklerin indeks sayfalarını ve encoder'ı soğuk bulmaması için
+        try:
+            source = candidate.get_random_high_rated_game()
+            if source:
+                candidate.recommend_games(source['Name'], n=5)
+            candidate.autocomplete("the")
+            candidate.surprise()
+        except Exception as e:
+            logger.warning(f"Model ısıtma hatası: {e}")
+
+    def _read_current(self) -> Optional[str]:
+        try:
+            version = (self.model_path / 'CURRENT').read_text().strip()
+        except OSError:
+            return None
+        return version if VERSION_PATTERN.match(version) else None
+
+    def _version_dir(self, version: Optional[str]) -> Optional[Path]:
+        if not version:
+            return None
+        directory = self.model_path / version
+        return directory if (directory / 'manifest.json').exists() else None
+
+    def _artifacts_current(self, directory: Path) -> bool:
+        try:
+            manifest = json.loads((directory / 'manifest.json').read_text())
+        except (OSError, ValueError):
+            return False
+        return (manifest.get('format', 1) == getattr(self.factory, 'ARTIFACT_FORMAT', 1)
+                and manifest.get('catalog_fingerprint') == self._fingerprint()
+                and manifest.get('min_popularity') == self.config.MIN_POPULARITY
+                and manifest.get('svd_components') == self.config.SVD_COMPONENTS
+                and manifest.get('content_index') == self.config.CONTENT_INDEX_TYPE
+                and manifest.get('name_index') == self.config.NAME_INDEX_TYPE)
+
+    def _fingerprint(self) -> Optional[str]:
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                return catalog_fingerprint(conn)
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return None
+
+    def _db_mtime(self):
+        # Yalnızca ana dosya: -wal her yorum yazımında değişir ve her turda tam parmak izi taramasına
+        # yol açardı. WAL kipinde ana dosya checkpoint'te değişir; ETL sonunda checkpoint yapılır.
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+
+if __name__ == '__main__':
+    # Sunucudan bağımsız olarak yeni bir model sürümü kurup yayınlar; çalışan sunucular
+    # MODEL_PATH/CURRENT değişikliğini izleyerek yeni sürüme kendiliğinden geçer.
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    if hasattr(Config, 'initialize'):
+        Config.initialize()
+    from model import GameRecommender
+    sys.exit(0 if ModelManager(GameRecommender).reload(rebuild='--rebuild' in sys.argv) else 1)
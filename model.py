@@ -1,29 +1,31 @@
 # Modelin eğitildiği, özelliklerinin ve parametrelerinin kullanıldığı, config dosyasının bağlandığı model.py dosyası.
-import pandas as pd
 import numpy as np
 import sqlite3
 import re
 import json
 import os
-import joblib
+import sys
 import logging
 import hashlib
 import time
 import math
-from typing import List, Dict, Any, Optional, Set, Tuple, Union
+import random
+import threading
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Set, Tuple, Union, Callable
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from enum import Enum
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import TruncatedSVD
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
-from collections import defaultdict
+from collections import defaultdict, OrderedDict, deque
 import faiss
 from pathlib import Path
 import gc
 from dataclasses import dataclass
-from difflib import SequenceMatcher
-import shutil
-from tqdm import tqdm
+from concurrency import SingleFlight, Recommendations, expired
+from embeddings import EmbeddingCache
+from indexes import RerankedIndex, new_content_index, new_name_index
+from store import GameStore, GameRow, TagMatrixBuilder, CATALOG_QUERY, read_catalog_snapshot, catalog_fingerprint
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +35,21 @@ except ImportError:
     class Config:
         DB_PATH = "games.db"
         MODEL_PATH = "models"
+        CATALOG_SNAPSHOT_PATH = "games.arrow"
+        STREAM_BUILD = False
+        STREAM_CHUNK_SIZE = 20000
+        STREAM_SAMPLE_SIZE = 100000
+        INIT_WORKERS = 3
+        API_THREADS = 8
+        SEARCH_NPROBE = 40
+        RECOMMENDATION_CACHE_SIZE = 2048
+        SINGLE_FLIGHT_TIMEOUT = 10
+        SURPRISE_POOL_SIZE = 8
+        ENCODER_MODEL = "all-MiniLM-L6-v2"
+        EMBEDDING_CACHE_PATH = "embedding_cache"
+        CONTENT_INDEX_TYPE = "flat"
+        NAME_INDEX_TYPE = "flat"
+        INDEX_RERANK_FACTOR = 3
         MIN_SIMILARITY = 0.20
         MIN_POPULARITY = 10
         RECOMMENDATION_COUNT = 15
@@ -55,11 +72,41 @@ except ImportError:
         MIN_EXCLUSION_MATCH = 0.20
         PRICE_QUOTA = {'low': 6, 'mid': 5, 'high': 4}
         MAX_DEVELOPER_RECOMMENDATIONS = 2
-<<<<<<< HEAD
         RARE_GENRES = {"Visual Novel", "Psychological Horror", "Walking Simulator", "Metroidvania", "Roguelike", "Soulslike", "Immersive Sim", "Grand Strategy", "4X", "Life Sim", "Farming Sim" , "Rich Story"}
-=======
-        RARE_GENRES = {"Visual Novel", "Psychological Horror", "Walking Simulator", "Metroidvania", "Roguelike", "Soulslike", "Immersive Sim", "Grand Strategy", "4X", "Life Sim", "Farming Sim"}
->>>>>>> cdbd22f7fbdc20f081bee3139c5a9d5fa1f59fee
+
+_thread_budget: Optional[int] = None
+_encoders: Dict[str, Any] = {}
+_encoder_lock = threading.Lock()
+
+def configure_thread_budget(api_threads: int) -> int:
+    """
+    FAISS (OpenMP) ve PyTorch iş parçacığı havuzlarını istek iş parçacığı sayısına göre sınırlar.
+    Her istek kendi havuzunu açtığında çekirdekler aşırı abone olur ve verim düşer.
+    """
+    global _thread_budget
+    per_request = max(1, (os.cpu_count() or 1) // max(1, api_threads))
+    faiss.omp_set_num_threads(per_request)
+    _thread_budget = per_request
+    # PyTorch yalnızca kodlayıcı yüklendiyse ayarlanır; yüklenmediyse load_encoder bütçeyi uygular
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        torch.set_num_threads(per_request)
+    return per_request
+
+def load_encoder(name: str):
+    """
+    Cümle kodlayıcısını (sentence_transformers + PyTorch) ilk ihtiyaçta yükler ve süreç boyunca
+    paylaşır; model sürümü değiştiğinde aynı kodlayıcı yeniden yüklenmez.
+    """
+    with _encoder_lock:
+        encoder = _encoders.get(name)
+        if encoder is None:
+            from sentence_transformers import SentenceTransformer
+            encoder = _encoders[name] = SentenceTransformer(name, device='cpu')
+            torch = sys.modules.get('torch')
+            if _thread_budget and torch is not None:
+                torch.set_num_threads(_thread_budget)
+        return encoder
 
 @dataclass
 class ModelStats:
@@ -68,6 +115,119 @@ class ModelStats:
     cache_hits: int = 0
     total_recommendations: int = 0
 
+@dataclass
+class StageProgress:
+    name: str
+    status: str = "pending"
+    fraction: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expected: Optional[float] = None
+    error: Optional[str] = None
+
+    def elapsed(self, now: float) -> float:
+        if self.started_at is None: return 0.0
+        return (self.finished_at or now) - self.started_at
+
+    def eta(self, now: float) -> Optional[float]:
+        if self.status == "done": return 0.0
+        elapsed = self.elapsed(now)
+        if self.status == "running" and self.fraction > 0:
+            return elapsed / self.fraction * (1 - self.fraction)
+        if self.expected is not None:
+            return max(0.0, self.expected - elapsed)
+        return None
+
+class BuildProgress:
+    """
+    Model kurulum aşamalarının gerçek ilerlemesini izler. Aşama süreleri bir sonraki
+    kurulumda tahmini süre (ETA) ve ağırlık olarak kullanılmak üzere diske yazılır.
+    """
+    DEFAULT_DURATIONS = {'artifacts': 5.0, 'data': 10.0, 'encoder': 5.0, 'tfidf': 20.0, 'svd': 25.0, 'content_index': 10.0, 'name_index': 30.0, 'stream': 90.0}
+
+    def __init__(self, timings_path: Optional[Path] = None):
+        self.timings_path = timings_path
+        self._lock = threading.Lock()
+        self._stages: Dict[str, StageProgress] = {}
+        self._started_at: Optional[float] = None
+
+    def reset(self, names: List[str]):
+        expected = self._load_timings()
+        with self._lock:
+            self._started_at = time.time()
+            self._stages = {n: StageProgress(n, expected=expected.get(n)) for n in names}
+
+    def start(self, name: str):
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage:
+                stage.status, stage.started_at = "running", time.time()
+
+    def update(self, name: str, fraction: float):
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage: stage.fraction = min(1.0, max(0.0, fraction))
+
+    def finish(self, name: str):
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage:
+                stage.status, stage.fraction, stage.finished_at = "done", 1.0, time.time()
+
+    def fail(self, name: str, error: Exception):
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage:
+                stage.status, stage.error, stage.finished_at = "failed", str(error), time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            stages = list(self._stages.values())
+            started_at = self._started_at
+        if not stages:
+            return {"progress": 0, "eta_seconds": None, "stages": []}
+        
+        weights = {s.name: s.expected or self.DEFAULT_DURATIONS.get(s.name, 10.0) for s in stages}
+        total = sum(weights.values())
+        progress = sum(weights[s.name] * s.fraction for s in stages) / total
+        elapsed = now - started_at if started_at else 0.0
+        eta = None
+        if progress >= 1.0:
+            eta = 0.0
+        elif progress > 0.02:
+            eta = elapsed / progress * (1 - progress)
+        
+        return {
+            "progress": int(progress * 100),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "stages": [{
+                "name": s.name,
+                "status": s.status,
+                "progress": int(s.fraction * 100),
+                "elapsed_seconds": round(s.elapsed(now), 1),
+                "eta_seconds": round(s.eta(now), 1) if s.eta(now) is not None else None,
+                **({"error": s.error} if s.error else {})
+            } for s in stages]
+        }
+
+    def save_timings(self):
+        if not self.timings_path: return
+        with self._lock:
+            timings = {s.name: round(s.elapsed(time.time()), 2) for s in self._stages.values() if s.status == "done"}
+        try:
+            merged = {**self._load_timings(), **timings}
+            self.timings_path.write_text(json.dumps(merged, indent=2))
+        except OSError as e:
+            logger.warning(f"Aşama süreleri kaydedilemedi: {e}")
+
+    def _load_timings(self) -> Dict[str, float]:
+        if not self.timings_path or not self.timings_path.exists(): return {}
+        try:
+            return json.loads(self.timings_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
 class MatchReason(Enum):
     GENRE = (1, "Benzer tür")
     GAMEPLAY = (2, "Benzer oynanış")
@@ -89,7 +249,32 @@ class MatchReason(Enum):
         self.code = code
         self.description = description
 
+class CandidateSelector:
+    """Mesafe sırasıyla gezilen adaylara uygulanan tekrar (AppID/isim) ve geliştirici sınırları"""
+
+    def __init__(self, seeds: List[GameRow], max_per_developer: int):
+        self.seen_ids = {s["AppID"] for s in seeds}
+        self.seen_names = {s["CleanName"] for s in seeds}
+        self.max_per_developer = max_per_developer
+        self.developer_counts = defaultdict(int)
+
+    def seen(self, app_id: int, clean_name: str) -> bool:
+        return app_id in self.seen_ids or clean_name in self.seen_names
+
+    def accept(self, app_id: int, clean_name: str, dev: str) -> bool:
+        if dev and self.developer_counts.get(dev, 0) >= self.max_per_developer:
+            return False
+        if dev: self.developer_counts[dev] += 1
+        self.seen_ids.add(app_id)
+        self.seen_names.add(clean_name)
+        return True
+
+
 class OptimizedGameRecommender:
+    mode = "full"
+    RRF_K = 60
+    ARTIFACT_FORMAT = 4
+
     def __init__(self, db_path: str = None, model_path: str = None, config=None):
         self.config = config or Config
         self.db_path = db_path or self.config.DB_PATH
@@ -103,10 +288,13 @@ class OptimizedGameRecommender:
         self.MAX_RECOMMENDATIONS = self.config.MAX_RECOMMENDATIONS
         
         self._models_loaded = False
+        self.version: Optional[str] = None
+        self.catalog_fingerprint: Optional[str] = None
         self._data_loaded = False
         self.stats = ModelStats()
         
-        self.df: Optional[pd.DataFrame] = None
+        self.store: Optional[GameStore] = None
+        self._corpus: Optional['pd.Series'] = None
         self.models: dict = {}
         self.dynamic_weights = {
             MatchReason.GENRE: self.config.GENRE_WEIGHT,
@@ -124,7 +312,15 @@ class OptimizedGameRecommender:
         self.name_index = None
         self.content_index = None
         self.genre_weights = self._initialize_genre_weights()
-        self.recommendation_cache = {}
+        self.recommendation_cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._inflight = SingleFlight(timeout=self.config.SINGLE_FLIGHT_TIMEOUT)
+        self._surprise_candidates: Optional[np.ndarray] = None
+        self._surprise_pool: deque = deque()
+        self._surprise_lock = threading.Lock()
+        self._surprise_refilling = False
+        self.search_params = faiss.SearchParametersIVF(nprobe=self.config.SEARCH_NPROBE)
+        self.build_progress = BuildProgress(self.model_path / 'build_timings.json')
         
         self._init_developer_map()
         self._init_series_patterns()
@@ -135,15 +331,12 @@ class OptimizedGameRecommender:
         try:
             print(">>> [MODEL] Başlatılıyor...")
             
-            if not self._load_data():
-                logger.error("Veri yüklenemedi!")
-                return False
-            
-            print(f">>> [MODEL] {len(self.df)} oyun yüklendi. Vektörleştirme başlıyor...")
-
-            self.text_model = SentenceTransformer('all-MiniLM-L6-v2', device='cpu')
-            self._build_models()
+            if self.config.STREAM_BUILD:
+                self._build_models_streaming()
+            else:
+                self._build_models()
             
+            self.build_progress.save_timings()
             self._models_loaded = True
             print(">>> [MODEL] Tüm modeller başarıyla hazırlandı.")
             return True
@@ -158,93 +351,474 @@ class OptimizedGameRecommender:
                 logger.error(f"Veritabanı bulunamadı: {self.db_path}")
                 return False
 
-            conn = sqlite3.connect(self.db_path)
-            query = """
-                SELECT AppID, Name, CleanName, genres, developer, publisher, price, 
-                       header_image, SteamURL, popularity_score, tags, short_description, 
-                       detailed_description, release_date, average_playtime_forever, 
-                       windows, mac, linux, categories 
-                FROM games 
-                WHERE popularity_score > ?
-                GROUP BY CleanName
-                ORDER BY popularity_score DESC
-            """
-            self.df = pd.read_sql_query(query, conn, params=(self.MIN_POPULARITY,))
-            conn.close()
+            df = self._read_catalog()
             
-            if self.df.empty: 
+            if df.empty: 
                 logger.warning("Veritabanı boş veya filtreye uygun oyun yok.")
                 return False
             
-            self.df['price'] = self.df['price'].astype('float32')
-            self.df['popularity_score'] = self.df['popularity_score'].astype('float16')
-            
-            self.df['normalized_dev'] = self.df['developer'].fillna("").str.lower().apply(self._normalize_developer)
-            self.df['series'] = self.df['Name'].fillna("").apply(self._extract_series)
+            tags = TagMatrixBuilder()
+            tags.add(df['tags'])
+            self.store = GameStore.from_columns(*self._store_columns(df), tags=tags.build())
+            self._corpus = self._build_corpus(df, self.store.column('visual_mask'))
             
-            tqdm.pandas(desc="Gameplay Features")
-            self.df['gameplay_features'] = self.df.apply(lambda r: self._extract_enhanced_keywords(r, self.gameplay_keywords), axis=1)
-            self.df['theme_features'] = self.df.apply(lambda r: self._extract_enhanced_keywords(r, self.theme_keywords), axis=1)
-            self.df['visual_features'] = self.df.apply(lambda r: self._extract_enhanced_keywords(r, self.visual_keywords), axis=1)
+            df_bytes = int(df.memory_usage(deep=True).sum())
+            store_bytes = sum(self.store.memory_usage().values())
+            logger.info(f"Oyun deposu: {store_bytes / 1e6:.1f} MB (DataFrame: {df_bytes / 1e6:.1f} MB)")
+            del df
+            gc.collect()
             
             return True
         except Exception as e:
             logger.error(f"Veri yükleme hatası: {e}")
             return False
 
-    def _build_models(self):
-        print(">>> [MODEL] TF-IDF Matrisi oluşturuluyor...")
-        combined_features = self.df['genres'].astype(str) + " " + \
-                           self.df['tags'].astype(str) + " " + \
-                           self.df['short_description'].astype(str) + " " + \
-                           self.df['developer'].astype(str) + " " + \
-                           self.df['visual_features'].apply(lambda x: " ".join(x)).astype(str)
+    def _read_catalog(self) -> 'pd.DataFrame':
+        import pandas as pd
+        self.catalog_fingerprint = self._read_fingerprint()
+        table = read_catalog_snapshot(self.config.CATALOG_SNAPSHOT_PATH, self.db_path, self.MIN_POPULARITY)
+        if table is not None:
+            print(">>> [MODEL] Katalog, sütunsal anlık görüntüden yükleniyor...")
+            return table.to_pandas(split_blocks=True, self_destruct=True)
         
-        tfidf = TfidfVectorizer(max_features=20000, stop_words='english', dtype=np.float32, min_df=2, ngram_range=(1, 2))
-        tfidf_matrix = tfidf.fit_transform(combined_features)
-        
-        print(">>> [MODEL] SVD (LSA) Boyut indirgeme uygulanıyor...")
-        svd = TruncatedSVD(n_components=self.config.SVD_COMPONENTS)
-        self.models['lsa_matrix'] = svd.fit_transform(tfidf_matrix).astype('float32')
-        faiss.normalize_L2(self.models['lsa_matrix'])
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return pd.read_sql_query(CATALOG_QUERY, conn, params=(self.MIN_POPULARITY,))
+        finally:
+            conn.close()
+
+    def _read_fingerprint(self) -> str:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return catalog_fingerprint(conn)
+        finally:
+            conn.close()
+
+    def _store_columns(self, df: 'pd.DataFrame') -> Tuple[dict, dict, dict]:
+        import pandas as pd
+        feature_text = (df['tags'].fillna('').astype(str) + " " + df['short_description'].fillna('').astype(str)).str.lower()
+        style_text = (df['Name'].fillna('').astype(str) + " " + df['short_description'].fillna('').astype(str)).str.lower()
+        release_year = df['release_date'].fillna('').astype(str).str[:4]
         
-        print(">>> [MODEL] FAISS İçerik indeksi kuruluyor (IVF)...")
-<<<<<<< HEAD
-        nlist = 200 
-        quantizer = faiss.IndexFlatL2(self.models['lsa_matrix'].shape[1])
-        self.content_index = faiss.IndexIVFFlat(quantizer, self.models['lsa_matrix'].shape[1], nlist)
-=======
-        d = self.models['lsa_matrix'].shape[1]
+        return (
+            {
+                'AppID': (df['AppID'], np.int32),
+                # Fiyat ve popülerlik yanıtta ve eşik karşılaştırmalarında SQLite'takiyle aynı kalmalı
+                'price': (df['price'], np.float64),
+                'popularity_score': (df['popularity_score'], np.float64),
+                'average_playtime_forever': (df['average_playtime_forever'].fillna(0), np.int32),
+                'year': (pd.to_numeric(release_year.where(release_year.str.isdigit()), errors='coerce').fillna(0), np.int16),
+                'gameplay_mask': (self._keyword_mask(feature_text, self.gameplay_keywords), np.uint64),
+                'theme_mask': (self._keyword_mask(feature_text, self.theme_keywords), np.uint64),
+                'visual_mask': (self._keyword_mask(feature_text, self.visual_keywords), np.uint64),
+                'style_mask': (self._keyword_mask(style_text, self.visual_styles), np.uint64),
+            },
+            {
+                'Name': df['Name'].tolist(),
+                'CleanName': df['CleanName'].tolist(),
+            },
+            {
+                'genres': df['genres'].tolist(),
+                'normalized_dev': df['developer'].fillna("").str.lower().apply(self._normalize_developer).tolist(),
+                'series': df['Name'].fillna("").apply(self._extract_series).tolist(),
+                'release_year': release_year.tolist(),
+                'header_image': df['header_image'].tolist(),
+                'SteamURL': df['SteamURL'].tolist(),
+            },
+        )
+
+    def _build_corpus(self, df: 'pd.DataFrame', visual_mask: np.ndarray) -> 'pd.Series':
+        import pandas as pd
+        visual_terms = pd.Series([" ".join(self._mask_keywords(m, self.visual_keywords)) for m in visual_mask], index=df.index)
+        return df['genres'].astype(str) + " " + \
+               df['tags'].astype(str) + " " + \
+               df['short_description'].astype(str) + " " + \
+               df['developer'].astype(str) + " " + \
+               visual_terms
+
+    def save_artifacts(self, directory: Path, manifest_extra: dict = None):
+        """Kurulmuş modeli sürüm dizinine yaz; manifest en son yazılır ve tamamlanma işareti olur"""
+        directory.mkdir(parents=True, exist_ok=True)
+        self.store.save(str(directory))
+        faiss.write_index(self.content_index.index, str(directory / 'content.faiss'))
+        faiss.write_index(self.name_index.index, str(directory / 'names.faiss'))
+        # Tam hassasiyetli vektörler yalnızca sıkıştırılmış indeksler için (yeniden sıralama) yazılır ve
+        # bundan sonra diskten bellek eşlemeli okunur; düz indeksler vektörlerini kendileri taşır.
+        for index, filename in ((self.content_index, 'lsa_matrix.npy'), (self.name_index, 'name_vectors.npy')):
+            if index.vectors is not None:
+                np.save(directory / filename, np.ascontiguousarray(index.vectors, dtype=np.float32))
+                index.vectors = np.load(directory / filename, mmap_mode='r')
+        manifest = {
+            "version": self.version,
+            "format": self.ARTIFACT_FORMAT,
+            "created_at": int(time.time()),
+            "catalog_fingerprint": self.catalog_fingerprint,
+            "min_popularity": self.MIN_POPULARITY,
+            "svd_components": self.SVD_COMPONENTS,
+            "content_index": self.config.CONTENT_INDEX_TYPE,
+            "name_index": self.config.NAME_INDEX_TYPE,
+            "games": len(self.store),
+            **(manifest_extra or {}),
+        }
+        (directory / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+
+    def initialize_from_artifacts(self, directory: Path, load_encoder: bool = True) -> bool:
+        try:
+            manifest = json.loads((directory / 'manifest.json').read_text())
+            if manifest.get('format', 1) != self.ARTIFACT_FORMAT:
+                logger.warning(f"Model dosya biçimi uyumsuz ({directory}), yeniden kurulum gerekli.")
+                return False
+            print(f">>> [MODEL] Hazır model yükleniyor: {manifest['version']}")
+
+            def load_artifacts():
+                self.store = GameStore.load(str(directory))
+                self.content_index = self._wrap_index(
+                    faiss.read_index(str(directory / 'content.faiss')), self._load_vectors(directory / 'lsa_matrix.npy'))
+                self.name_index = self._wrap_index(
+                    faiss.read_index(str(directory / 'names.faiss')), self._load_vectors(directory / 'name_vectors.npy'))
+
+            stages = {'artifacts': ((), load_artifacts)}
+            if load_encoder:
+                stages['encoder'] = ((), self._load_encoder)
+            self._run_stages(stages)
+            self.version = manifest['version']
+            self.catalog_fingerprint = manifest.get('catalog_fingerprint')
+            self._models_loaded = True
+            print(f">>> [MODEL] {len(self.store)} oyunluk model hazır ({self.version}).")
+            return True
+        except Exception as e:
+            logger.error(f"Model dosyaları yüklenemedi ({directory}): {e}", exc_info=True)
+            return False
+
+    @staticmethod
+    def _load_vectors(path: Path) -> Optional[np.ndarray]:
+        return np.load(path, mmap_mode='r') if path.exists() else None
+
+    def _wrap_index(self, index, vectors: Optional[np.ndarray]) -> RerankedIndex:
+        return RerankedIndex(index, vectors, rerank_factor=self.config.INDEX_RERANK_FACTOR)
+
+    def _quantized(self, kind: str) -> bool:
+        return kind != 'flat'
+
+    def _load_encoder(self):
+        self.text_model = load_encoder(self.config.ENCODER_MODEL)
+
+    def _run_stages(self, stages: Dict[str, Tuple[Tuple[str, ...], Callable[[], None]]]):
+        """Bağımlılıkları tamamlanan aşamaları iş parçacığı havuzunda eşzamanlı çalıştırır (basit DAG)"""
+        self.build_progress.reset(list(stages))
+        pending = dict(stages)
+        running = {}
+        done = set()
+        with ThreadPoolExecutor(max_workers=self.config.INIT_WORKERS, thread_name_prefix='model-init') as pool:
+            while pending or running:
+                for name, (deps, fn) in list(pending.items()):
+                    if all(d in done for d in deps):
+                        del pending[name]
+                        running[pool.submit(self._run_stage, name, fn)] = name
+                if not running:
+                    raise RuntimeError(f"Çözümlenemeyen aşama bağımlılıkları: {list(pending)}")
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    future.result()
+                    done.add(name)
+
+    def _run_stage(self, name: str, fn: Callable[[], None]):
+        self.build_progress.start(name)
+        try:
+            fn()
+        except Exception as e:
+            self.build_progress.fail(name, e)
+            raise
+        self.build_progress.finish(name)
+
+    def _build_models(self):
+        # data ─┬─ tfidf ─ svd ─ content_index
+        # encoder ─┴─ name_index
+        ctx = {}
+
+        def load_data():
+            if not self._load_data():
+                raise RuntimeError("Veri yüklenemedi!")
+            print(f">>> [MODEL] {len(self.store)} oyun yüklendi. Vektörleştirme başlıyor...")
+
+        def tfidf():
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            print(">>> [MODEL] TF-IDF Matrisi oluşturuluyor...")
+            vectorizer = TfidfVectorizer(max_features=20000, stop_words='english', dtype=np.float32, min_df=2, ngram_range=(1, 2))
+            ctx['tfidf_matrix'] = vectorizer.fit_transform(self._corpus)
+            self._corpus = None
+
+        def svd():
+            from sklearn.decomposition import TruncatedSVD
+            print(">>> [MODEL] SVD (LSA) Boyut indirgeme uygulanıyor...")
+            reducer = TruncatedSVD(n_components=self.config.SVD_COMPONENTS)
+            lsa_matrix = reducer.fit_transform(ctx.pop('tfidf_matrix')).astype('float32')
+            faiss.normalize_L2(lsa_matrix)
+            ctx['lsa_matrix'] = lsa_matrix
+
+        def content_index():
+            print(">>> [MODEL] FAISS İçerik indeksi kuruluyor (IVF)...")
+            lsa_matrix = ctx.pop('lsa_matrix')
+            index = self._new_content_index(lsa_matrix.shape[1])
+            index.train(lsa_matrix)
+            step = 10000
+            for i in range(0, len(lsa_matrix), step):
+                index.add(lsa_matrix[i:i + step])
+                self.build_progress.update('content_index', (i + step) / len(lsa_matrix))
+            self.content_index = self._wrap_content_index(index, lsa_matrix)
+
+        def name_index():
+            print(">>> [MODEL] İsim arama indeksi oluşturuluyor...")
+            self._build_name_index()
+
+        self._run_stages({
+            'data': ((), load_data),
+            'encoder': ((), self._load_encoder),
+            'tfidf': (('data',), tfidf),
+            'svd': (('tfidf',), svd),
+            'content_index': (('svd',), content_index),
+            'name_index': (('data', 'encoder'), name_index),
+        })
+
+    def _new_content_index(self, d: int):
         nlist = 200 
-        quantizer = faiss.IndexFlatL2(d)
-        self.content_index = faiss.IndexIVFFlat(quantizer, d, nlist)
->>>>>>> cdbd22f7fbdc20f081bee3139c5a9d5fa1f59fee
-        self.content_index.train(self.models['lsa_matrix'])
-        self.content_index.add(self.models['lsa_matrix'])
-        
-        print(">>> [MODEL] İsim arama indeksi oluşturuluyor...")
-        self._build_name_index()
+        return new_content_index(self.config.CONTENT_INDEX_TYPE, d, nlist)
 
-    def _build_name_index(self):
-        names = self.df['Name'].fillna('').tolist()
-        batch_size = 512
-        name_vecs_list = []
+    def _wrap_content_index(self, index, lsa_matrix: np.ndarray) -> RerankedIndex:
+        # Düz IVF indeksi LSA vektörlerinin kendisini saklar; ayrı bir kopya yalnızca sıkıştırılmış
+        # indekste kısa listeyi tam hassasiyetle yeniden sıralamak için tutulur.
+        quantized = self._quantized(self.config.CONTENT_INDEX_TYPE)
+        return self._wrap_index(index, lsa_matrix if quantized else None)
+
+    def _build_models_streaming(self):
+        # stream ─┬─ name_index
+        # encoder ─┘
+        def name_index():
+            print(">>> [MODEL] İsim arama indeksi oluşturuluyor...")
+            self._build_name_index()
+
+        self._run_stages({
+            'stream': ((), self._stream_content),
+            'encoder': ((), self._load_encoder),
+            'name_index': (('stream', 'encoder'), name_index),
+        })
+
+    def _stream_content(self):
+        """
+        RAM'e sığmayan kataloglar için parça parça kurulum: TF-IDF sözlüğü, SVD ve IVF
+        rastgele bir örneklem üzerinde eğitilir, ardından oyunlar SQLite'tan parçalar halinde
+        okunup dondurulmuş dönüştürücülerle vektörleştirilir ve indekse eklenir.
+        """
+        import pandas as pd
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.decomposition import TruncatedSVD
+
+        if not os.path.exists(self.db_path):
+            raise RuntimeError(f"Veritabanı bulunamadı: {self.db_path}")
+
+        chunk_size = self.config.STREAM_CHUNK_SIZE
+        sample_size = self.config.STREAM_SAMPLE_SIZE
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self.catalog_fingerprint = catalog_fingerprint(conn)
+            print(f">>> [MODEL] Akış modu: {sample_size} oyunluk örneklem üzerinde TF-IDF/SVD eğitiliyor...")
+            sample = pd.read_sql_query(f"SELECT * FROM ({CATALOG_QUERY}) ORDER BY random() LIMIT ?", conn, params=(self.MIN_POPULARITY, sample_size))
+            if sample.empty:
+                raise RuntimeError("Veritabanı boş veya filtreye uygun oyun yok.")
+            total = conn.execute(f"SELECT COUNT(*) FROM ({CATALOG_QUERY})", (self.MIN_POPULARITY,)).fetchone()[0]
+            
+            sample_text = (sample['tags'].fillna('').astype(str) + " " + sample['short_description'].fillna('').astype(str)).str.lower()
+            sample_corpus = self._build_corpus(sample, self._keyword_mask(sample_text, self.visual_keywords))
+            tfidf = TfidfVectorizer(max_features=20000, stop_words='english', dtype=np.float32, min_df=2, ngram_range=(1, 2))
+            svd = TruncatedSVD(n_components=self.config.SVD_COMPONENTS, algorithm='randomized', random_state=42)
+            sample_lsa = svd.fit_transform(tfidf.fit_transform(sample_corpus)).astype('float32')
+            faiss.normalize_L2(sample_lsa)
+            del sample, sample_text, sample_corpus
+            
+            print(">>> [MODEL] FAISS İçerik indeksi örneklem üzerinde eğitiliyor (IVF)...")
+            content_index = self._new_content_index(sample_lsa.shape[1])
+            content_index.train(sample_lsa)
+            del sample_lsa
+            gc.collect()
+            
+            numeric, text, categorical = defaultdict(list), defaultdict(list), defaultdict(list)
+            tags = TagMatrixBuilder()
+            dtypes = {}
+            lsa_chunks = []
+            for chunk in pd.read_sql_query(CATALOG_QUERY, conn, params=(self.MIN_POPULARITY,), chunksize=chunk_size):
+                chunk = chunk.reset_index(drop=True)
+                num_cols, text_cols, cat_cols = self._store_columns(chunk)
+                for name, (values, dtype) in num_cols.items():
+                    numeric[name].append(np.asarray(values, dtype=dtype))
+                    dtypes[name] = dtype
+                for name, values in text_cols.items():
+                    text[name].extend(values)
+                for name, values in cat_cols.items():
+                    categorical[name].extend(values)
+                tags.add(chunk['tags'])
+                
+                lsa = svd.transform(tfidf.transform(self._build_corpus(chunk, numeric['visual_mask'][-1]))).astype('float32')
+                faiss.normalize_L2(lsa)
+                content_index.add(lsa)
+                if self._quantized(self.config.CONTENT_INDEX_TYPE):
+                    lsa_chunks.append(lsa)
+                self.build_progress.update('stream', content_index.ntotal / max(1, total))
+                print(f">>> [MODEL] Akış modu: {content_index.ntotal}/{total} oyun indekslendi.")
+        finally:
+            conn.close()
         
-        for i in range(0, len(names), batch_size):
-            batch = names[i:i + batch_size]
-            vecs = self.text_model.encode(batch, show_progress_bar=False, device='cpu').astype('float32')
-            name_vecs_list.append(vecs)
+        if not content_index.ntotal:
+            raise RuntimeError("Veritabanı boş veya filtreye uygun oyun yok.")
         
-        name_vecs = np.vstack(name_vecs_list)
+        self.store = GameStore.from_columns(
+            {name: (np.concatenate(parts), dtypes[name]) for name, parts in numeric.items()},
+            dict(text),
+            dict(categorical),
+            tags=tags.build(),
+        )
+        self.content_index = self._wrap_content_index(content_index, np.vstack(lsa_chunks) if lsa_chunks else None)
+        del lsa_chunks
+        gc.collect()
+
+    def _build_name_index(self):
+        # Yalnızca önbellekte olmayan (yeni veya değişmiş) isimler kodlanır
+        names = self.store.column('Name').tolist()
+        cache = EmbeddingCache(self.config.EMBEDDING_CACHE_PATH, self.config.ENCODER_MODEL)
+        name_vecs = cache.get_or_encode(
+            names,
+            lambda batch: self.text_model.encode(batch, show_progress_bar=False, device='cpu'),
+            batch_size=512,
+            progress=lambda p: self.build_progress.update('name_index', p),
+        )
         faiss.normalize_L2(name_vecs)
-        d = name_vecs.shape[1]
-        self.name_index = faiss.IndexFlatIP(d)
-        self.name_index.add(name_vecs)
+        kind = self.config.NAME_INDEX_TYPE
+        index = new_name_index(kind, name_vecs.shape[1])
+        index.train(name_vecs)
+        index.add(name_vecs)
+        self.name_index = self._wrap_index(index, name_vecs if self._quantized(kind) else None)
 
-    def recommend_games(self, game_names: Union[str, List[str]], n: int = None, filters: dict = None) -> List[Dict[str, Any]]:
+    def recommend_games(self, game_names: Union[str, List[str]], n: int = None, filters: dict = None,
+                        deadline: float = None, include_breakdown: bool = False) -> List[Dict[str, Any]]:
+        """
+        deadline (time.monotonic() cinsinden) verilirse skorlama süre dolduğunda kesilir ve o ana
+        kadarki en iyi sonuçlar partial=True işaretli bir Recommendations listesi olarak döner.
+        Skor kırılımı (breakdown) yalnızca include_breakdown=True ise yanıta eklenir.
+        """
+        if n is None: n = self.RECOMMENDATION_COUNT
+        filters = filters or {}
+        game_names = self.split_query(game_names)
+
+        cache_key = self.request_key("rec", [g.lower().strip() for g in game_names], n, filters)
+        return self._serve(cache_key, lambda: self._recommend(self._resolve_names(game_names), n, filters, cache_key, deadline),
+                           include_breakdown)
+
+    def recommend_similar(self, app_ids: Union[int, List[int]], n: int = None, filters: dict = None,
+                          deadline: float = None, include_breakdown: bool = False) -> List[Dict[str, Any]]:
+        """AppID'lerden doğrudan LSA vektörüne gider; isim çözümleme ve encoder çıkarımı yapılmaz"""
         if n is None: n = self.RECOMMENDATION_COUNT
-        
         filters = filters or {}
+        if isinstance(app_ids, int):
+            app_ids = [app_ids]
+        app_ids = [int(a) for a in app_ids]
+
+        cache_key = self.request_key("sim", app_ids, n, filters)
+        return self._serve(cache_key, lambda: self._recommend(self._resolve_app_ids(app_ids), n, filters, cache_key, deadline),
+                           include_breakdown)
+
+    def _serve(self, cache_key: str, compute: Callable[[], Recommendations], include_breakdown: bool) -> List[Dict[str, Any]]:
+        recs = self._cache_get(cache_key)
+        if recs is None:
+            if not self._models_loaded: return []
+            # Aynı sorgu için eşzamanlı gelen istekler tek bir FAISS araması + skorlamayı paylaşır
+            recs = self._inflight.do(cache_key, compute)
+        return recs if include_breakdown else self._strip_breakdown(recs)
+
+    @staticmethod
+    def _strip_breakdown(recs: Recommendations) -> Recommendations:
+        return Recommendations(({k: v for k, v in r.items() if k != 'breakdown'} for r in recs), partial=recs.partial)
+
+    @staticmethod
+    def split_query(game_names: Union[str, List[str]]) -> List[str]:
+        """'Portal + Half-Life' biçimindeki çoklu oyun sorgusunu isimlere ayırır"""
+        if isinstance(game_names, str):
+            return [g.strip() for g in game_names.split('+') if g.strip()]
+        return game_names
+
+    @staticmethod
+    def canonical_filters(filters: dict) -> dict:
+        """Boş değerleri atılmış, tür listeleri küçük harfe çevrilip sıralanmış filtreler"""
+        canonical = {k: v for k, v in filters.items() if v not in (None, '', [])}
+        if canonical.get('genres'):
+            canonical['genres'] = sorted({g.lower().strip() for g in canonical['genres']})
+        if canonical.get('exclude'):
+            canonical['exclude'] = sorted({e.lower() for e in canonical['exclude']})
+        return canonical
+
+    @classmethod
+    def request_key(cls, kind: str, seeds: list, n: int, filters: dict) -> str:
+        """Sonucu değiştirmeyen farklılıkları (büyük/küçük harf, boşluk, tür sırası) yok sayan kanonik anahtar"""
+        canonical = cls.canonical_filters(filters)
+        return f"{kind}_{json.dumps(seeds)}_{n}_{json.dumps(canonical, sort_keys=True, default=str)}"
+
+    def _resolve_names(self, game_names: List[str]) -> List[int]:
+        return [idx for idx in (self._find_game_index(name) for name in game_names) if idx is not None]
+
+    def _resolve_app_ids(self, app_ids: List[int]) -> List[int]:
+        return [idx for idx in (self.store.find_app_id(a) for a in app_ids) if idx is not None]
+
+    def _recommend(self, target_indices: List[int], n: int, filters: dict, cache_key: str,
+                   deadline: float = None) -> Recommendations:
+        target_indices = list(dict.fromkeys(int(i) for i in target_indices))
+        if not target_indices: return Recommendations()
+        if expired(deadline): return Recommendations(partial=True)
+
+        seed_rows = [self.store.row(i) for i in target_indices]
+        is_multi = len(target_indices) > 1
+        queries = self.content_index.vectors_for(target_indices)
+        faiss.normalize_L2(queries)
+
+        # Tüm tohumlar tek bir toplu FAISS aramasıyla aranır; toplam aday sayısı tek tohumla aynı kalır
+        distances, indices = self.content_index.search(queries, self._search_k(len(target_indices)), params=self.search_params)
+        if is_multi:
+            indices = self._rrf_order(indices)
+            distances, best_seeds = self._nearest_seed(queries, indices)
+        else:
+            indices, distances = indices[0], distances[0]
+            best_seeds = np.zeros(len(indices), dtype=np.intp)
+        tag_sims = self._tag_similarities(self._seed_tags(target_indices), indices)
+
+        selector = CandidateSelector(seed_rows, self.config.MAX_DEVELOPER_RECOMMENDATIONS)
+        candidates = []
+        partial = False
+        for cand_idx, dist, seed, tag_row in zip(indices, distances, best_seeds, tag_sims):
+            if expired(deadline):
+                partial = True
+                break
+            if cand_idx < 0 or cand_idx >= len(self.store): continue 
+            
+            candidate = self.store.row(cand_idx)
+            if selector.seen(candidate["AppID"], candidate["CleanName"]): continue
+            
+            rec = self._score_candidate(seed_rows[seed], candidate, dist, float(tag_row[seed]), filters, is_multi)
+            if rec is not None and selector.accept(rec["AppID"], candidate["CleanName"], candidate.get('normalized_dev', '')):
+                candidates.append(rec)
+
+        return self._finish(candidates, n, partial, cache_key)
+
+    def _search_k(self, n_seeds: int) -> int:
+        k_search = min(self.catalog_size, self.MAX_RECOMMENDATIONS * 6)
+        if n_seeds > 1:
+            k_search = min(self.catalog_size, max(self.MAX_RECOMMENDATIONS, k_search // n_seeds))
+        return k_search
+
+    @property
+    def catalog_size(self) -> int:
+        return len(self.store)
+
+    def _score_candidate(self, base_game: GameRow, candidate: GameRow, dist: float, tag_sim: float,
+                         filters: dict, is_multi: bool) -> Optional[Dict[str, Any]]:
+        """Adaya yalnızca kendisine bağlı filtreleri ve skoru uygular; tekrar/geliştirici sınırları CandidateSelector'dadır"""
         genre_filter = filters.get('genres')
         exclude_filter = filters.get('exclude')
         year_min = filters.get('year_min')
@@ -252,107 +826,109 @@ class OptimizedGameRecommender:
         playtime_min = filters.get('playtime_min')
         playtime_max = filters.get('playtime_max')
 
-        if isinstance(game_names, str):
-            game_names = [g.strip() for g in game_names.split('+') if g.strip()]
+        if genre_filter:
+            candidate_genres = self._get_genres(candidate)
+            if not self._matches_genre_filter_enhanced(candidate_genres, genre_filter): return None
+        
+        try:
+            year = candidate['year']
+            if year:
+                if year_min and year < int(year_min): return None
+                if year_max and year > int(year_max): return None
+        except: pass
 
-        cache_key = f"rec_{hash(tuple(game_names))}_{n}_{hash(json.dumps(filters, sort_keys=True))}"
-        if cache_key in self.recommendation_cache:
-            self.stats.cache_hits += 1
-            return self.recommendation_cache[cache_key]
+        try:
+            pt = candidate['average_playtime_forever']
+            pt_hours = pt / 60
+            if playtime_min and pt_hours < int(playtime_min): return None
+            if playtime_max and pt_hours > int(playtime_max): return None
+        except: pass
 
-        if not self._models_loaded: return []
+        score, reasons, explain, parts = self._calculate_score_enhanced(base_game, candidate, dist, tag_sim, exclude_filter, is_multi)
+        
+        if score is None or score < self.MIN_SIMILARITY: return None
+        if reasons and reasons[0] == MatchReason.EXCLUDED: return None
+        
+        return {
+            "AppID": candidate["AppID"],
+            "Name": candidate["Name"],
+            "ImageURL": self._fix_image_url(candidate),
+            "genres": list(candidate.genre_list),
+            "price": candidate["price"],
+            "SteamURL": candidate["SteamURL"],
+            "similarity": round(float(score), 4),
+            "match_reasons": [{"code": r.code, "description": r.description} for r in reasons],
+            "primary_match": int(reasons[0].code) if reasons else 0,
+            "explanation": explain,
+            "breakdown": (base_game, candidate, parts),
+            "year": candidate["release_year"],
+            "playtime": candidate["average_playtime_forever"],
+            "popularity_score": candidate["popularity_score"]
+        }
 
-        target_indices = []
-        for name in game_names:
-            idx = self._find_game_index(name)
-            if idx is not None: target_indices.append(idx)
+    def _finish(self, candidates: List[Dict[str, Any]], n: int, partial: bool, cache_key: str) -> Recommendations:
+        candidates.sort(key=lambda x: x['similarity'], reverse=True)
+        final_recs = Recommendations(self._refine_recommendations(candidates, n), partial=partial)
+        # Kırılım yalnızca elenmeden kalan n oyun için, skorlamada hesaplanan bileşenlerden üretilir
+        # (parçalardan gelen adayların kırılımı parçada hesaplanmış olarak gelir)
+        for rec in final_recs:
+            if isinstance(rec['breakdown'], tuple):
+                rec['breakdown'] = self._get_similarity_breakdown(*rec['breakdown'])
         
-        if not target_indices: return []
+        if not partial:
+            self._cache_put(cache_key, final_recs)
+        return final_recs
 
-        if len(target_indices) > 1:
-            vectors = [self.models['lsa_matrix'][i] for i in target_indices]
-            query_vector = np.mean(vectors, axis=0).reshape(1, -1)
-            base_game = self.df.iloc[target_indices[0]] 
-        else:
-            base_idx = target_indices[0]
-            query_vector = self.models['lsa_matrix'][base_idx].reshape(1, -1)
-            base_game = self.df.iloc[base_idx]
+    def _rrf_order(self, indices: np.ndarray) -> np.ndarray:
+        """Tohum başına aday listelerini karşılıklı sıra füzyonu (RRF) ile tek sıralı aday listesinde birleştirir"""
+        n_seeds, k = indices.shape
+        valid = indices >= 0
+        ranks = np.broadcast_to(np.arange(k), (n_seeds, k))[valid]
+        unique, inverse = np.unique(indices[valid], return_inverse=True)
+        fused = np.zeros(len(unique), dtype=np.float64)
+        np.add.at(fused, inverse, 1.0 / (self.RRF_K + 1 + ranks))
+        return unique[np.argsort(-fused, kind='stable')]
 
-        faiss.normalize_L2(query_vector)
-        self.content_index.nprobe = 40 
-        k_search = min(len(self.df), self.MAX_RECOMMENDATIONS * 6)
-        distances, indices = self.content_index.search(query_vector.astype(np.float32), k_search)
-        indices = indices[0]
-        distances = distances[0]
+    def _nearest_seed(self, queries: np.ndarray, candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Her adayın tüm tohumlara benzerliği tek matris çarpımıyla hesaplanır; aday en yakın tohuma
+        göre skorlanır. Dönen uzaklıklar FAISS ile aynı ölçektedir (normalize L2 kare).
+        """
+        sims = self.content_index.vectors_for(candidates) @ queries.T
+        best = sims.argmax(axis=1)
+        distances = np.maximum(0.0, 2.0 - 2.0 * sims[np.arange(len(candidates)), best])
+        return distances, best
 
-        candidates = []
-        seen_ids = set([int(self.df.iloc[i]["AppID"]) for i in target_indices])
-        seen_names = set([self.df.iloc[i]["CleanName"] for i in target_indices])
-        developer_counts = defaultdict(int)
+    def _seed_tags(self, seed_indices: List[int]):
+        tags = self.store.tag_matrix
+        return None if tags is None else tags[seed_indices]
 
-        for cand_idx, dist in zip(indices, distances):
-            if cand_idx in target_indices: continue
-            if cand_idx >= len(self.df): continue 
-            
-            candidate = self.df.iloc[cand_idx]
-            cand_id = int(candidate["AppID"])
-            cand_clean_name = candidate["CleanName"]
-            
-            if cand_id in seen_ids or cand_clean_name in seen_names: continue
-            
-            if genre_filter:
-                candidate_genres = self._get_genres(candidate)
-                if not self._matches_genre_filter_enhanced(candidate_genres, genre_filter): continue
-            
-            try:
-                rel_date = str(candidate['release_date'])[:4]
-                if rel_date.isdigit():
-                    year = int(rel_date)
-                    if year_min and year < int(year_min): continue
-                    if year_max and year > int(year_max): continue
-            except: pass
+    def _tag_similarities(self, seed_tags, cand_indices: np.ndarray) -> np.ndarray:
+        """Adayların her tohuma etiket benzerliği (kosinüs) tek bir seyrek-yoğun çarpımla: (aday, tohum)"""
+        tags = self.store.tag_matrix
+        if tags is None or seed_tags is None or tags.shape[1] == 0:
+            return np.zeros((len(cand_indices), 1 if seed_tags is None else seed_tags.shape[0]), dtype=np.float32)
+        rows = np.where(cand_indices >= 0, cand_indices, 0)
+        return tags.dot_rows(rows, seed_tags)
 
-            try:
-                pt = int(candidate.get('average_playtime_forever', 0))
-                pt_hours = pt / 60
-                if playtime_min and pt_hours < int(playtime_min): continue
-                if playtime_max and pt_hours > int(playtime_max): continue
-            except: pass
-
-            is_multi = len(target_indices) > 1
-            score, reasons, explain, breakdown = self._calculate_score_enhanced(base_game, candidate, dist, exclude_filter, is_multi)
-            
-            if score is None or score < self.MIN_SIMILARITY: continue
-            if reasons and reasons[0] == MatchReason.EXCLUDED: continue
-            
-            dev = candidate.get('normalized_dev', '')
-            if dev and developer_counts.get(dev, 0) >= self.config.MAX_DEVELOPER_RECOMMENDATIONS: continue
-            
-            candidates.append({
-                "AppID": cand_id,
-                "Name": candidate["Name"],
-                "ImageURL": self._fix_image_url(candidate),
-                "genres": [g.strip() for g in str(candidate["genres"]).split(",") if g.strip()],
-                "price": float(candidate["price"]),
-                "SteamURL": str(candidate.get("SteamURL", "")),
-                "similarity": round(float(score), 4),
-                "match_reasons": [{"code": r.code, "description": r.description} for r in reasons],
-                "primary_match": int(reasons[0].code) if reasons else 0,
-                "explanation": explain,
-                "breakdown": breakdown,
-                "year": str(candidate.get('release_date', ''))[:4],
-                "playtime": int(candidate.get('average_playtime_forever', 0)),
-                "popularity_score": float(candidate.get("popularity_score", 0))
-            })
-            if dev: developer_counts[dev] += 1
-            seen_ids.add(cand_id)
-            seen_names.add(cand_clean_name)
+    def clear_cache(self):
+        with self._cache_lock:
+            self.recommendation_cache.clear()
 
-        candidates.sort(key=lambda x: x['similarity'], reverse=True)
-        final_recs = self._refine_recommendations(candidates, n)
-        
-        self.recommendation_cache[cache_key] = final_recs
-        return final_recs
+    def _cache_get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._cache_lock:
+            value = self.recommendation_cache.get(key)
+            if value is not None:
+                self.recommendation_cache.move_to_end(key)
+                self.stats.cache_hits += 1
+            return value
+
+    def _cache_put(self, key: str, value: List[Dict[str, Any]]):
+        with self._cache_lock:
+            self.recommendation_cache[key] = value
+            self.recommendation_cache.move_to_end(key)
+            while len(self.recommendation_cache) > self.config.RECOMMENDATION_CACHE_SIZE:
+                self.recommendation_cache.popitem(last=False)
 
     def _find_game_index(self, name):
         name = name.lower().strip()
@@ -363,35 +939,107 @@ class OptimizedGameRecommender:
             return I[0][0]
         
         clean = re.sub(r'[^\w]', '', name)
-        clean_names = self.df['CleanName'].astype(str)
-        matches = clean_names[clean_names == clean]
-        if not matches.empty:
-            return matches.index[0]
-        return None
+        return self.store.find_clean_name(clean)
 
     def autocomplete(self, query, limit=5):
         if not self._models_loaded: return []
         query = query.lower()
+        # Öneri önbelleğini paylaşır; model değiştiğinde yeni modelle birlikte boş başlar
+        key = f"ac_{json.dumps(query)}_{limit}"
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        result = self._inflight.do(("ac", query, limit), lambda: self._autocomplete(query, limit))
+        self._cache_put(key, result)
+        return result
+
+    def _autocomplete(self, query, limit):
         vec = self.text_model.encode([query], device='cpu').astype('float32')
         faiss.normalize_L2(vec)
         D, I = self.name_index.search(vec, limit*3)
         candidates = []
         seen_names = set()
         for idx in I[0]:
-            if idx < 0 or idx >= len(self.df): continue
-            name = self.df.iloc[idx]['Name']
-            clean_name = self.df.iloc[idx]['CleanName']
+            if idx < 0 or idx >= len(self.store): continue
+            name = self.store.value('Name', idx)
+            clean_name = self.store.value('CleanName', idx)
             if query in name.lower() and clean_name not in seen_names:
                  candidates.append(name)
                  seen_names.add(clean_name)
         return candidates[:limit]
 
+    def _high_rated_rows(self) -> np.ndarray:
+        if self._surprise_candidates is None:
+            self._surprise_candidates = np.flatnonzero((self.store.column('popularity_score') > 75) & (self.store.column('price') > 0))
+        return self._surprise_candidates
+
     def get_random_high_rated_game(self):
-        if self.df is None or self.df.empty: return None
-        subset = self.df[(self.df['popularity_score'] > 75) & (self.df['price'] > 0)]
-        if subset.empty: return None
-        game = subset.sample(1).iloc[0]
-        return {"Name": game['Name'], "AppID": int(game['AppID'])}
+        if self.store is None or len(self.store) == 0: return None
+        subset = self._high_rated_rows()
+        if subset.size == 0: return None
+        game = self.store.row(subset[random.randrange(subset.size)])
+        return {"Name": game['Name'], "AppID": game['AppID']}
+
+    def surprise(self, n: int = None, deadline: float = None, include_breakdown: bool = False):
+        """
+        Rastgele yüksek puanlı bir oyun ve önerilerini döndürür. Varsayılan n için sonuçlar arka planda
+        önceden hesaplanan dönen bir havuzdan alınır; havuz boşsa istek içinde hesaplanır.
+        """
+        if n is None: n = self.RECOMMENDATION_COUNT
+        entry = None
+        if n == self.RECOMMENDATION_COUNT:
+            try:
+                entry = self._surprise_pool.popleft()
+            except IndexError:
+                pass
+            self._refill_surprise_pool()
+        if entry is None:
+            source = self.get_random_high_rated_game()
+            if source is None: return None, []
+            entry = (source, self.recommend_similar(source['AppID'], n=n, deadline=deadline, include_breakdown=True))
+        source, recs = entry
+        return source, recs if include_breakdown else self._strip_breakdown(recs)
+
+    def _refill_surprise_pool(self):
+        if not self._models_loaded or len(self._surprise_pool) >= self.config.SURPRISE_POOL_SIZE:
+            return
+        with self._surprise_lock:
+            if self._surprise_refilling: return
+            self._surprise_refilling = True
+
+        def refill():
+            try:
+                while len(self._surprise_pool) < self.config.SURPRISE_POOL_SIZE:
+                    source = self.get_random_high_rated_game()
+                    if source is None: break
+                    recs = self.recommend_similar(source['AppID'], include_breakdown=True)
+                    if recs:
+                        self._surprise_pool.append((source, recs))
+            except Exception as e:
+                logger.warning(f"Sürpriz havuzu doldurulamadı: {e}")
+            finally:
+                with self._surprise_lock:
+                    self._surprise_refilling = False
+
+        try:
+            threading.Thread(target=refill, name="surprise-refill", daemon=True).start()
+        except RuntimeError:
+            # İş parçacığı açılamadıysa bayrak kalkmazsa havuz bir daha doldurulmaz
+            with self._surprise_lock:
+                self._surprise_refilling = False
+            raise
+
+    def get_game_text(self, app_id: int, fields=('short_description',)) -> Optional[Dict[str, Any]]:
+        # Büyük metin alanları bellekte tutulmaz; bir yanıt gerektirdiğinde SQLite'tan okunur.
+        allowed = ('short_description', 'detailed_description', 'tags', 'categories', 'supported_languages')
+        fields = [f for f in fields if f in allowed]
+        if not fields: return None
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute(f"SELECT {', '.join(fields)} FROM games WHERE AppID = ?", (int(app_id),)).fetchone()
+        finally:
+            conn.close()
+        return dict(zip(fields, row)) if row else None
 
     def _matches_genre_filter_enhanced(self, game_genres, filters, match_threshold=0.3):
         if not filters: return True
@@ -409,12 +1057,10 @@ class OptimizedGameRecommender:
                     return True
         return False
 
-    def _calculate_score_enhanced(self, base, candidate, dist, exclude_filter, is_multi=False):
-        score, reasons, explain = self._calculate_score(base, candidate, dist)
+    def _calculate_score_enhanced(self, base, candidate, dist, tag_sim, exclude_filter, is_multi=False):
+        score, reasons, explain, parts = self._calculate_score(base, candidate, dist, tag_sim)
         if score is None: return None, [], None, None
         
-        breakdown = self._get_similarity_breakdown(base, candidate)
-        
         if is_multi:
             reasons.insert(0, MatchReason.MULTI_GAME)
             score += 0.05
@@ -425,37 +1071,47 @@ class OptimizedGameRecommender:
             if exclusion_ratio >= self.config.MIN_EXCLUSION_MATCH:
                 score += self.config.EXCLUSION_PENALTY
                 if score <= 0.10:
-                    return None, [MatchReason.EXCLUDED], None, breakdown
+                    return None, [MatchReason.EXCLUDED], None, parts
                 explain += f" (Dışlama Cezası)"
                 reasons.append(MatchReason.EXCLUDED)
-                breakdown['excluded'] = round(exclusion_ratio * 100)
+                parts['excluded'] = exclusion_ratio
             else:
-                breakdown['excluded'] = 0
+                parts['excluded'] = 0
                 
-        return score, reasons, explain, breakdown
+        return score, reasons, explain, parts
 
-    def _calculate_score(self, base, candidate, dist):
-        base_genres = self._get_genres(base)
-        cand_genres = self._get_genres(candidate)
-        genre_intersection = set(base_genres) & set(cand_genres)
-        is_rare = len(self.config.RARE_GENRES & set(base_genres)) > 0
+    def _score_components(self, base, candidate, tag_sim) -> Dict[str, float]:
+        return {
+            'genre': self._weighted_jaccard(base.genre_set, candidate.genre_set),
+            'gameplay': self._mask_similarity(base['gameplay_mask'], candidate['gameplay_mask']),
+            'theme': self._mask_similarity(base['theme_mask'], candidate['theme_mask']),
+            'tag': tag_sim,
+            'visual_keywords': self._mask_similarity(base['visual_mask'], candidate['visual_mask']),
+            'price': self._price_similarity(base['price'], candidate['price']),
+        }
+
+    def _calculate_score(self, base, candidate, dist, tag_sim):
+        base_genres = base.genre_set
+        cand_genres = candidate.genre_set
+        genre_intersection = base_genres & cand_genres
+        is_rare = len(self.config.RARE_GENRES & base_genres) > 0
         
         vector_sim = max(0, 1.0 - (math.sqrt(dist) / 1.35))
 
         if not genre_intersection and not is_rare and vector_sim < 0.45:
-            return None, [], None
-        
-        genre_sim = self._weighted_jaccard(set(base_genres), set(cand_genres))
-        gameplay_sim = self._set_similarity(set(base['gameplay_features']), set(candidate['gameplay_features']))
-        theme_sim = self._set_similarity(set(base['theme_features']), set(candidate['theme_features']))
-        visual_sim = self._set_similarity(set(base['visual_features']), set(candidate['visual_features']))
+            return None, [], None, None
         
-        price_sim = self._price_similarity(float(base['price']), float(candidate['price']))
+        parts = self._score_components(base, candidate, tag_sim)
+        genre_sim = parts['genre']
+        gameplay_sim = parts['gameplay']
+        theme_sim = parts['theme']
+        visual_sim = parts['visual_keywords']
+        price_sim = parts['price']
         
-        base_dev = str(base.get('normalized_dev', '')).strip()
-        cand_dev = str(candidate.get('normalized_dev', '')).strip()
-        base_series = str(base.get('series', '')).strip()
-        cand_series = str(candidate.get('series', '')).strip()
+        base_dev = base['normalized_dev'].strip()
+        cand_dev = candidate['normalized_dev'].strip()
+        base_series = base['series'].strip()
+        cand_series = candidate['series'].strip()
         
         series_match = (base_series == cand_series) and base_series
         dev_match = (base_dev == cand_dev) and base_dev
@@ -470,7 +1126,7 @@ class OptimizedGameRecommender:
             MatchReason.THEME: self.dynamic_weights[MatchReason.THEME] * theme_sim,
             MatchReason.VISUAL: self.dynamic_weights[MatchReason.VISUAL] * visual_sim,
             MatchReason.PRICE: self.dynamic_weights[MatchReason.PRICE] * price_sim,
-            MatchReason.TAG: self.dynamic_weights[MatchReason.TAG] * 0.15, 
+            MatchReason.TAG: self.dynamic_weights[MatchReason.TAG] * tag_sim,
             MatchReason.DEVELOPER: self.config.DEVELOPER_BONUS if dev_match else 0,
             MatchReason.SERIES: self.config.SERIES_BONUS if series_match else 0
         }
@@ -478,7 +1134,7 @@ class OptimizedGameRecommender:
         score = sum(contributions.values()) + (vector_sim * 0.40) + visual_style_bonus
         if is_rare: score += self.config.RARE_GENRE_BONUS
         
-        if score < self.MIN_SIMILARITY: return None, [], None
+        if score < self.MIN_SIMILARITY: return None, [], None, None
         
         reasons = []
         if series_match: reasons.append(MatchReason.SERIES)
@@ -487,6 +1143,7 @@ class OptimizedGameRecommender:
         if gameplay_sim > 0.3: reasons.append(MatchReason.GAMEPLAY)
         if theme_sim > 0.3: reasons.append(MatchReason.THEME)
         if visual_sim > 0.3: reasons.append(MatchReason.VISUAL)
+        if tag_sim > 0.3: reasons.append(MatchReason.TAG)
         
         if reasons:
             primary = max(contributions, key=contributions.get)
@@ -495,27 +1152,59 @@ class OptimizedGameRecommender:
         else:
             reasons.append(MatchReason.POPULAR)
             
-        return score, reasons, "Similarity Match"
+        return score, reasons, "Similarity Match", parts
 
-    def _get_similarity_breakdown(self, base, candidate):
-        base_genres = set(self._get_genres(base))
-        cand_genres = set(self._get_genres(candidate))
-        
+    def _get_similarity_breakdown(self, base, candidate, parts: Dict[str, float], vectors=None):
         visual_score = 0
-        if 'lsa_matrix' in self.models:
+        if self.content_index is not None:
              try:
-                base_vec = self.models['lsa_matrix'][self.df.index.get_loc(base.name)].reshape(1,-1)
-                cand_vec = self.models['lsa_matrix'][self.df.index.get_loc(candidate.name)].reshape(1,-1)
-                visual_score = int(cosine_similarity(base_vec, cand_vec)[0][0] * 100)
+                base_vec, cand_vec = vectors if vectors is not None else self.content_index.vectors_for([base.idx, candidate.idx])
+                visual_score = int(np.dot(base_vec, cand_vec) / (np.linalg.norm(base_vec) * np.linalg.norm(cand_vec)) * 100)
              except: pass
 
-        return {
-            "genre": int(self._weighted_jaccard(base_genres, cand_genres) * 100),
-            "gameplay": int(self._set_similarity(set(base['gameplay_features']), set(candidate['gameplay_features'])) * 100),
-            "theme": int(self._set_similarity(set(base['theme_features']), set(candidate['theme_features'])) * 100),
-            "price": int(self._price_similarity(float(base['price']), float(candidate['price'])) * 100),
+        breakdown = {
+            "genre": int(parts['genre'] * 100),
+            "gameplay": int(parts['gameplay'] * 100),
+            "theme": int(parts['theme'] * 100),
+            "tag": int(parts['tag'] * 100),
+            "price": int(parts['price'] * 100),
             "visual": max(0, visual_score),
-            "popularity": int(candidate.get('popularity_score', 0))
+            "popularity": int(candidate['popularity_score'])
+        }
+        if 'excluded' in parts:
+            breakdown['excluded'] = round(parts['excluded'] * 100)
+        return breakdown
+
+    def explain(self, app_id: int, seed: str) -> Optional[Dict[str, Any]]:
+        """Tek bir oyunun verilen kaynak oyuna (veya "A + B" kaynaklarına) göre skorunu ve kırılımını hesapla"""
+        if not self._models_loaded: return None
+        cand_idx = self.store.find_app_id(app_id)
+        seeds = [s.strip() for s in str(seed).split('+') if s.strip()]
+        target_indices = [self.store.find_app_id(int(s)) if s.isdigit() else self._find_game_index(s) for s in seeds]
+        target_indices = [i for i in target_indices if i is not None]
+        if cand_idx is None or not target_indices: return None
+
+        queries = self.content_index.vectors_for(target_indices)
+        faiss.normalize_L2(queries)
+        distances, best = self._nearest_seed(queries, np.array([cand_idx]))
+        dist = float(distances[0])
+
+        base, candidate = self.store.row(target_indices[best[0]]), self.store.row(cand_idx)
+        tag_sim = float(self._tag_similarities(self._seed_tags([base.idx]), np.array([cand_idx]))[0, 0])
+        return self._explanation(base, candidate, dist, tag_sim, [self.store.value("Name", i) for i in target_indices])
+
+    def _explanation(self, base: GameRow, candidate: GameRow, dist: float, tag_sim: float, seed_names: List[str],
+                     vectors=None) -> Dict[str, Any]:
+        score, reasons, explain, parts = self._calculate_score_enhanced(base, candidate, dist, tag_sim, None, len(seed_names) > 1)
+        return {
+            "AppID": candidate["AppID"],
+            "Name": candidate["Name"],
+            "seed": seed_names,
+            "similarity": round(float(score), 4) if score is not None else None,
+            "match_reasons": [{"code": r.code, "description": r.description} for r in reasons],
+            "explanation": explain or "Below Similarity Threshold",
+            "breakdown": self._get_similarity_breakdown(base, candidate, parts or self._score_components(base, candidate, tag_sim),
+                                                        vectors=vectors)
         }
 
     def _normalize_developer(self, dev):
@@ -530,20 +1219,22 @@ class OptimizedGameRecommender:
             if re.search(p, name): return s
         return ""
 
-    def _get_genres(self, series):
-        return [g.strip() for g in str(series.get('genres', '')).split(',') if g.strip()]
+    def _get_genres(self, game: GameRow):
+        return list(game.genre_list)
 
     def _weighted_jaccard(self, s1, s2):
         if not s1 or not s2: return 0.0
         inter = s1 & s2
         union = s1 | s2
-        w_inter = sum(self.genre_weights.get(g, 1.0) for g in inter)
-        w_union = sum(self.genre_weights.get(g, 1.0) for g in union)
+        # fsum: küme gezinme sırası (string hash tohumu) süreçten sürece değiştiği için toplam sıradan bağımsız olmalı
+        w_inter = math.fsum(self.genre_weights.get(g, 1.0) for g in inter)
+        w_union = math.fsum(self.genre_weights.get(g, 1.0) for g in union)
         return w_inter / w_union if w_union else 0.0
 
-    def _set_similarity(self, s1, s2):
-        if not s1 or not s2: return 0.0
-        return len(s1 & s2) / len(s1 | s2)
+    def _mask_similarity(self, m1: int, m2: int) -> float:
+        # Anahtar kelime kümelerinin bit maskesi karşılığı: popcount(a & b) / popcount(a | b)
+        if not m1 or not m2: return 0.0
+        return (m1 & m2).bit_count() / (m1 | m2).bit_count()
 
     def _price_similarity(self, p1, p2):
         if p1 == 0 and p2 == 0: return 1.0
@@ -558,36 +1249,19 @@ class OptimizedGameRecommender:
         inter = g_lower & e_lower
         return len(inter) / len(e_lower) if e_lower else 0.0
 
-    def _extract_enhanced_keywords(self, row, keywords):
-        text = (str(row.get('tags','')) + " " + str(row.get('short_description',''))).lower()
-        found = set()
-        for k in keywords:
-            if k in text: found.add(k)
-        return found
-    
-    def _calculate_tag_similarity(self, t1, t2):
-        if not t1 or not t2: return 0.0
-        common = set(t1.keys()) & set(t2.keys())
-        if not common: return 0.0
-        weight = sum(min(t1[t], t2[t]) for t in common)
-        total = sum(t1.values())
-        return weight / total if total > 0 else 0.0
+    def _keyword_mask(self, texts: 'pd.Series', keywords: List[str]) -> np.ndarray:
+        mask = np.zeros(len(texts), dtype=np.uint64)
+        for bit, k in enumerate(keywords):
+            hits = texts.str.contains(k, regex=False).to_numpy(dtype=bool)
+            mask[hits] |= np.uint64(1 << bit)
+        return mask
 
+    def _mask_keywords(self, mask: int, keywords: List[str]) -> List[str]:
+        return [k for bit, k in enumerate(keywords) if int(mask) >> bit & 1]
+    
     def _has_similar_visual_style(self, base, cand):
-        b_text = (str(base['Name']) + " " + str(base.get('short_description',''))).lower()
-        c_text = (str(cand['Name']) + " " + str(cand.get('short_description',''))).lower()
-        
-        visual_overlap = set(base['visual_features']) & set(cand['visual_features'])
-        if visual_overlap: return True
-
-<<<<<<< HEAD
-        styles = ["pixel art", "retro", "realistic", "cartoon", "anime", "hand-drawn", "low poly", "isometric", "first-person", "third-person", "8-bit", "2d", "3d" , "top-down", "side-scroller" , "voxel" , "minimalist" , "futuristic" , "dark" , "colorful" , "gritty" , "surreal" , "cel-shaded" , "photorealistic" , "2D" , "3D"]
-=======
-        styles = ["pixel art", "retro", "realistic", "cartoon", "anime", "hand-drawn", "low poly", "isometric", "first-person", "third-person", "8-bit", "2d", "3d" , "top-down"]
->>>>>>> cdbd22f7fbdc20f081bee3139c5a9d5fa1f59fee
-        for s in styles:
-            if s in b_text and s in c_text: return True
-        return False
+        if base['visual_mask'] & cand['visual_mask']: return True
+        return bool(base['style_mask'] & cand['style_mask'])
         
     def _refine_recommendations(self, candidates, n):
         final = []
@@ -624,11 +1298,7 @@ class OptimizedGameRecommender:
             "Survival": 3.9, "Soulslike": 4.0, "Immersive Sim": 4.1,
             "Grand Strategy": 4.2, "4X": 4.0, "Psychological Horror": 3.0,
             "Analog Horror": 3.0, "Cyberpunk": 3.0, "8-bit": 2.8, "pixel art": 2.9,
-<<<<<<< HEAD
             "Free to Play": 2.0 , "Funny": 2.0 , "Important Choices": 2.0
-=======
-            "Free to Play": 2.0
->>>>>>> cdbd22f7fbdc20f081bee3139c5a9d5fa1f59fee
         }
 
     def _init_developer_map(self):
@@ -653,12 +1323,8 @@ class OptimizedGameRecommender:
             r'mass effect': "Mass Effect", r'fallout': "Fallout", r'civilization': "Civilization",
             r'borderlands': "Borderlands", r'bioshock': "BioShock", r'far cry': "Far Cry",
             r'tomb raider': "Tomb Raider", r'hitman': "Hitman", r'doom': "Doom",
-<<<<<<< HEAD
             r'terraria': "Terraria", r'stardew valley': "Stardew Valley",
             r"the sims 4": "The Sims 4" , r"undertale": "Undertale"
-=======
-            r'terraria': "Terraria", r'stardew valley': "Stardew Valley"
->>>>>>> cdbd22f7fbdc20f081bee3139c5a9d5fa1f59fee
         }
 
     def _init_enhanced_keywords(self):
@@ -668,22 +1334,14 @@ class OptimizedGameRecommender:
             "hack and slash", "point and click", "real-time strategy", "tower defense",
             "puzzle", "visual novel", "card game", "deckbuilding", "rhythm", "management",
             "base building", "exploration", "parkour", "permadeath", "looter shooter", "side-scroller",
-<<<<<<< HEAD
             "platformer", "fighting", "bullet hell", "dungeon crawler" , "rich story"
-=======
-            "platformer", "fighting", "bullet hell", "dungeon crawler"
->>>>>>> cdbd22f7fbdc20f081bee3139c5a9d5fa1f59fee
         ]
         self.theme_keywords = [
             "fantasy", "sci-fi", "horror", "cyberpunk", "medieval", "post-apocalyptic",
             "anime", "mystery", "war", "space", "zombies", "detective", "funny",
             "dystopian", "lovecraftian", "western", "pirates", "vampire", "noir",
             "mythology", "superhero", "historical", "military", "futuristic", "steampunk",
-<<<<<<< HEAD
             "retro" , "memes" , "2D"
-=======
-            "retro"
->>>>>>> cdbd22f7fbdc20f081bee3139c5a9d5fa1f59fee
         ]
     
     def _init_visual_keywords(self):
@@ -693,11 +1351,8 @@ class OptimizedGameRecommender:
             "2d", "3d", "vr", "retro", "minimalist", "noir", "colorful", "dark", 
             "atmospheric", "stylized", "cinematic", "text-based", "photorealistic",
             "watercolor", "sketch", "neon", "futuristic", "gothic", "surreal",
-<<<<<<< HEAD
             "comic" , "pixelated", "low resolution", "8-bit", "16-bit" , "2D" , "3D"
-=======
-            "comic" , "pixelated", "low resolution", "8-bit", "16-bit"
->>>>>>> cdbd22f7fbdc20f081bee3139c5a9d5fa1f59fee
         ]
+        self.visual_styles = ["pixel art", "retro", "realistic", "cartoon", "anime", "hand-drawn", "low poly", "isometric", "first-person", "third-person", "8-bit", "2d", "3d" , "top-down", "side-scroller" , "voxel" , "minimalist" , "futuristic" , "dark" , "colorful" , "gritty" , "surreal" , "cel-shaded" , "photorealistic" , "2D" , "3D"]
 
 GameRecommender = OptimizedGameRecommender
@@ -0,0 +1,93 @@
+# Öneri yanıtlarının şekillendirildiği (alan seçimi, gzip/brotli sıkıştırma, ETag ve Cache-Control başlıkları) responses.py dosyası.
+import gzip
+import hashlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from config import Config
+except ImportError:
+    class Config:
+        COMPRESS_MIN_BYTES = 1024
+        COMPRESS_GZIP_LEVEL = 6
+        COMPRESS_BROTLI_QUALITY = 5
+        SEARCH_CACHE_MAX_AGE = 300
+
+NO_STORE = {'Cache-Control': 'no-store'}
+
+RESULT_FIELDS = (
+    "AppID", "Name", "ImageURL", "genres", "price", "SteamURL", "similarity", "match_reasons",
+    "primary_match", "explanation", "breakdown", "year", "playtime", "popularity_score",
+)
+
+
+def parse_fields(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """?fields=AppID,Name -> ('AppID', 'Name'); parametre yoksa None, bilinmeyen alanda ValueError"""
+    if not raw:
+        return None
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in RESULT_FIELDS]
+    if unknown:
+        raise ValueError(f"Bilinmeyen alan: {', '.join(unknown)} (seçenekler: {', '.join(RESULT_FIELDS)})")
+    return fields or None
+
+
+def select_fields(results: Sequence[Dict[str, Any]], fields: Optional[Tuple[str, ...]]) -> List[Dict[str, Any]]:
+    if fields is None:
+        return list(results)
+    return [{k: r[k] for k in fields if k in r} for r in results]
+
+
+def cache_headers(version: Optional[str], canonical: str) -> Dict[str, str]:
+    """
+    Aynı model sürümü ve kanonik sorgu her zaman aynı sonucu verdiğinden ETag bu ikisinden
+    türetilir. Süre bütçesiyle kesilmiş veya yedek katmandan gelen yanıtlar önbelleğe alınmaz.
+    """
+    if version is None:
+        return dict(NO_STORE)
+    tag = hashlib.sha1(f"{version}\0{canonical}".encode('utf-8')).hexdigest()[:24]
+    # Sıkıştırılmış ve ham gövde aynı etiketi paylaştığı için zayıf ETag
+    return {'ETag': f'W/"{tag}"', 'Cache-Control': f'public, max-age={Config.SEARCH_CACHE_MAX_AGE}',
+            'Vary': 'Accept-Encoding'}
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    if not if_none_match or not etag:
+        return False
+    candidates = {t.strip().removeprefix('W/') for t in if_none_match.split(',')}
+    return etag.removeprefix('W/') in candidates or '*' in candidates
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding başlığından (q değerleri dahil) br veya gzip seçer"""
+    weights = {}
+    for part in (accept_encoding or '').lower().split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name] = q
+    options = (['br'] if brotli is not None else []) + ['gzip']
+    scored = [(weights.get(e, weights.get('*', 0.0)), -i, e) for i, e in enumerate(options)]
+    best = max(scored)
+    return best[2] if best[0] > 0 else None
+
+
+def compress(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """COMPRESS_MIN_BYTES altındaki gövdeler sıkıştırılmaz; (gövde, Content-Encoding) döndürür"""
+    if len(body) < Config.COMPRESS_MIN_BYTES:
+        return body, None
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding == 'br':
+        return brotli.compress(body, quality=Config.COMPRESS_BROTLI_QUALITY), encoding
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=Config.COMPRESS_GZIP_LEVEL, mtime=0), encoding
+    return body, None
@@ -0,0 +1,610 @@
+# Kataloğun AppID özetine göre parçalara (shard) bölündüğü, parça süreçlerinin ve dağıtık aramayı birleştiren koordinatörün bulunduğu shards.py dosyası.
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import queue
+import random
+import socket
+import logging
+import secrets
+import argparse
+import threading
+import subprocess
+import numpy as np
+import faiss
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Listener, Client
+from multiprocessing import AuthenticationError
+
+from model import GameRecommender, OptimizedGameRecommender, CandidateSelector
+from concurrency import Recommendations, expired
+from store import TagMatrix
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config import Config
+except ImportError:
+    class Config:
+        DB_PATH = "games.db"
+        MODEL_PATH = "models"
+        SHARD_ADDRESSES = ""
+        SHARD_AUTHKEY = ""
+        SHARD_TIMEOUT = 10
+
+
+class ShardError(RuntimeError):
+    pass
+
+
+def shard_of(app_id: int, shards: int) -> int:
+    """AppID'nin sahibi olan parça; süreçler ve makineler arasında kararlı (Python hash() tuzlanmasından bağımsız)"""
+    return zlib.crc32(int(app_id).to_bytes(8, 'little', signed=True)) % shards
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.strip().rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def split_artifacts(source: Path, shards: int, output: Path = None) -> List[Path]:
+    """
+    Yayınlanmış bir model sürümünü AppID özetine göre parçalara böler. Parçalar aynı eğitilmiş
+    IVF merkezlerini ve nicemleyicileri paylaşır (indeks kopyalanıp boşaltılır), böylece her parça
+    tek düğümdeki listelerin kendi oyunlarına düşen kısmını tutar ve aynı uzaklıkları üretir.
+    """
+    source = Path(source)
+    full = GameRecommender(model_path=str(source.parent))
+    if not full.initialize_from_artifacts(source, load_encoder=False):
+        raise ShardError(f"Model sürümü yüklenemedi: {source}")
+
+    output = Path(output or source / f'shards-{shards}')
+    app_ids = full.store.column('AppID')
+    owners = np.fromiter((shard_of(a, shards) for a in app_ids), dtype=np.int32, count=len(app_ids))
+    directories = []
+    for i in range(shards):
+        rows = np.flatnonzero(owners == i)
+        part = GameRecommender(model_path=str(source.parent))
+        part.store = full.store.take(rows)
+        part.content_index = _take_index(part, full.content_index, rows)
+        part.name_index = _take_index(part, full.name_index, rows)
+        part.version, part.catalog_fingerprint = full.version, full.catalog_fingerprint
+
+        directory = output / str(i)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / 'global_rows.npy', rows)
+        part.save_artifacts(directory, manifest_extra={"shard": i, "shards": shards, "catalog_games": len(full.store)})
+        directories.append(directory)
+        print(f">>> [SHARD] Parça {i}/{shards}: {len(rows)} oyun -> {directory}")
+    return directories
+
+
+def _take_index(part: OptimizedGameRecommender, wrapped, rows: np.ndarray):
+    vectors = wrapped.vectors_for(rows)
+    index = faiss.clone_index(wrapped.index)
+    index.reset()
+    if len(rows):
+        index.add(vectors)
+    return part._wrap_index(index, vectors if wrapped.vectors is not None else None)
+
+
+class ShardService:
+    """
+    Tek bir katalog parçasını sunar. Koordinatörle oyunlar global satır numarasıyla (tek düğümlü
+    depodaki sıra) konuşulur; parça yalnızca kendi oyunlarını arar ve skorlar.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.manifest = json.loads((self.directory / 'manifest.json').read_text())
+        self.engine = GameRecommender(model_path=str(self.directory.parent))
+        if not self.engine.initialize_from_artifacts(self.directory, load_encoder=False):
+            raise ShardError(f"Parça yüklenemedi: {self.directory}")
+        self.global_rows = np.load(self.directory / 'global_rows.npy')
+
+    def _local(self, gids: Sequence[int]) -> np.ndarray:
+        gids = np.asarray(gids, dtype=np.int64)
+        local = np.searchsorted(self.global_rows, gids)
+        if len(gids) and (local.max() >= len(self.global_rows) or (self.global_rows[local] != gids).any()):
+            raise ShardError("Bu parçaya ait olmayan satır istendi")
+        return local
+
+    def _owned(self, gids: Sequence[int]) -> List[Tuple[int, int]]:
+        gids = np.asarray(gids, dtype=np.int64)
+        local = np.minimum(np.searchsorted(self.global_rows, gids), max(0, len(self.global_rows) - 1))
+        hit = (self.global_rows[local] == gids) if len(self.global_rows) else np.zeros(len(gids), dtype=bool)
+        return [(int(g), int(l)) for g, l, h in zip(gids, local, hit) if h]
+
+    def _gid(self, local: Optional[int]) -> Optional[int]:
+        return None if local is None else int(self.global_rows[local])
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "shard": self.manifest["shard"],
+            "shards": self.manifest["shards"],
+            "games": len(self.engine.store),
+            "catalog_games": self.manifest["catalog_games"],
+            "version": self.engine.version,
+        }
+
+    def seeds(self, gids: Sequence[int]) -> Dict[int, Tuple[Any, np.ndarray]]:
+        """Bu parçadaki tohumlar: tek satırlık depo (etiket satırıyla) ve ham LSA vektörü"""
+        return {g: (self.engine.store.take([l], tag_vocab=False), self.engine.content_index.vectors_for([l])[0])
+                for g, l in self._owned(gids)}
+
+    def find_app_id(self, app_id: int) -> Optional[int]:
+        return self._gid(self.engine.store.find_app_id(app_id))
+
+    def high_rated_count(self) -> int:
+        return int(self.engine._high_rated_rows().size)
+
+    def high_rated(self, position: int) -> Dict[str, Any]:
+        game = self.engine.store.row(self.engine._high_rated_rows()[position])
+        return {"Name": game['Name'], "AppID": game['AppID']}
+
+    def find_clean_name(self, clean_name: str) -> Optional[int]:
+        return self._gid(self.engine.store.find_clean_name(clean_name))
+
+    def find_name(self, vec: np.ndarray) -> Optional[Tuple[float, int]]:
+        if not len(self.global_rows): return None
+        D, I = self.engine.name_index.search(vec, 1)
+        return (float(D[0][0]), self._gid(I[0][0])) if I[0][0] >= 0 else None
+
+    def name_search(self, vec: np.ndarray, k: int) -> List[Tuple[float, int, str, str]]:
+        if not len(self.global_rows): return []
+        D, I = self.engine.name_index.search(vec, k)
+        store = self.engine.store
+        return [(float(d), self._gid(i), store.value('Name', i), store.value('CleanName', i))
+                for d, i in zip(D[0], I[0]) if i >= 0]
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if not len(self.global_rows):
+            return np.full((len(queries), 0), np.inf, dtype=np.float32), np.full((len(queries), 0), -1, dtype=np.int64)
+        D, I = self.engine.content_index.search(queries, k, params=self.engine.search_params)
+        return D, np.where(I >= 0, self.global_rows[np.maximum(I, 0)], -1)
+
+    def score(self, seed_stores: list, seed_vectors: np.ndarray, candidates: np.ndarray, positions: np.ndarray,
+              distances: Optional[np.ndarray], filters: dict, is_multi: bool, budget: Optional[float]):
+        """
+        Adaylara filtreleri ve skoru uygular, kırılımı hesaplar. Tekrar/geliştirici sınırları
+        global sıraya bağlı olduğundan koordinatörde uygulanır; her sonuç global sırasıyla döner.
+        """
+        engine = self.engine
+        deadline = None if budget is None else time.monotonic() + budget
+        seed_rows = [s.row(0) for s in seed_stores]
+        seed_tags = None
+        if all(s.tag_matrix is not None for s in seed_stores):
+            seed_tags = TagMatrix.vstack([s.tag_matrix for s in seed_stores])
+        local = self._local(candidates)
+
+        queries = np.array(seed_vectors, dtype=np.float32)
+        faiss.normalize_L2(queries)
+        if is_multi:
+            distances, best_seeds = engine._nearest_seed(queries, local)
+        else:
+            best_seeds = np.zeros(len(local), dtype=np.intp)
+        tag_sims = engine._tag_similarities(seed_tags, local)
+
+        seeds_only = CandidateSelector(seed_rows, 0)
+        results = []
+        for pos, idx, dist, seed, tag_row in zip(positions, local, distances, best_seeds, tag_sims):
+            if expired(deadline):
+                return results, True
+            candidate = engine.store.row(idx)
+            if seeds_only.seen(candidate["AppID"], candidate["CleanName"]): continue
+            rec = engine._score_candidate(seed_rows[seed], candidate, dist, float(tag_row[seed]), filters, is_multi)
+            if rec is None: continue
+            base, cand, parts = rec['breakdown']
+            rec['breakdown'] = engine._get_similarity_breakdown(
+                base, cand, parts, vectors=(seed_vectors[seed], engine.content_index.vectors_for([idx])[0]))
+            results.append((int(pos), rec["AppID"], candidate["CleanName"], candidate.get('normalized_dev', ''), rec))
+        return results, False
+
+
+    def explain(self, seed_stores: list, seed_vectors: np.ndarray, gid: int) -> Dict[str, Any]:
+        """Tek adayın (bu parçadaki) tohumlara göre skoru ve kırılımı; tohumlar başka parçalardan gelebilir"""
+        engine = self.engine
+        idx = int(self._local([gid])[0])
+        queries = np.array(seed_vectors, dtype=np.float32)
+        faiss.normalize_L2(queries)
+        distances, best = engine._nearest_seed(queries, np.array([idx]))
+        seed = int(best[0])
+        tag_sim = float(engine._tag_similarities(seed_stores[seed].tag_matrix, np.array([idx]))[0, 0])
+        return engine._explanation(seed_stores[seed].row(0), engine.store.row(idx), float(distances[0]), tag_sim,
+                                   [s.row(0)['Name'] for s in seed_stores],
+                                   vectors=(seed_vectors[seed], engine.content_index.vectors_for([idx])[0]))
+
+
+def serve(service: ShardService, host: str, port: int, authkey: bytes):
+    listener = Listener((host, port), authkey=authkey)
+    info = service.info()
+    print(f">>> [SHARD] Parça {info['shard']}/{info['shards']} ({info['games']} oyun) dinleniyor: {host}:{port}")
+    while True:
+        try:
+            conn = listener.accept()
+        except (AuthenticationError, OSError, EOFError) as e:
+            logger.warning(f"Parça bağlantısı reddedildi: {e}")
+            continue
+        threading.Thread(target=_handle, args=(service, conn), name="shard-conn", daemon=True).start()
+
+
+def _handle(service: ShardService, conn):
+    with conn:
+        while True:
+            try:
+                method, args = conn.recv()
+            except (EOFError, OSError):
+                return
+            if method.startswith('_') or not callable(getattr(service, method, None)):
+                conn.send(('error', f"Bilinmeyen parça çağrısı: {method}"))
+                continue
+            try:
+                conn.send(('ok', getattr(service, method)(*args)))
+            except Exception as e:
+                logger.error(f"Parça çağrısı hatası ({method}): {e}", exc_info=True)
+                conn.send(('error', str(e)))
+
+
+class ShardClient:
+    """Tek bir parça sürecine yeniden kullanılan bağlantılar; her çağrı havuzdan bir bağlantı ödünç alır"""
+
+    def __init__(self, address: Tuple[str, int], authkey: bytes, timeout: float):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._pool: queue.LifoQueue = queue.LifoQueue()
+
+    def call(self, method: str, *args):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = Client(self.address, authkey=self.authkey)
+        try:
+            conn.send((method, args))
+            if not conn.poll(self.timeout):
+                raise ShardError(f"Parça yanıt vermedi: {self.address[0]}:{self.address[1]} ({method})")
+            status, result = conn.recv()
+        except BaseException:
+            conn.close()
+            raise
+        self._pool.put(conn)
+        if status != 'ok':
+            raise ShardError(f"{self.address[0]}:{self.address[1]}: {result}")
+        return result
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class ShardCoordinator(OptimizedGameRecommender):
+    """
+    Parçalara bölünmüş kataloğu tek motor gibi sunar (recommend_games, recommend_similar,
+    autocomplete, explain, surprise). Arama tüm parçalara dağıtılır, parça başına en iyi k aday
+    uzaklığa göre birleştirilir, skorlama adayın parçasında yapılır; tekrar ve geliştirici sınırları
+    ile _refine_recommendations koordinatörde global sırayla uygulanır. Koordinatörde oyun deposu
+    bulunmaz; model sürümü parça süreçlerinden gelir, yerelde kurulmaz ve yayınlanmaz.
+    """
+    mode = "sharded"
+    LOCAL_ARTIFACTS = False
+
+    def __init__(self, addresses: Sequence[str] = None, authkey: str = None, config=None, model_path: str = None,
+                 db_path: str = None):
+        super().__init__(db_path=db_path, model_path=model_path, config=config)
+        addresses = addresses or [a for a in self.config.SHARD_ADDRESSES.split(',') if a.strip()]
+        if not addresses:
+            raise ShardError("Parça adresi verilmedi (SHARD_ADDRESSES)")
+        key = (authkey if authkey is not None else self.config.SHARD_AUTHKEY).encode()
+        self.clients = [ShardClient(parse_address(a), key, self.config.SHARD_TIMEOUT) for a in addresses]
+        self._fanout = ThreadPoolExecutor(max_workers=len(self.clients), thread_name_prefix='shard-fanout')
+        self._catalog_size = 0
+        self._high_rated: List[int] = []
+
+    @property
+    def catalog_size(self) -> int:
+        return self._catalog_size
+
+    def initialize(self, force_rebuild=False, load_encoder: bool = True):
+        try:
+            infos = self._fan_out('info')
+            shards = {info['shards'] for info in infos}
+            versions = {info['version'] for info in infos}
+            if shards != {len(self.clients)} or sorted(i['shard'] for i in infos) != list(range(len(self.clients))):
+                raise ShardError(f"Parça kümesi eksik veya hatalı: {[(i['shard'], i['shards']) for i in infos]}")
+            if len(versions) != 1:
+                raise ShardError(f"Parçalar farklı model sürümlerinde: {sorted(versions)}")
+            # shard_of() ile sahibi bulunabilmesi için istemciler parça numarasına göre sıralanır
+            self.clients = [c for _, c in sorted(zip((i['shard'] for i in infos), self.clients), key=lambda p: p[0])]
+            self._catalog_size = infos[0]['catalog_games']
+            self.version = versions.pop()
+            self._high_rated = self._fan_out('high_rated_count')
+            if load_encoder:
+                self._load_encoder()
+            self._models_loaded = True
+            print(f">>> [SHARD] {len(self.clients)} parça, {self._catalog_size} oyun hazır ({self.version}).")
+            return True
+        except Exception as e:
+            logger.error(f"Parçalara bağlanılamadı: {e}", exc_info=True)
+            return False
+
+    def initialize_from_artifacts(self, directory: Path, load_encoder: bool = True) -> bool:
+        raise ShardError("Koordinatör model dosyası yüklemez; sürüm parça süreçlerinden gelir")
+
+    def save_artifacts(self, directory: Path, manifest_extra: dict = None):
+        raise ShardError("Koordinatör model dosyası yazmaz; parçalar 'shards.py split' ile üretilir")
+
+    def current_version(self) -> Optional[str]:
+        """Tüm parçaların ortak sürümü; parçalar tek tek yeniden başlatılırken veya erişilemezken None"""
+        try:
+            versions = {info['version'] for info in self._fan_out('info')}
+        except (ShardError, OSError, EOFError) as e:
+            logger.warning(f"Parça sürümleri okunamadı: {e}")
+            return None
+        return versions.pop() if len(versions) == 1 else None
+
+    def close(self):
+        self._fanout.shutdown(wait=False)
+        for client in self.clients:
+            client.close()
+
+    def _fan_out(self, method: str, *args) -> list:
+        return list(self._fanout.map(lambda c: c.call(method, *args), self.clients))
+
+    def _fan_out_each(self, calls: List[Optional[tuple]]) -> list:
+        futures = [self._fanout.submit(c.call, 'score', *args) if args is not None else None
+                   for c, args in zip(self.clients, calls)]
+        return [f.result() if f is not None else ([], False) for f in futures]
+
+    def _find_game_index(self, name):
+        name = name.lower().strip()
+        vec = self.text_model.encode([name], device='cpu').astype('float32')
+        faiss.normalize_L2(vec)
+        hits = [h for h in self._fan_out('find_name', vec) if h is not None]
+        if hits:
+            score, gid = max(hits)
+            if score > 0.70:
+                return gid
+
+        clean = re.sub(r'[^\w]', '', name)
+        found = [g for g in self._fan_out('find_clean_name', clean) if g is not None]
+        return min(found) if found else None
+
+    def _find_app_id(self, app_id: int) -> Optional[int]:
+        return self.clients[shard_of(app_id, len(self.clients))].call('find_app_id', app_id)
+
+    def _resolve_app_ids(self, app_ids: List[int]) -> List[int]:
+        gids = (self._find_app_id(a) for a in app_ids)
+        return [g for g in gids if g is not None]
+
+    def _seed_data(self, gids: List[int]) -> Dict[int, Tuple[Any, np.ndarray]]:
+        seeds = {}
+        for owned in self._fan_out('seeds', gids):
+            seeds.update(owned)
+        return seeds
+
+    def get_random_high_rated_game(self):
+        # Parçalardaki aday sayılarına göre seçilir; dağılım tek düğümdeki gibi tüm katalogda eşittir
+        total = sum(self._high_rated)
+        if not total: return None
+        pick = random.randrange(total)
+        for client, count in zip(self.clients, self._high_rated):
+            if pick < count:
+                return client.call('high_rated', pick)
+            pick -= count
+
+    def explain(self, app_id: int, seed: str) -> Optional[Dict[str, Any]]:
+        """Tohumlar kendi parçalarından toplanır, aday kendi parçasında skorlanır"""
+        if not self._models_loaded: return None
+        owner = self.clients[shard_of(app_id, len(self.clients))]
+        cand = owner.call('find_app_id', int(app_id))
+        seeds = [s.strip() for s in str(seed).split('+') if s.strip()]
+        target_indices = [self._find_app_id(int(s)) if s.isdigit() else self._find_game_index(s) for s in seeds]
+        target_indices = [i for i in target_indices if i is not None]
+        if cand is None or not target_indices: return None
+
+        found = self._seed_data(list(dict.fromkeys(target_indices)))
+        seed_stores = [found[g][0] for g in target_indices]
+        seed_vectors = np.vstack([found[g][1] for g in target_indices]).astype(np.float32)
+        return owner.call('explain', seed_stores, seed_vectors, cand)
+
+    def _autocomplete(self, query, limit):
+        vec = self.text_model.encode([query], device='cpu').astype('float32')
+        faiss.normalize_L2(vec)
+        # Eşit skorlarda büyük satır numarası önce gelir (FAISS iç çarpım yığınının sırası)
+        hits = sorted((h for part in self._fan_out('name_search', vec, limit*3) for h in part),
+                      key=lambda h: (-h[0], -h[1]))[:limit*3]
+        candidates = []
+        seen_names = set()
+        for _, _, name, clean_name in hits:
+            if query in name.lower() and clean_name not in seen_names:
+                 candidates.append(name)
+                 seen_names.add(clean_name)
+        return candidates[:limit]
+
+    def _search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray, Dict[int, int]]:
+        """Parça başına en iyi k listelerini uzaklığa (eşitlikte global satıra) göre global en iyi k'ye birleştirir"""
+        parts = self._fan_out('search', queries, k)
+        D = np.concatenate([p[0] for p in parts], axis=1)
+        G = np.concatenate([p[1] for p in parts], axis=1)
+        owners = {int(g): s for s, (_, gids) in enumerate(parts) for g in np.unique(gids) if g >= 0}
+        order = np.lexsort((G, D))[:, :k]
+        return np.take_along_axis(D, order, axis=1), np.take_along_axis(G, order, axis=1), owners
+
+    def _recommend(self, target_indices: List[int], n: int, filters: dict, cache_key: str,
+                   deadline: float = None) -> Recommendations:
+        target_indices = list(dict.fromkeys(int(i) for i in target_indices))
+        if not target_indices: return Recommendations()
+        if expired(deadline): return Recommendations(partial=True)
+
+        seeds = self._seed_data(target_indices)
+        target_indices = [g for g in target_indices if g in seeds]
+        if not target_indices: return Recommendations()
+        seed_stores = [seeds[g][0] for g in target_indices]
+        seed_vectors = np.vstack([seeds[g][1] for g in target_indices]).astype(np.float32)
+        is_multi = len(target_indices) > 1
+        queries = seed_vectors.copy()
+        faiss.normalize_L2(queries)
+
+        distances, indices, owners = self._search(queries, self._search_k(len(target_indices)))
+        if is_multi:
+            candidates, distances = self._rrf_order(indices), None
+        else:
+            valid = indices[0] >= 0
+            candidates, distances = indices[0][valid], distances[0][valid]
+        owner = np.fromiter((owners[int(g)] for g in candidates), dtype=np.int32, count=len(candidates))
+        positions = np.arange(len(candidates))
+
+        budget = None if deadline is None else max(0.0, deadline - time.monotonic())
+        calls = []
+        for shard in range(len(self.clients)):
+            mask = owner == shard
+            calls.append((seed_stores, seed_vectors, candidates[mask], positions[mask],
+                          None if distances is None else distances[mask], filters, is_multi, budget) if mask.any() else None)
+        results = self._fan_out_each(calls)
+
+        selector = CandidateSelector([s.row(0) for s in seed_stores], self.config.MAX_DEVELOPER_RECOMMENDATIONS)
+        scored = sorted((r for part, _ in results for r in part), key=lambda r: r[0])
+        accepted = []
+        for _, app_id, clean_name, dev, rec in scored:
+            if selector.seen(app_id, clean_name): continue
+            if selector.accept(app_id, clean_name, dev):
+                accepted.append(rec)
+        return self._finish(accepted, n, any(partial for _, partial in results), cache_key)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(address: Tuple[str, int], authkey: bytes, process: subprocess.Popen, timeout: float):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if process.poll() is not None:
+            raise ShardError(f"Parça süreci başlatılamadı (çıkış kodu {process.returncode})")
+        try:
+            Client(address, authkey=authkey).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise ShardError(f"Parça süreci zamanında hazır olmadı: {address}")
+
+
+def verify(shards: int, queries: int, db_path: str = None, model_path: str = None) -> bool:
+    """
+    Yerel çoklu süreç düzeneği: güncel model sürümünü parçalara böler, her parçayı ayrı bir
+    süreçte başlatır ve koordinatörün sonuçlarını tek düğümlü motorla birebir karşılaştırır.
+    """
+    from manager import ModelManager
+
+    manager = ModelManager(GameRecommender, db_path=db_path, model_path=model_path)
+    if not manager.reload():
+        raise ShardError(f"Model yüklenemedi: {manager.error}")
+    single = manager.recommender
+    directories = split_artifacts(manager.model_path / single.version, shards)
+
+    authkey = secrets.token_hex(16)
+    env = dict(os.environ, SHARD_AUTHKEY=authkey)
+    addresses, processes = [], []
+    try:
+        for directory in directories:
+            port = _free_port()
+            processes.append(subprocess.Popen([sys.executable, os.path.abspath(__file__), 'serve', '--dir', str(directory),
+                                               '--host', '127.0.0.1', '--port', str(port)], env=env))
+            addresses.append(f"127.0.0.1:{port}")
+        for address, process in zip(addresses, processes):
+            _wait_for(parse_address(address), authkey.encode(), process, timeout=120)
+
+        coordinator = ShardCoordinator(addresses, authkey=authkey, model_path=str(manager.model_path))
+        if not coordinator.initialize(load_encoder=False):
+            raise ShardError("Koordinatör başlatılamadı")
+        coordinator.text_model = single.text_model
+
+        names = single.store.column('Name').tolist()
+        rng = random.Random(42)
+        rng.shuffle(names)
+        names = names[:queries]
+        app_ids = [int(a) for a in single.store.column('AppID')[:10]]
+        cases = [("rec", q, {}) for q in names]
+        cases += [("rec", f"{a} + {b}", {}) for a, b in zip(names[::2], names[1::2])][:max(1, queries // 4)]
+        cases += [("rec", q, {"genres": ["Action"], "exclude": ["Horror"], "year_min": "2005"}) for q in names[:5]]
+        cases += [("sim", a, {}) for a in app_ids]
+        cases += [("sim", app_ids[:3], {})]
+        cases += [("ac", q[:4].lower(), None) for q in names[:10]]
+        cases += [("explain", (a, q), None) for a, q in zip(app_ids, names)]
+        cases += [("explain", (app_ids[0], f"{names[0]} + {app_ids[1]}"), None)]
+
+        mismatches = 0
+        if sum(coordinator._high_rated) != single._high_rated_rows().size:
+            mismatches += 1
+            print(f">>> [SHARD] FARK (surprise): tek düğüm {single._high_rated_rows().size} aday, "
+                  f"parçalı {sum(coordinator._high_rated)} aday")
+        for kind, query, filters in cases:
+            if kind == "ac":
+                expected, actual = single.autocomplete(query), coordinator.autocomplete(query)
+            elif kind == "explain":
+                expected, actual = single.explain(*query), coordinator.explain(*query)
+            else:
+                fn = "recommend_games" if kind == "rec" else "recommend_similar"
+                expected = getattr(single, fn)(query, n=15, filters=filters, include_breakdown=True)
+                actual = getattr(coordinator, fn)(query, n=15, filters=filters, include_breakdown=True)
+            if expected != actual:
+                mismatches += 1
+                if kind == "explain":
+                    print(f">>> [SHARD] FARK (explain) {query!r}: tek düğüm {expected}, parçalı {actual}")
+                else:
+                    print(f">>> [SHARD] FARK ({kind}) {query!r}: tek düğüm {len(expected)} sonuç, parçalı {len(actual)} sonuç")
+        print(f">>> [SHARD] {len(cases)} sorgu karşılaştırıldı, {mismatches} fark ({shards} parça).")
+        coordinator.close()
+        return mismatches == 0
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    if hasattr(Config, 'initialize'):
+        Config.initialize()
+    parser = argparse.ArgumentParser(description="GameHorizon parçalı (sharded) katalog")
+    parser.add_argument('--db', default=Config.DB_PATH)
+    parser.add_argument('--models', default=Config.MODEL_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('split', help="güncel (veya verilen) model sürümünü N parçaya böl")
+    p.add_argument('--shards', type=int, required=True)
+    p.add_argument('--version')
+
+    p = sub.add_parser('serve', help="tek bir parçayı sun")
+    p.add_argument('--dir', required=True, help="parça dizini (models/<sürüm>/shards-N/<i>)")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, required=True)
+
+    p = sub.add_parser('verify', help="yerel çoklu süreçte parçalı sonuçları tek düğümle karşılaştır")
+    p.add_argument('--shards', type=int, default=3)
+    p.add_argument('--queries', type=int, default=30)
+
+    args = parser.parse_args()
+    if args.command == 'split':
+        models = Path(args.models)
+        version = args.version or (models / 'CURRENT').read_text().strip()
+        split_artifacts(models / version, args.shards)
+    elif args.command == 'serve':
+        authkey = os.getenv('SHARD_AUTHKEY', getattr(Config, 'SHARD_AUTHKEY', ''))
+        if not authkey:
+            sys.exit("SHARD_AUTHKEY tanımlanmalı (parçalar arası bağlantı doğrulaması)")
+        serve(ShardService(Path(args.dir)), args.host, args.port, authkey.encode())
+    else:
+        sys.exit(0 if verify(args.shards, args.queries, args.db, args.models) else 1)
+
+
+if __name__ == '__main__':
+    main()
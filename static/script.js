@@ -83,6 +83,7 @@
                     yourCommentPlaceholder: "Yorumunuzu buraya yazın...",
                     submitComment: "GÖNDER",
                     anonymousUser: "Anonim Oyuncu",
+                    loadMoreComments: "Daha fazla yorum",
                     didYouMean: "Bunu mu demek istediniz?",
                     randomRecsTitle: "Veritabanımızda bulamadık ama bunları sevebilirsin:"
                 },
@@ -158,6 +159,7 @@
                     yourCommentPlaceholder: "Write your comment here...",
                     submitComment: "SUBMIT",
                     anonymousUser: "Anonymous Player",
+                    loadMoreComments: "Load more comments",
                     didYouMean: "Did you mean?",
                     randomRecsTitle: "We couldn't find it, but you might like these:"
                 }
@@ -188,7 +190,7 @@
 
         setupPWA() {
             if ('serviceWorker' in navigator) {
-                navigator.serviceWorker.register('/static/service-worker.js')
+                navigator.serviceWorker.register('/static/service-worker.js', {scope: '/'})
                     .then(() => console.log('Service Worker Registered'))
                     .catch(e => console.error('Service Worker registration failed:', e));
             }
@@ -414,7 +416,7 @@
         async handleSurprise() {
             this.showLoadingState();
             try {
-                const response = await fetch('/api/surprise');
+                const response = await fetch('/api/surprise?include=breakdown');
                 if(!response.ok) throw new Error('API Error');
                 const data = await response.json();
                 document.getElementById('game_name').value = data.source.Name;
@@ -450,7 +452,7 @@
             this.destroyCharts();
 
             try {
-                const params = new URLSearchParams({ q: gameName });
+                const params = new URLSearchParams({ q: gameName, include: 'breakdown' });
                 if (genreInput.value.trim()) params.append('genres', genreInput.value.trim());
                 if (excludeInput.value.trim()) params.append('exclude', excludeInput.value.trim());
                 if (yearMin) params.append('year_min', yearMin);
@@ -514,7 +516,7 @@
             html += `</div>`; 
             
             try {
-                const randomRes = await fetch('/api/surprise');
+                const randomRes = await fetch('/api/surprise?include=breakdown');
                 const randomData = await randomRes.json();
                 
                 if(randomData.results && randomData.results.length > 0) {
@@ -954,12 +956,15 @@
             if (modal) modal.remove();
         }
 
-        async fetchComments(appId) {
+        async fetchComments(appId, cursor = null) {
             try {
-                const res = await fetch(`/api/comments?appid=${appId}`);
+                const params = new URLSearchParams({appid: appId});
+                if (cursor) params.set('cursor', cursor);
+                // Sunucu ETag döner; tarayıcı/servis çalışanı değişmeyen sayfada 304 alır
+                const res = await fetch(`/api/comments?${params}`);
                 if (!res.ok) throw new Error('Fetch failed');
                 const comments = await res.json();
-                this.renderComments(comments);
+                this.renderComments(comments, appId, res.headers.get('X-Next-Cursor'), Boolean(cursor));
             } catch (e) {
                 document.getElementById('commentsList').innerHTML = `<div class="error-message">${this.translations[this.currentLang].errorMessage}</div>`;
             }
@@ -986,16 +991,16 @@
             }
         }
 
-        renderComments(comments) {
+        renderComments(comments, appId, nextCursor = null, append = false) {
             const list = document.getElementById('commentsList');
             const trans = this.translations[this.currentLang];
             
-            if (!comments || comments.length === 0) {
+            if (!append && (!comments || comments.length === 0)) {
                 list.innerHTML = `<div class="no-comments">${trans.noComments}</div>`;
                 return;
             }
 
-            list.innerHTML = comments.map(c => `
+            const html = comments.map(c => `
                 <div class="comment-item">
                     <div class="comment-header">
                         <span class="comment-author">${trans.anonymousUser}</span>
@@ -1004,6 +1009,15 @@
                     <div class="comment-text">${this.escapeHtml(c.content)}</div>
                 </div>
             `).join('');
+
+            list.querySelector('.load-more-comments')?.remove();
+            if (append) list.insertAdjacentHTML('beforeend', html);
+            else list.innerHTML = html;
+
+            if (nextCursor) {
+                list.insertAdjacentHTML('beforeend', `<button class="load-more-comments submit-comment-btn">${trans.loadMoreComments}</button>`);
+                list.querySelector('.load-more-comments').addEventListener('click', () => this.fetchComments(appId, nextCursor));
+            }
         }
 
         debounce(func, wait) {
@@ -1,4 +1,5 @@
-const CACHE_NAME = 'gamehorizon-v1';
+const CACHE_NAME = 'gamehorizon-v2';
+const COMMENTS_CACHE = 'gamehorizon-comments';
 const urlsToCache = [
   '/',
   '/static/style.css',
@@ -19,7 +20,41 @@ self.addEventListener('install', event => {
 });
 
 
+// Yorum sayfaları: önbellekteki kopyanın ETag'i ile koşullu istek, 304 gelirse kopya döner
+function revalidateComments(request) {
+  return caches.open(COMMENTS_CACHE).then(cache =>
+    cache.match(request).then(cached => {
+      const headers = new Headers(request.headers);
+      const etag = cached && cached.headers.get('ETag');
+      if (etag) headers.set('If-None-Match', etag);
+
+      return fetch(request.url, {headers, cache: 'no-store', credentials: request.credentials})
+        .then(response => {
+          if (response.status === 304 && cached) return cached;
+          if (response.status === 200) cache.put(request, response.clone());
+          return response;
+        })
+        .catch(error => cached || Promise.reject(error));
+    })
+  );
+}
+
+
 self.addEventListener('fetch', event => {
+  const url = new URL(event.request.url);
+  if (event.request.method !== 'GET' || url.origin !== self.location.origin) return;
+
+  if (url.pathname === '/api/comments') {
+    event.respondWith(revalidateComments(event.request));
+    return;
+  }
+  // Diğer API yanıtları ve sayfa gezinmeleri önbellekten sunulmaz (ağ, çevrimdışıysa önbellek)
+  if (url.pathname.startsWith('/api/')) return;
+  if (event.request.mode === 'navigate') {
+    event.respondWith(fetch(event.request).catch(() => caches.match('/')));
+    return;
+  }
+
   event.respondWith(
     caches.match(event.request)
       .then(response => {
@@ -55,7 +90,7 @@ self.addEventListener('activate', event => {
     caches.keys().then(cacheNames => {
       return Promise.all(
         cacheNames.map(cacheName => {
-          if (cacheName !== CACHE_NAME) {
+          if (cacheName !== CACHE_NAME && cacheName !== COMMENTS_CACHE) {
             return caches.delete(cacheName);
           }
         })
@@ -0,0 +1,419 @@
+# Öneri motorunun sıcak yolunda pandas DataFrame yerine kullanılan sütunsal oyun deposunun bulunduğu store.py dosyası.
+import os
+import sys
+import json
+import sqlite3
+import logging
+import numpy as np
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Öneri motorunun katalog sorgusu; hem SQLite yüklemesi hem de sütunsal anlık görüntü bunu kullanır.
+CATALOG_QUERY = """
+    SELECT AppID, Name, CleanName, genres, developer, price, 
+           header_image, SteamURL, popularity_score, tags, short_description, 
+           release_date, average_playtime_forever 
+    FROM games 
+    WHERE popularity_score > ?
+    GROUP BY CleanName
+    ORDER BY popularity_score DESC
+"""
+
+SNAPSHOT_VERSION = "2"
+SNAPSHOT_SCHEMA = [
+    ("AppID", "int32"), ("Name", "string"), ("CleanName", "string"), ("genres", "string"),
+    ("developer", "string"), ("price", "float64"), ("header_image", "string"),
+    ("SteamURL", "string"), ("popularity_score", "float64"), ("tags", "string"),
+    ("short_description", "string"), ("release_date", "string"), ("average_playtime_forever", "int32"),
+]
+
+
+def encode_categorical(values: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Değerleri sözlük kodlamasıyla (kod dizisi + benzersiz değer tablosu) sıkıştır"""
+    table: Dict[str, int] = {}
+    codes = []
+    for v in values:
+        if v is None or (isinstance(v, float) and v != v):
+            v = ''
+        codes.append(table.setdefault(sys.intern(str(v)), len(table)))
+    dtype = np.uint16 if len(table) <= 0xFFFF else np.uint32
+    categories = np.empty(len(table), dtype=object)
+    categories[:] = list(table)
+    return np.asarray(codes, dtype=dtype), categories
+
+
+def _object_nbytes(arr: np.ndarray) -> int:
+    if arr.dtype != object:
+        return arr.nbytes
+    return arr.nbytes + sum(sys.getsizeof(v) for v in arr)
+
+
+class GameRow:
+    """Depodaki tek bir oyun için O(1) salt-okunur görünüm (pandas Series yerine)"""
+    __slots__ = ('_store', 'idx')
+
+    def __init__(self, store: 'GameStore', idx: int):
+        self._store = store
+        self.idx = int(idx)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._store.value(key, self.idx)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self._store.value(key, self.idx)
+        except KeyError:
+            return default
+
+    @property
+    def genre_list(self) -> Tuple[str, ...]:
+        return self._store.genre_lists[self._store.codes('genres')[self.idx]]
+
+    @property
+    def genre_set(self) -> frozenset:
+        return self._store.genre_sets[self._store.codes('genres')[self.idx]]
+
+    def __repr__(self):
+        return f"GameRow({self.idx}, AppID={self['AppID']}, Name={self['Name']!r})"
+
+
+class TagMatrix:
+    """
+    Salt okunur CSR etiket matrisi. Sunum yolunda yalnızca satır seçimi ve tohumlarla
+    benzerlik gerektiğinden scipy yerine doğrudan NumPy dizileriyle tutulur; diskte
+    scipy.sparse.save_npz ile aynı biçimde saklanır.
+    """
+    __slots__ = ('data', 'indices', 'indptr', 'shape')
+
+    def __init__(self, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray, shape: Tuple[int, int]):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = (int(shape[0]), int(shape[1]))
+
+    def __getitem__(self, rows) -> 'TagMatrix':
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+        starts = self.indptr[rows].astype(np.int64)
+        lengths = self.indptr[rows + 1] - starts
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        positions = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return TagMatrix(self.data[positions], self.indices[positions], indptr, (len(rows), self.shape[1]))
+
+    def toarray(self) -> np.ndarray:
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        np.add.at(dense, (rows, self.indices), self.data)
+        return dense
+
+    def dot_rows(self, rows: np.ndarray, other: 'TagMatrix') -> np.ndarray:
+        """Seçilen satırların other'ın her satırıyla iç çarpımı: (len(rows), other.shape[0])"""
+        sub = self[rows]
+        out = np.zeros((len(rows), other.shape[0]), dtype=np.float32)
+        if not len(sub.data):
+            return out
+        # Her sıfırdan farklı giriş, tohum matrisinin ilgili sütunuyla çarpılıp satır bazında toplanır
+        products = sub.data[:, None] * other.toarray().T[sub.indices]
+        nonempty = np.flatnonzero(np.diff(sub.indptr))
+        out[nonempty] = np.add.reduceat(products, sub.indptr[nonempty], axis=0)
+        return out
+
+    @classmethod
+    def vstack(cls, matrices: Sequence['TagMatrix']) -> 'TagMatrix':
+        offsets = np.cumsum([0] + [len(m.data) for m in matrices[:-1]])
+        indptr = np.concatenate([[0]] + [m.indptr[1:].astype(np.int64) + o for m, o in zip(matrices, offsets)])
+        return cls(np.concatenate([m.data for m in matrices]), np.concatenate([m.indices for m in matrices]), indptr,
+                   (sum(m.shape[0] for m in matrices), matrices[0].shape[1]))
+
+    def save(self, path: str):
+        np.savez_compressed(path, data=self.data, indices=self.indices, indptr=self.indptr,
+                            format=np.array(b'csr'), shape=np.array(self.shape))
+
+    @classmethod
+    def load(cls, path: str) -> 'TagMatrix':
+        with np.load(path) as f:
+            if f['format'].item() != b'csr':
+                raise ValueError(f"Desteklenmeyen etiket matrisi biçimi: {f['format'].item()!r}")
+            return cls(f['data'], f['indices'], f['indptr'], tuple(f['shape']))
+
+
+class TagMatrixBuilder:
+    """JSON etiket→oy sözlüklerinden, satırları L2-normalize oy ağırlıkları olan CSR matris kurar"""
+
+    def __init__(self):
+        self.vocab: Dict[str, int] = {}
+        self._indptr = [0]
+        self._indices: List[int] = []
+        self._data: List[float] = []
+
+    def add(self, values: Iterable[Any]):
+        for raw in values:
+            try:
+                parsed = json.loads(raw) if raw else {}
+            except (TypeError, ValueError):
+                parsed = {}
+            votes = {}
+            if isinstance(parsed, dict):
+                for tag, count in parsed.items():
+                    try:
+                        count = float(count)
+                    except (TypeError, ValueError):
+                        continue
+                    if count > 0:
+                        votes[self.vocab.setdefault(sys.intern(str(tag).strip()), len(self.vocab))] = count
+            norm = sum(v * v for v in votes.values()) ** 0.5
+            for col, count in votes.items():
+                self._indices.append(col)
+                self._data.append(count / norm)
+            self._indptr.append(len(self._indices))
+
+    def build(self) -> Tuple[TagMatrix, List[str]]:
+        # Satır içindeki etiketler sözlük anahtarı olduğundan tekrar eden sütun olmaz
+        matrix = TagMatrix(
+            np.asarray(self._data, dtype=np.float32), np.asarray(self._indices, dtype=np.int32),
+            np.asarray(self._indptr, dtype=np.int64), (len(self._indptr) - 1, len(self.vocab)),
+        )
+        return matrix, list(self.vocab)
+
+
+class GameStore:
+    """
+    Tipli NumPy sütunları ve sözlük kodlu kategorik sütunlardan oluşan oyun deposu.
+    Büyük metinler (detailed_description, short_description) burada tutulmaz; gerektiğinde SQLite'tan
+    okunur. Etiketler yalnızca ayrıştırılmış halde, seyrek (CSR) oy ağırlığı matrisi olarak tutulur.
+    """
+
+    # Varsayılan kalıba uyan URL'ler boş kod olarak saklanır ve okunurken AppID'den üretilir.
+    URL_TEMPLATES = {
+        'header_image': "https://cdn.cloudflare.steamstatic.com/steam/apps/{}/header.jpg",
+        'SteamURL': "https://store.steampowered.com/app/{}",
+    }
+
+    def __init__(self, columns: Dict[str, np.ndarray], categoricals: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                 tags: Optional[Tuple[TagMatrix, List[str]]] = None):
+        self._columns = columns
+        self._categoricals = categoricals
+        self._size = len(columns['AppID'])
+        self.tag_matrix, self.tag_vocab = tags if tags is not None else (None, [])
+
+        genre_values = categoricals['genres'][1]
+        self.genre_lists = [tuple(g.strip() for g in v.split(',') if g.strip()) for v in genre_values]
+        self.genre_sets = [frozenset(g) for g in self.genre_lists]
+
+        self._clean_name_lookup: Dict[str, int] = {}
+        for i, clean in enumerate(columns['CleanName']):
+            self._clean_name_lookup.setdefault(clean, i)
+        self._app_id_lookup: Dict[int, int] = {int(a): i for i, a in enumerate(columns['AppID'])}
+
+    @classmethod
+    def from_columns(cls, numeric: Dict[str, Any], text: Dict[str, Any], categorical: Dict[str, Any],
+                     tags: Optional[Tuple[TagMatrix, List[str]]] = None) -> 'GameStore':
+        columns = {}
+        for name, (values, dtype) in numeric.items():
+            columns[name] = np.ascontiguousarray(values, dtype=dtype)
+        for name, values in text.items():
+            arr = np.empty(len(values), dtype=object)
+            arr[:] = [str(v) if v is not None else '' for v in values]
+            columns[name] = arr
+
+        app_ids = columns['AppID']
+        categoricals = {}
+        for name, values in categorical.items():
+            template = cls.URL_TEMPLATES.get(name)
+            if template:
+                values = ['' if v == template.format(a) else v for v, a in zip(values, app_ids)]
+            categoricals[name] = encode_categorical(values)
+        return cls(columns, categoricals, tags)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def row(self, idx: int) -> GameRow:
+        return GameRow(self, idx)
+
+    def column(self, name: str) -> np.ndarray:
+        if name in self._columns:
+            return self._columns[name]
+        codes, categories = self._categoricals[name]
+        return categories[codes]
+
+    def codes(self, name: str) -> np.ndarray:
+        return self._categoricals[name][0]
+
+    def value(self, name: str, idx: int) -> Any:
+        col = self._columns.get(name)
+        if col is not None:
+            v = col[idx]
+            return v.item() if isinstance(v, np.generic) else v
+        cat = self._categoricals.get(name)
+        if cat is None:
+            raise KeyError(name)
+        v = cat[1][cat[0][idx]]
+        if not v and name in self.URL_TEMPLATES:
+            return self.URL_TEMPLATES[name].format(int(self._columns['AppID'][idx]))
+        return v
+
+    def take(self, rows: Iterable[int], tag_vocab: bool = True) -> 'GameStore':
+        """Seçilen satırlardan yeni bir depo (katalog parçası veya tek satırlık tohum); kategori tabloları küçültülür"""
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = {name: col[rows] for name, col in self._columns.items()}
+        categoricals = {}
+        for name, (codes, categories) in self._categoricals.items():
+            used, inverse = np.unique(codes[rows], return_inverse=True)
+            categoricals[name] = (inverse.astype(codes.dtype), categories[used])
+        tags = None
+        if self.tag_matrix is not None:
+            tags = (self.tag_matrix[rows], self.tag_vocab if tag_vocab else [])
+        return GameStore(columns, categoricals, tags)
+
+    def find_clean_name(self, clean_name: str) -> Optional[int]:
+        return self._clean_name_lookup.get(clean_name)
+
+    def find_app_id(self, app_id: int) -> Optional[int]:
+        return self._app_id_lookup.get(int(app_id))
+
+    def save(self, directory: str):
+        """Depoyu dizine yaz: sayısal sütunlar/kodlar .npz, metin ve kategori tabloları JSON"""
+        os.makedirs(directory, exist_ok=True)
+        arrays = {f"col__{n}": c for n, c in self._columns.items() if c.dtype != object}
+        arrays.update({f"codes__{n}": codes for n, (codes, _) in self._categoricals.items()})
+        np.savez(os.path.join(directory, "store.npz"), **arrays)
+        strings = {
+            "text": {n: c.tolist() for n, c in self._columns.items() if c.dtype == object},
+            "categories": {n: cats.tolist() for n, (_, cats) in self._categoricals.items()},
+            "tag_vocab": self.tag_vocab,
+        }
+        if self.tag_matrix is not None:
+            self.tag_matrix.save(os.path.join(directory, "store_tags.npz"))
+        with open(os.path.join(directory, "store_strings.json"), "w", encoding="utf-8") as f:
+            json.dump(strings, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str) -> 'GameStore':
+        with np.load(os.path.join(directory, "store.npz")) as data:
+            arrays = {k: data[k] for k in data.files}
+        with open(os.path.join(directory, "store_strings.json"), encoding="utf-8") as f:
+            strings = json.load(f)
+
+        columns = {k[len("col__"):]: v for k, v in arrays.items() if k.startswith("col__")}
+        for name, values in strings["text"].items():
+            arr = np.empty(len(values), dtype=object)
+            arr[:] = values
+            columns[name] = arr
+        categoricals = {}
+        for name, values in strings["categories"].items():
+            cats = np.empty(len(values), dtype=object)
+            cats[:] = [sys.intern(v) for v in values]
+            categoricals[name] = (arrays[f"codes__{name}"], cats)
+        tags = None
+        tags_path = os.path.join(directory, "store_tags.npz")
+        if os.path.exists(tags_path):
+            tags = (TagMatrix.load(tags_path), strings.get("tag_vocab", []))
+        return cls(columns, categoricals, tags)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Sütun başına yaklaşık bellek kullanımı (byte)"""
+        usage = {name: _object_nbytes(col) for name, col in self._columns.items()}
+        for name, (codes, categories) in self._categoricals.items():
+            usage[name] = codes.nbytes + _object_nbytes(categories)
+        if self.tag_matrix is not None:
+            m = self.tag_matrix
+            usage['tags'] = m.data.nbytes + m.indices.nbytes + m.indptr.nbytes
+        return usage
+
+
+def catalog_fingerprint(conn: sqlite3.Connection) -> str:
+    """games tablosunun içeriği değiştiğinde değişen ucuz bir parmak izi"""
+    count, last_ts, appid_sum = conn.execute(
+        "SELECT COUNT(*), MAX(processed_timestamp), TOTAL(AppID) FROM games"
+    ).fetchone()
+    return f"{count}:{last_ts}:{int(appid_sum)}"
+
+
+def _pyarrow():
+    """pyarrow yalnızca anlık görüntü yazılırken/okunurken yüklenir; sunum süreçleri içe aktarmaz"""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+    except ImportError:
+        return None
+    return pa
+
+
+def _snapshot_array(pa, values, arrow_type: str):
+    if arrow_type == "string":
+        return pa.array(values, type=pa.string())
+    dtype = np.dtype(arrow_type)
+    return pa.array(np.asarray([v if v is not None else 0 for v in values], dtype=dtype))
+
+
+def write_catalog_snapshot(db_path: str, snapshot_path: str, min_popularity: float, chunk_size: int = 50000) -> bool:
+    """Katalog sorgusunun sonucunu Arrow IPC dosyası olarak yaz (geçici dosya + atomik rename)"""
+    pa = _pyarrow()
+    if pa is None:
+        logger.warning("pyarrow kurulu değil, katalog anlık görüntüsü atlanıyor.")
+        return False
+
+    conn = sqlite3.connect(db_path)
+    try:
+        fingerprint = catalog_fingerprint(conn)
+        schema = pa.schema(
+            [(name, pa.type_for_alias(t)) for name, t in SNAPSHOT_SCHEMA],
+            metadata={
+                "version": SNAPSHOT_VERSION,
+                "fingerprint": fingerprint,
+                "min_popularity": repr(float(min_popularity)),
+            },
+        )
+        tmp_path = f"{snapshot_path}.tmp"
+        cursor = conn.execute(CATALOG_QUERY, (min_popularity,))
+        rows_written = 0
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                columns = list(zip(*rows))
+                arrays = [_snapshot_array(pa, columns[i], t) for i, (_, t) in enumerate(SNAPSHOT_SCHEMA)]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                rows_written += len(rows)
+        os.replace(tmp_path, snapshot_path)
+    finally:
+        conn.close()
+
+    logger.info(f"Katalog anlık görüntüsü yazıldı: {snapshot_path} ({rows_written} oyun)")
+    return True
+
+
+def read_catalog_snapshot(snapshot_path: str, db_path: str, min_popularity: float):
+    """
+    Anlık görüntü mevcut ve güncelse bellek eşlemeli (zero-copy) bir Arrow tablosu döndür.
+    Eksik, eski veya farklı filtreyle yazılmışsa None döner ve çağıran SQLite'a düşer.
+    """
+    if not snapshot_path or not os.path.exists(snapshot_path):
+        return None
+    pa = _pyarrow()
+    if pa is None:
+        return None
+    try:
+        source = pa.memory_map(snapshot_path, "r")
+        reader = pa.ipc.open_file(source)
+        metadata = {k.decode(): v.decode() for k, v in (reader.schema.metadata or {}).items()}
+        if metadata.get("version") != SNAPSHOT_VERSION:
+            return None
+        if metadata.get("min_popularity") != repr(float(min_popularity)):
+            return None
+
+        conn = sqlite3.connect(db_path)
+        try:
+            if metadata.get("fingerprint") != catalog_fingerprint(conn):
+                logger.info("Katalog anlık görüntüsü güncel değil, SQLite kullanılacak.")
+                return None
+        finally:
+            conn.close()
+
+        return reader.read_all()
+    except Exception as e:
+        logger.warning(f"Katalog anlık görüntüsü okunamadı: {e}")
+        return None
@@ -0,0 +1,79 @@
+# Testlerde kullanılan sentetik katalog ve deterministik kodlayıcı; gerçek kodlayıcı indirilmez.
+import json
+import random
+import sqlite3
+import hashlib
+import numpy as np
+import pytest
+
+import config
+import model
+from database import create_database
+
+GENRES = ["Action", "Adventure", "RPG", "Strategy", "Simulation", "Casual", "Indie", "Puzzle", "Horror", "Platformer"]
+TAGS = ["Multiplayer", "Open World", "Survival", "Turn-Based", "Pixel Graphics", "Co-op", "Roguelike", "Sandbox"]
+WORDS = ["dragon", "star", "tower", "shadow", "farm", "quest", "dungeon", "space", "city", "zombie",
+         "fire", "ice", "war", "hero", "souls", "pixel", "defense", "island", "robot", "castle"]
+DEVELOPERS = ["Nintendo", "Small Studio", "Valve", "Indie Team", "Big Games", "Solo Dev"]
+
+
+class FakeEncoder:
+    """Karakter üçlülerinin özetinden gömme üretir; aynı metin her zaman aynı vektörü verir"""
+    dim = 64
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, **kwargs):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            text = f"  {str(text).lower()}  "
+            for j in range(len(text) - 2):
+                out[i, int(hashlib.md5(text[j:j + 3].encode()).hexdigest()[:8], 16) % self.dim] += 1.0
+        return out
+
+
+def build_catalog(path: str, games: int, seed: int = 7):
+    rng = random.Random(seed)
+    create_database(path)
+    rows = []
+    for app_id in range(1000, 1000 + games):
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        name = f"{' '.join(w.title() for w in words)} {app_id - 999}"
+        tags = {t: rng.randint(10, 500) for t in rng.sample(TAGS, rng.randint(0, 3))}
+        rows.append((app_id, name, name.lower(), ", ".join(rng.sample(GENRES, rng.randint(1, 3))),
+                     rng.choice(DEVELOPERS), rng.choice([0.0, 4.99, 9.99, 19.99, 39.99]),
+                     round(rng.uniform(10, 99), 2), json.dumps(tags),
+                     " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))),
+                     f"{rng.randint(2000, 2024)}-01-01", rng.randint(0, 2000)))
+    with sqlite3.connect(path) as conn:
+        conn.executemany("""
+            INSERT INTO games (AppID, Name, CleanName, genres, developer, price, popularity_score, tags,
+                               short_description, release_date, average_playtime_forever)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_encoder(tmp_path_factory):
+    cache = tmp_path_factory.mktemp("embedding_cache")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(config.Config, "EMBEDDING_CACHE_PATH", str(cache))
+        mp.setattr(config.Config, "CATALOG_SNAPSHOT_PATH", str(cache / "games.arrow"))
+        mp.setitem(model._encoders, config.Config.ENCODER_MODEL, FakeEncoder())
+        yield
+
+
+@pytest.fixture(scope="session")
+def catalog(tmp_path_factory) -> str:
+    path = str(tmp_path_factory.mktemp("catalog") / "games.db")
+    build_catalog(path, games=1200)
+    return path
+
+
+@pytest.fixture(scope="session")
+def published(catalog, tmp_path_factory):
+    """Sentetik katalogdan kurulup yayınlanmış bir model sürümü (ModelManager)"""
+    from manager import ModelManager
+    manager = ModelManager(model.GameRecommender, db_path=catalog, model_path=str(tmp_path_factory.mktemp("models")))
+    assert manager.reload(), manager.error
+    return manager
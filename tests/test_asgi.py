@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+
+import app as flask_app
+import asgi
+
+
+def request(path, method='GET', query='', body=b''):
+    return asgi.Request({'method': method, 'path': path, 'query_string': query.encode(),
+                         'headers': [], 'client': ('127.0.0.1', 1)}, body)
+
+
+@pytest.fixture
+def engine(published, monkeypatch):
+    monkeypatch.setattr(asgi, 'active_recommender', lambda: published.recommender)
+    return published.recommender
+
+
+def test_explain_is_admission_controlled(engine, monkeypatch):
+    app_id = int(engine.store.value('AppID', 0))
+    seed = engine.store.value('Name', 1)
+    req = request('/api/explain', query=f"appid={app_id}&seed={seed}")
+
+    rejected = asgi.admission.rejected
+    monkeypatch.setattr(asgi.app, '_cpu_inflight', asgi.admission.capacity)
+    busy = asyncio.run(asgi.app.explain(req))
+    assert busy.status == 503 and busy.headers['retry-after']
+    assert asgi.admission.rejected == rejected + 1
+
+    monkeypatch.setattr(asgi.app, '_cpu_inflight', 0)
+    response = asyncio.run(asgi.app.explain(req))
+    assert response.status == 200
+    assert json.loads(response.body) == {**engine.explain(app_id, seed), "mode": "full"}
+
+
+def test_autocomplete_sheds_load_when_lookup_pool_is_busy(engine, monkeypatch):
+    monkeypatch.setattr(asgi.app, '_lookup_inflight', asgi.LOOKUP_THREADS)
+    busy = asyncio.run(asgi.app.autocomplete(request('/api/autocomplete', query="q=zzqx")))
+    assert json.loads(busy.body) == []
+
+    monkeypatch.setattr(asgi.app, '_lookup_inflight', 0)
+    prefix = engine.store.value('Name', 0)[:4]
+    response = asyncio.run(asgi.app.autocomplete(request('/api/autocomplete', query=f"q={prefix}")))
+    assert json.loads(response.body) == engine.autocomplete(prefix)
+    assert asgi.app._lookup_inflight == 0
+
+
+@pytest.mark.parametrize("appid", ["abc", -3, 0, 1.5])
+def test_post_comment_rejects_invalid_appid(appid, monkeypatch):
+    def add(*args, **kwargs):
+        raise AssertionError("geçersiz appid kuyruğa alınmamalı")
+
+    monkeypatch.setattr(asgi.comment_store, 'add', add)
+    body = json.dumps({"appid": appid, "content": "merhaba"}).encode()
+    response = asyncio.run(asgi.app.post_comment(request('/api/comments', 'POST', body=body)))
+    assert response.status == 400
+
+    response = flask_app.app.test_client().post('/api/comments', json={"appid": appid, "content": "merhaba"})
+    assert response.status_code == 400
@@ -0,0 +1,162 @@
+import sqlite3
+import threading
+
+import pytest
+
+import comments
+from comments import CommentStore, decode_cursor, parse_appid
+from concurrency import QueueFull
+from database import create_database
+from dbpool import ConnectionPool
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "games.db")
+    create_database(path)
+    pool = ConnectionPool(path)
+    yield path, pool
+    pool.close()
+
+
+@pytest.fixture
+def store(db):
+    store = CommentStore(db[1])
+    yield store
+    store.close()
+
+
+def insert(path, rows):
+    with sqlite3.connect(path) as conn:
+        conn.executemany("INSERT INTO comments (appid, content, created_at) VALUES (?, ?, ?)", rows)
+
+
+def test_parse_appid():
+    assert parse_appid(10) == 10 and parse_appid(" 730 ") == 730
+    for value in ("abc", "-1", "0", 0, -5, 1.5, True, None, "1e3", [1]):
+        assert parse_appid(value) is None
+
+
+def test_keyset_pages_cover_every_comment_once(db, store):
+    # Aynı saniyede yazılmış yorumlar sayfa sınırında id ile ayrılır
+    insert(db[0], [(10, f"c{i}", f"2024-01-01 00:00:0{i // 3}") for i in range(10)] + [(11, "other", "2024-01-02 00:00:00")])
+    seen, cursor = [], None
+    while True:
+        page = store.get_page("10", cursor, limit=3)
+        seen += [c['content'] for c in page.comments]
+        cursor = page.headers.get('X-Next-Cursor')
+        if cursor is None:
+            break
+        assert decode_cursor(cursor)
+    assert seen == [f"c{i}" for i in (9, 8, 7, 6, 5, 4, 3, 2, 1, 0)]
+    with pytest.raises(ValueError):
+        store.get_page("10", "not-a-cursor")
+
+
+def test_etag_changes_with_each_write(store):
+    first = store.get_page("10")
+    assert store.get_page("10", if_none_match=first.headers['ETag']).not_modified
+    store.add(10, "merhaba")
+    store.flush()
+    changed = store.get_page("10", if_none_match=first.headers['ETag'])
+    assert not changed.not_modified
+    assert [c['content'] for c in changed.comments] == ["merhaba"]
+    assert store.get_page("10", if_none_match=changed.headers['ETag']).not_modified
+
+
+def test_last_modified_only_after_its_second_has_passed(db, store, monkeypatch):
+    insert(db[0], [(10, "eski", "2024-01-01 00:00:00")])
+    store.add(10, "yeni")
+    store.flush()
+    (row,) = db[1].query(comments.COUNTER, (10,))
+    monkeypatch.setattr(comments, 'utc_timestamp', lambda: row['updated_at'])
+    assert 'Last-Modified' not in store.get_page("10").headers
+
+    monkeypatch.setattr(comments, 'utc_timestamp', lambda: "9999-01-01 00:00:00")
+    last_modified = store.get_page("10").headers['Last-Modified']
+    assert store.get_page("10", if_modified_since=last_modified).not_modified
+    assert not store.get_page("10", if_modified_since="Mon, 01 Jan 2024 00:00:00 GMT").not_modified
+
+
+def test_non_integer_appids_do_not_break_schema_or_writes(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("""CREATE TABLE comments (id INTEGER PRIMARY KEY AUTOINCREMENT, appid INTEGER NOT NULL,
+                        content TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
+    insert(path, [("abc", "eski metin", "2024-01-01 00:00:00"), (10, "eski", "2024-01-01 00:00:00")])
+
+    pool = ConnectionPool(path)
+    store = CommentStore(pool)
+    try:
+        assert [c['content'] for c in store.get_page("10").comments] == ["eski"]
+        assert [c['content'] for c in store.get_page("abc").comments] == ["eski metin"]
+        assert store._schema_ready
+        store.add("xyz", "yazılır")
+        store.add(10, "sayılır")
+        store.flush()
+        assert store.writer.stats["failed"] == 0
+        assert [c['content'] for c in store.get_page("xyz").comments] == ["yazılır"]
+        assert pool.query(comments.COUNTER, (10,))[0]['version'] == 2
+    finally:
+        store.close()
+        pool.close()
+
+
+def count(pool, appid):
+    return pool.query("SELECT COUNT(*) AS n FROM comments WHERE appid = ?", (appid,))[0]['n']
+
+
+def test_full_queue_rejects_and_close_flushes_pending(db, monkeypatch):
+    store = CommentStore(db[1], queue_size=2)
+    writing, release = threading.Event(), threading.Event()
+    write = store.writer._write
+
+    def slow_write(batch):
+        writing.set()
+        release.wait(10)
+        write(batch)
+
+    monkeypatch.setattr(store.writer, '_write', slow_write)
+    try:
+        store.add(10, "ilk")
+        assert writing.wait(10)
+        store.add(10, "ikinci")
+        store.add(10, "üçüncü")
+        with pytest.raises(QueueFull):
+            store.add(10, "dördüncü")
+        assert store.metrics()["rejected"] == 1
+        # Gönderen, yazılmamış yorumlarını ilk sayfada görür
+        assert len(store.get_page("10", client=None).comments) == 3
+    finally:
+        release.set()
+        store.close()
+    assert count(db[1], 10) == 3
+    assert store.metrics()["pending"] == 0
+    with pytest.raises(QueueFull):
+        store.add(10, "kapandıktan sonra")
+
+
+def test_writer_survives_unexpected_errors(db, monkeypatch):
+    store = CommentStore(db[1])
+    store.get_page("10")
+    writer = store.pool.writer
+    calls = []
+
+    def flaky_writer():
+        # İlk yorumun hem grup hem de tek tek yazımı düşer
+        calls.append(1)
+        if len(calls) <= 2:
+            raise RuntimeError("beklenmeyen")
+        return writer()
+
+    monkeypatch.setattr(store.pool, 'writer', flaky_writer)
+    try:
+        store.add(10, "düşer")
+        store.flush()
+        store.add(10, "yazılır")
+        store.flush()
+        assert store._thread.is_alive()
+    finally:
+        store.close()
+    assert count(db[1], 10) == 1
+    assert store.writer.stats["committed"] == 1 and store.writer.stats["failed"] == 1
@@ -0,0 +1,16 @@
+from pathlib import Path
+
+import pytest
+
+from benchmark import TRAINING_MODULES, import_profile
+
+BUDGET_MS = 500
+
+
+@pytest.mark.parametrize("module", ["app", "asgi"])
+def test_serving_import_is_lean(module, monkeypatch):
+    monkeypatch.chdir(Path(__file__).resolve().parent.parent)
+    import_profile(module)  # .pyc derlemesi ölçüme girmesin
+    total, cumulative = min((import_profile(module) for _ in range(3)), key=lambda r: r[0])
+    assert not sorted({name.split('.')[0] for name in cumulative} & set(TRAINING_MODULES))
+    assert total / 1000 <= BUDGET_MS, f"{module}: {total / 1000:.0f} ms"
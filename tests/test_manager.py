@@ -0,0 +1,73 @@
+import sqlite3
+import threading
+
+import model
+from manager import ModelManager
+
+
+def test_hot_swap_keeps_serving(catalog, tmp_path):
+    swaps = []
+    manager = ModelManager(model.GameRecommender, db_path=catalog, model_path=str(tmp_path), on_swap=swaps.append)
+    assert manager.reload(), manager.error
+    first = manager.recommender
+    seed = first.store.value('Name', 0)
+    expected = first.recommend_games(seed, n=10)
+    assert expected
+
+    errors, served = [], []
+    stop = threading.Event()
+
+    def traffic():
+        while not stop.is_set():
+            try:
+                served.append(len(manager.recommender.recommend_games(seed, n=10)))
+            except Exception as e:
+                errors.append(e)
+
+    thread = threading.Thread(target=traffic)
+    thread.start()
+    try:
+        assert manager.reload(rebuild=True), manager.error
+    finally:
+        stop.set()
+        thread.join()
+
+    second = manager.recommender
+    assert not errors
+    assert served and all(served)
+    assert second is not first and second.version != first.version
+    assert swaps == [first, second]
+    # Süren istekler ellerindeki eski modelle tamamlanabilir
+    assert first.recommend_games(seed, n=10) == expected
+    assert (tmp_path / 'CURRENT').read_text() == second.version
+
+
+def test_publish_versions_are_unique_within_a_second(published, tmp_path, monkeypatch):
+    monkeypatch.setattr('manager.time.strftime', lambda fmt: "20240101-000000")
+    manager = ModelManager(model.GameRecommender, db_path=published.db_path, model_path=str(tmp_path))
+    versions = set()
+    for _ in range(2):
+        candidate = published.recommender
+        original = candidate.version
+        try:
+            manager._publish(candidate)
+            assert (tmp_path / candidate.version / 'manifest.json').exists()
+            versions.add(candidate.version)
+        finally:
+            candidate.version = original
+    assert len(versions) == 2
+
+
+def test_comment_writes_do_not_trigger_catalog_scan(catalog, tmp_path):
+    manager = ModelManager(model.GameRecommender, db_path=catalog, model_path=str(tmp_path))
+    before = manager._db_mtime()
+    conn = sqlite3.connect(catalog)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("INSERT INTO comments (appid, content) VALUES (1000, 'test')")
+        conn.commit()
+        assert manager._db_mtime() == before
+    finally:
+        conn.execute("DELETE FROM comments")
+        conn.commit()
+        conn.close()
@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+
+class Interrupted(BaseException):
+    pass
+
+
+def wait_until(predicate, timeout=30.0):
+    end = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < end, "zaman aşımı"
+        time.sleep(0.01)
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_surprise_refill_recovers_after_failed_run(published, monkeypatch):
+    rec = published.recommender
+    wait_until(lambda: not rec._surprise_refilling)
+    rec._surprise_pool.clear()
+
+    def fail(*args, **kwargs):
+        raise Interrupted()
+
+    monkeypatch.setattr(rec, "recommend_similar", fail)
+    rec._refill_surprise_pool()
+    wait_until(lambda: not rec._surprise_refilling)
+    assert not rec._surprise_pool
+
+    monkeypatch.undo()
+    rec._refill_surprise_pool()
+    wait_until(lambda: len(rec._surprise_pool) >= rec.config.SURPRISE_POOL_SIZE)
+
+
+def test_surprise_refill_flag_cleared_when_thread_cannot_start(published, monkeypatch):
+    rec = published.recommender
+    wait_until(lambda: not rec._surprise_refilling)
+    rec._surprise_pool.clear()
+
+    def no_threads(self):
+        raise RuntimeError("can't start new thread")
+
+    monkeypatch.setattr("model.threading.Thread.start", no_threads)
+    with pytest.raises(RuntimeError):
+        rec._refill_surprise_pool()
+    assert not rec._surprise_refilling
@@ -0,0 +1,63 @@
+import random
+import threading
+import time
+from multiprocessing.connection import Client
+
+import pytest
+
+import shards
+
+AUTHKEY = "test-shard-key"
+
+
+def _start(directory) -> str:
+    port = shards._free_port()
+    service = shards.ShardService(directory)
+    threading.Thread(target=shards.serve, args=(service, '127.0.0.1', port, AUTHKEY.encode()), daemon=True).start()
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            Client(('127.0.0.1', port), authkey=AUTHKEY.encode()).close()
+            return f"127.0.0.1:{port}"
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+@pytest.fixture(scope="module")
+def coordinator(published, tmp_path_factory):
+    single = published.recommender
+    directories = shards.split_artifacts(published.model_path / single.version, 2,
+                                         output=tmp_path_factory.mktemp("shards"))
+    coordinator = shards.ShardCoordinator([_start(d) for d in directories], authkey=AUTHKEY,
+                                          model_path=str(published.model_path))
+    assert coordinator.initialize(load_encoder=False)
+    coordinator.text_model = single.text_model
+    yield coordinator
+    coordinator.close()
+
+
+def test_coordinator_matches_single_node(published, coordinator):
+    single = published.recommender
+    names = single.store.column('Name').tolist()
+    random.Random(42).shuffle(names)
+    app_ids = [int(a) for a in single.store.column('AppID')[:5]]
+
+    assert coordinator.version == single.version
+    assert coordinator.catalog_size == len(single.store)
+    assert sum(coordinator._high_rated) == single._high_rated_rows().size
+
+    cases = [("recommend_games", q, {}) for q in names[:10]]
+    cases += [("recommend_games", f"{names[0]} + {names[1]}", {})]
+    cases += [("recommend_games", q, {"genres": ["Action"], "exclude": ["Horror"], "year_min": "2005"})
+              for q in names[:3]]
+    cases += [("recommend_similar", a, {}) for a in app_ids]
+    cases += [("recommend_similar", app_ids[:3], {})]
+    for fn, query, filters in cases:
+        expected = getattr(single, fn)(query, n=15, filters=filters, include_breakdown=True)
+        assert expected
+        assert getattr(coordinator, fn)(query, n=15, filters=filters, include_breakdown=True) == expected, (fn, query)
+
+    for app_id, query in zip(app_ids, names):
+        assert coordinator.explain(app_id, query) == single.explain(app_id, query)
@@ -0,0 +1,201 @@
+# Üretimdeki sık sorguların kayan günlüğünün tutulduğu ve model yüklenince/değişince önbelleğin bu günlükten ısıtıldığı warmup.py dosyası.
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config import Config
+except ImportError:
+    class Config:
+        WARMUP_LOG_PATH = "query_log.json"
+        WARMUP_LOG_SIZE = 1000
+        WARMUP_HALF_LIFE_HOURS = 24
+        WARMUP_FLUSH_SECONDS = 60
+        WARMUP_TOP_K = 200
+        WARMUP_CPU_FRACTION = 0.5
+        WARMUP_MAX_SECONDS = 120
+
+KINDS = ("rec", "sim", "ac")
+FIELDS = ("kind", "args", "n", "filters")
+
+
+class QueryLog:
+    """
+    Kanonik sorguların (tohumlar + filtreler, AppID'ler, otomatik tamamlama önekleri) kayan sayaç
+    günlüğü. Sayaçlar bellekte toplanır ve CacheWarmer'ın arka plan iş parçacığında
+    WARMUP_FLUSH_SECONDS'ta bir diskteki günlükle birleştirilir; diskteki sayaçlar WARMUP_HALF_LIFE_HOURS yarılanma süresiyle sönümlenir ve
+    yalnızca en sık WARMUP_LOG_SIZE sorgu tutulur. Birden fazla süreç aynı dosyayı paylaşabilir.
+    """
+
+    def __init__(self, path: str = None, size: int = None, half_life_hours: float = None,
+                 flush_seconds: float = None):
+        self.path = path or Config.WARMUP_LOG_PATH
+        self.size = size or Config.WARMUP_LOG_SIZE
+        self.half_life = (half_life_hours or Config.WARMUP_HALF_LIFE_HOURS) * 3600
+        self.flush_seconds = Config.WARMUP_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self._counts: Dict[str, float] = {}
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def record(self, kind: str, args: list, n: int = None, filters: dict = None):
+        """
+        Bir isteği sayar; kind: rec (isim tohumları), sim (AppID'ler), ac (önek). filters kanonik
+        biçimde verilmeli (aynı sorgu tek kayıtta toplanır). İstek iş parçacığında disk erişimi yapılmaz.
+        """
+        entry = {"kind": kind, "args": args, "n": n, "filters": filters or {}}
+        key = self._key(entry)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0.0) + 1.0
+            self._entries.setdefault(key, entry)
+
+    @staticmethod
+    def _key(entry: dict) -> str:
+        return json.dumps(entry, sort_keys=True, ensure_ascii=False)
+
+    def _merge(self, counts: Dict[str, float], entries: Dict[str, dict], now: float) -> Dict[str, dict]:
+        """Diskteki günlüğü (yarılanma süresine göre sönümlenmiş) bellekteki sayaçlarla birleştirir"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        factor = 0.5 ** (max(0.0, now - data.get("updated_at", now)) / self.half_life)
+        merged: Dict[str, dict] = {}
+        for item in data.get("entries", []):
+            if item.get("kind") in KINDS:
+                entry = {k: item.get(k) for k in FIELDS}
+                merged[self._key(entry)] = {**entry, "count": float(item.get("count", 0)) * factor}
+        for key, count in counts.items():
+            merged.setdefault(key, {**entries[key], "count": 0.0})["count"] += count
+        return merged
+
+    def flush(self):
+        """Bellekteki sayaçları disk günlüğüyle birleştirip en sık WARMUP_LOG_SIZE sorguyu atomik olarak yazar"""
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                counts, self._counts = self._counts, {}
+                entries, self._entries = self._entries, {}
+            if not counts:
+                return
+            now = time.time()
+            merged = self._merge(counts, entries, now)
+            top = sorted(merged.values(), key=lambda e: e["count"], reverse=True)[:self.size]
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"updated_at": now, "entries": top}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Sorgu günlüğü yazılamadı: {e}")
+        finally:
+            self._flush_lock.release()
+
+    def top(self, k: int) -> List[dict]:
+        """Disktekiler ve henüz yazılmamış sayaçlarla birlikte en sık k sorgu"""
+        with self._lock:
+            counts, entries = dict(self._counts), dict(self._entries)
+        merged = self._merge(counts, entries, time.time())
+        return sorted(merged.values(), key=lambda e: e["count"], reverse=True)[:k]
+
+
+class CacheWarmer:
+    """
+    Model yüklendiğinde veya değiştiğinde günlükteki en sık WARMUP_TOP_K sorguyu arka planda
+    yeni modelde çalıştırıp öneri ve otomatik tamamlama önbelleğini doldurur. Her sorgudan sonra
+    harcanan süreyle orantılı beklenerek iş parçacığının CPU payı WARMUP_CPU_FRACTION ile
+    sınırlanır; yeni bir model geldiğinde süren ısıtma iptal edilir. Isıtma bittikten sonra aynı
+    iş parçacığı bir sonraki model değişimine kadar sorgu günlüğünü periyodik olarak diske yazar.
+    """
+
+    def __init__(self, log: QueryLog, top_k: int = None, cpu_fraction: float = None, max_seconds: float = None):
+        self.log = log
+        self.top_k = Config.WARMUP_TOP_K if top_k is None else top_k
+        self.cpu_fraction = min(1.0, max(0.01, cpu_fraction or Config.WARMUP_CPU_FRACTION))
+        self.max_seconds = max_seconds or Config.WARMUP_MAX_SECONDS
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._progress: Dict[str, Any] = {"state": "idle"}
+
+    def start(self, recommender):
+        with self._lock:
+            self._cancel.set()
+            self._cancel = cancel = threading.Event()
+            self._progress = {"state": "running", "version": getattr(recommender, "version", None),
+                              "total": 0, "done": 0, "failed": 0, "started_at": time.time(), "elapsed_s": 0.0}
+            self._thread = threading.Thread(target=self._run, args=(recommender, cancel),
+                                            name="cache-warmup", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._cancel.set()
+
+    def _update(self, cancel: threading.Event, **values):
+        with self._lock:
+            # İptal edilmiş (eski modele ait) ısıtma yeni modelin ilerlemesini ezmesin
+            if cancel is self._cancel:
+                self._progress.update(values)
+
+    def _run(self, recommender, cancel: threading.Event):
+        self._warm(recommender, cancel)
+        while not cancel.wait(max(1.0, self.log.flush_seconds)):
+            self.log.flush()
+
+    def _warm(self, recommender, cancel: threading.Event):
+        started = time.monotonic()
+        try:
+            entries = self.log.top(self.top_k) if self.top_k > 0 else []
+        except Exception as e:
+            logger.warning(f"Sorgu günlüğü okunamadı: {e}")
+            entries = []
+        self._update(cancel, total=len(entries))
+        done = failed = 0
+        state = "done"
+        for entry in entries:
+            if cancel.is_set():
+                state = "cancelled"
+                break
+            if time.monotonic() - started > self.max_seconds:
+                state = "timeout"
+                break
+            t0 = time.monotonic()
+            try:
+                self._replay(recommender, entry)
+                done += 1
+            except Exception as e:
+                failed += 1
+                logger.debug(f"Isıtma sorgusu başarısız ({entry}): {e}")
+            busy = time.monotonic() - t0
+            self._update(cancel, done=done, failed=failed, elapsed_s=round(time.monotonic() - started, 2))
+            # Çalışma süresi / toplam süre <= cpu_fraction olacak kadar bekle
+            if cancel.wait(busy * (1 - self.cpu_fraction) / self.cpu_fraction):
+                state = "cancelled"
+                break
+        self._update(cancel, state=state, elapsed_s=round(time.monotonic() - started, 2))
+        if state != "cancelled":
+            logger.info(f"Önbellek ısıtma {state}: {done}/{len(entries)} sorgu, {failed} hata, "
+                        f"{time.monotonic() - started:.1f} sn")
+
+    @staticmethod
+    def _replay(recommender, entry: dict):
+        kind, args, n, filters = entry["kind"], entry["args"], entry.get("n"), entry.get("filters") or {}
+        if kind == "rec":
+            recommender.recommend_games(list(args), n=n, filters=filters)
+        elif kind == "sim":
+            recommender.recommend_similar([int(a) for a in args], n=n, filters=filters)
+        elif kind == "ac":
+            recommender.autocomplete(args[0])
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            progress = dict(self._progress)
+        if progress.get("total"):
+            progress["percent"] = round(100 * (progress["done"] + progress["failed"]) / progress["total"], 1)
+        return progress